@@ -275,6 +275,16 @@ def run_tui():
         print('  pip install "picast[tui]"')
         sys.exit(1)
 
+    # Faster event loop from the tui extra (not installed on Windows)
+    try:
+        import asyncio
+
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     app = PiCastApp(host=host, port=port, devices=devices)
     app.run()
 
@@ -63,6 +63,7 @@ class AutoplayConfig:
     # mappings: block_name -> URL (legacy single-URL fallback)
     themes: dict[str, ThemeConfig] = field(default_factory=dict)
     discovery_delay: float = 5.0  # seconds between yt-dlp calls
+    discovery_cache_hours: float = 6.0  # reuse search results this long (0 = off)
 
 
 @dataclass
@@ -268,6 +269,9 @@ def _parse_config(data: dict) -> Config:
             mappings=dict(a.get("mappings", {})),
             themes=themes,
             discovery_delay=a.get("discovery_delay", config.autoplay.discovery_delay),
+            discovery_cache_hours=a.get(
+                "discovery_cache_hours", config.autoplay.discovery_cache_hours
+            ),
             cross_block_learning=a.get(
                 "cross_block_learning", config.autoplay.cross_block_learning
             ),
@@ -366,3 +370,22 @@ def ytdl_raw_options_auth(config: ServerConfig) -> str:
     if config.ytdl_po_token:
         return f"extractor-args=youtube:player-client=web;po_token={config.ytdl_po_token}"
     return ""
+
+
+def ytdl_auth_params(config: ServerConfig) -> dict:
+    """Build yt-dlp Python API (YoutubeDL) auth options from config.
+
+    Same priority as ytdl_auth_args(), for in-process extraction.
+    """
+    if config.ytdl_cookies_from_browser:
+        return {"cookiesfrombrowser": (config.ytdl_cookies_from_browser,)}
+    if config.ytdl_po_token:
+        return {
+            "extractor_args": {
+                "youtube": {
+                    "player_client": ["web"],
+                    "po_token": [config.ytdl_po_token],
+                },
+            },
+        }
+    return {}
@@ -121,10 +121,14 @@ def create_app(
 
     # Source registry
     sources = SourceRegistry()
-    sources.register(YouTubeSource(config.ytdl_format, config=config))
+    # yt-dlp metadata survives restarts in a cache file next to the DB
+    meta_cache_path = os.path.join(config.data_dir, "metadata_cache.db")
+    sources.register(
+        YouTubeSource(config.ytdl_format, config=config, meta_cache_path=meta_cache_path)
+    )
     sources.register(LocalSource())
     sources.register(TwitchSource())
-    sources.register(ArchiveSource())
+    sources.register(ArchiveSource(meta_cache_path=meta_cache_path))
 
     # Device registry
     device_registry = DeviceRegistry(local_port=config.port)
@@ -170,6 +174,21 @@ def create_app(
         response.headers["Access-Control-Allow-Private-Network"] = "true"
         return response
 
+    # Polled JSON endpoints answer If-None-Match with 304 when unchanged,
+    # so clients skip re-downloading and re-parsing the body
+    _conditional_paths = frozenset({"/api/status", "/api/queue", "/api/library", "/api/poll"})
+
+    @app.after_request
+    def add_etag(response):
+        if (
+            request.method == "GET"
+            and request.path in _conditional_paths
+            and response.status_code == 200
+        ):
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+
     # Store on app for access in routes
     app.mpv = mpv
     app.queue = queue
@@ -300,6 +319,8 @@ def create_app(
         pool=_autoplay_pool,
         server_config=config,
         delay=_autoplay_config.discovery_delay,
+        cache_path=os.path.join(config.data_dir, "discovery_cache.db"),
+        cache_ttl=_autoplay_config.discovery_cache_hours * 3600,
     )
     _discovery_themes = _autoplay_config.themes
 
@@ -452,10 +473,7 @@ def create_app(
 
     # --- Player Control Endpoints ---
 
-    @app.route("/api/status")
-    def status():
-        """Get full player status."""
-        nonlocal _autoplay_enabled
+    def _status_payload() -> dict:
         s = player.get_status()
         s["autoplay_enabled"] = _autoplay_enabled
         s["autoplay_current"] = _autoplay_current
@@ -470,7 +488,12 @@ def create_app(
                 "checking": False,
                 "grayed_out_devices": [],
             }
-        return jsonify(s)
+        return s
+
+    @app.route("/api/status")
+    def status():
+        """Get full player status."""
+        return jsonify(_status_payload())
 
     @app.route("/api/play", methods=["POST"])
     def play():
@@ -560,16 +583,18 @@ def create_app(
 
     # --- Queue Endpoints ---
 
-    @app.route("/api/queue")
-    def get_queue():
-        items = queue.get_all()
+    def _queue_payload() -> list[dict]:
         result = []
-        for item in items:
+        for item in queue.get_all():
             d = item.to_dict()
             lib_entry = library.get_by_url(item.url)
             d["watch_count"] = lib_entry["play_count"] if lib_entry else 0
             result.append(d)
-        return jsonify(result)
+        return result
+
+    @app.route("/api/queue")
+    def get_queue():
+        return jsonify(_queue_payload())
 
     @app.route("/api/queue/add", methods=["POST"])
     def queue_add():
@@ -1622,8 +1647,7 @@ def create_app(
 
     # --- Health Check ---
 
-    @app.route("/api/health")
-    def health():
+    def _health_payload() -> dict:
         resp = {
             "status": "ok",
             "version": _get_version(),
@@ -1651,7 +1675,27 @@ def create_app(
                         resp["last_update"] = lines[-1].strip()
             except OSError:
                 pass
-        return jsonify(resp)
+        return resp
+
+    @app.route("/api/health")
+    def health():
+        return jsonify(_health_payload())
+
+    _poll_sections = {
+        "status": _status_payload,
+        "queue": _queue_payload,
+        "health": _health_payload,
+    }
+
+    @app.route("/api/poll")
+    def poll():
+        """Status, queue and health in one response for polling clients.
+
+        ?include=status,queue picks sections; all three by default.
+        """
+        include = request.args.get("include")
+        names = include.split(",") if include else list(_poll_sections)
+        return jsonify({n: _poll_sections[n]() for n in names if n in _poll_sections})
 
     # --- Event Endpoints ---
 
@@ -2188,13 +2232,7 @@ def create_app(
         """List all block metadata."""
         return jsonify(db.get_all_block_metadata())
 
-    @app.route("/api/settings/blocks", methods=["POST"])
-    def settings_blocks_upsert():
-        """Create or update a block metadata entry."""
-        data = request.get_json(silent=True) or {}
-        block_name = data.get("block_name", "").strip()
-        if not block_name:
-            return jsonify({"error": "block_name required"}), 400
+    def _block_fields(data: dict, block_name: str) -> dict:
         fields = {}
         for key in (
             "display_name",
@@ -2210,9 +2248,36 @@ def create_app(
         if not fields.get("display_name"):
             fields["display_name"] = block_name
         fields["source"] = "manual"
-        db.upsert_block_metadata(block_name, **fields)
+        return fields
+
+    @app.route("/api/settings/blocks", methods=["POST"])
+    def settings_blocks_upsert():
+        """Create or update a block metadata entry."""
+        data = request.get_json(silent=True) or {}
+        block_name = data.get("block_name", "").strip()
+        if not block_name:
+            return jsonify({"error": "block_name required"}), 400
+        db.upsert_block_metadata(block_name, **_block_fields(data, block_name))
         return jsonify({"ok": True, "block_name": block_name})
 
+    @app.route("/api/settings/blocks/bulk", methods=["POST"])
+    def settings_blocks_bulk():
+        """Create or update several block metadata entries in one request."""
+        data = request.get_json(silent=True) or {}
+        blocks = data.get("blocks")
+        if not isinstance(blocks, list):
+            return jsonify({"error": "blocks list required"}), 400
+        imported = 0
+        for entry in blocks:
+            if not isinstance(entry, dict):
+                continue
+            block_name = str(entry.get("block_name", "")).strip()
+            if not block_name:
+                continue
+            db.upsert_block_metadata(block_name, **_block_fields(entry, block_name))
+            imported += 1
+        return jsonify({"ok": True, "imported": imported})
+
     @app.route("/api/settings/blocks/<block_name>", methods=["DELETE"])
     def settings_blocks_delete(block_name):
         """Delete a block metadata entry."""
@@ -7,6 +7,7 @@ recent-play avoidance, and play history tracking.
 import logging
 import random
 import re
+from collections.abc import Iterable
 from datetime import datetime, timezone
 
 from picast.server.database import Database
@@ -74,6 +75,35 @@ class AutoPlayPool:
         logger.info("Added video %s to pool '%s'", video_id, block_name)
         return self.get_video(block_name, video_id)
 
+    def add_videos_bulk(
+        self,
+        block_name: str,
+        items: Iterable[tuple[str, str, int]],
+        source: str = "manual",
+    ) -> tuple[int, int]:
+        """Add (url, title, duration) items to a block's pool in one transaction.
+
+        Returns (added, skipped); skipped counts duplicates.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        added = skipped = 0
+        for url, title, duration in items:
+            video_id = extract_video_id(url) or url
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO autoplay_videos "
+                "(video_id, title, block_name, tags, added_date, source, duration) "
+                "VALUES (?, ?, ?, '', ?, ?, ?)",
+                (video_id, title, block_name, now, source, duration),
+            )
+            if cursor.rowcount:
+                added += 1
+            else:
+                skipped += 1
+        self.db.commit()
+        if added:
+            logger.info("Added %d videos to pool '%s'", added, block_name)
+        return added, skipped
+
     def remove_video(self, block_name: str, video_id: str) -> bool:
         """Retire a video (set active=0). Returns True if found."""
         row = self.db.fetchone(
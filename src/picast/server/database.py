@@ -261,6 +261,10 @@ class Database:
             self._local.conn = sqlite3.connect(self.db_path)
             self._local.conn.row_factory = sqlite3.Row
             self._local.conn.execute("PRAGMA journal_mode=WAL")
+            # NORMAL skips the fsync on every commit; in WAL mode a power cut
+            # can only lose the last few commits, never corrupt the database
+            self._local.conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn.execute("PRAGMA temp_store=MEMORY")
             self._local.conn.execute("PRAGMA foreign_keys=ON")
             self._local.conn.execute("PRAGMA busy_timeout=5000")
         return self._local.conn
@@ -12,6 +12,7 @@ from __future__ import annotations
 import logging
 import os
 import signal
+import stat
 import subprocess
 import threading
 import time
@@ -46,6 +47,11 @@ MAX_RAPID_FAILURES = 3  # After this many rapid failures, mark failed
 FAILURE_BACKOFF = [1, 5, 30]  # Exponential backoff delays per retry attempt
 FALLBACK_MAX_FAILURES = 10       # Trip circuit breaker after this many
 FALLBACK_COOLDOWN_SECS = 1800   # 30-minute cooldown when tripped
+MPV_CONNECT_TIMEOUT = 10  # Seconds to wait for the IPC socket (Pi needs 2-4s)
+MPV_CONNECT_POLL = 0.05  # Socket poll interval while mpv starts up
+
+# mpv portion of get_status() while the player loop is idle (mpv not running)
+_IDLE_STATUS = {"idle": True, "connected": False}
 
 
 def detect_wayland() -> str | None:
@@ -61,12 +67,14 @@ def detect_wayland() -> str | None:
     runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{uid}")
 
     try:
-        for entry in os.listdir(runtime_dir):
-            if entry.startswith("wayland-") and os.path.exists(os.path.join(runtime_dir, entry)):
-                sock_path = os.path.join(runtime_dir, entry)
-                if os.path.exists(sock_path):
-                    logger.info("Auto-detected Wayland: %s", entry)
-                    return entry
+        with os.scandir(runtime_dir) as it:
+            for entry in it:
+                # Only stat wayland-* candidates; skips wayland-0.lock files too
+                if entry.name.startswith("wayland-") and stat.S_ISSOCK(
+                    entry.stat(follow_symlinks=False).st_mode
+                ):
+                    logger.info("Auto-detected Wayland: %s", entry.name)
+                    return entry.name
     except (FileNotFoundError, PermissionError):
         pass
 
@@ -390,6 +398,7 @@ class Player:
             "--cache=yes",
             "--demuxer-max-bytes=50MiB",
             "--video-sync=display-desync",
+            "--log-file=/tmp/mpv-debug.log",
             "--fullscreen",
             "--idle=no",
             "--no-terminal",
@@ -417,21 +426,17 @@ class Player:
                 env["WAYLAND_DISPLAY"] = self._wayland_display
                 env.setdefault("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
 
-            mpv_log = open("/tmp/mpv-debug.log", "w")
+            # mpv writes its own log via --log-file; --no-terminal leaves
+            # stdout/stderr empty, so don't hold a Python handle on the log
             self._mpv_process = subprocess.Popen(
                 cmd,
-                stdout=mpv_log,
-                stderr=mpv_log,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 env=env,
             )
 
             # Wait for mpv to start
-            connected = False
-            for _ in range(20):
-                if self.mpv.connect():
-                    connected = True
-                    break
-                time.sleep(0.5)
+            connected = self._wait_for_mpv()
 
             if connected:
                 # Restore persisted volume
@@ -510,6 +515,20 @@ class Player:
 
             logger.info("Fallback screensaver stopped")
 
+    def _wait_for_mpv(self) -> bool:
+        """Connect to mpv's IPC socket as soon as it appears.
+
+        Polls for the socket file at a short interval rather than sleeping
+        in half-second steps, and gives up early if mpv has already exited.
+        """
+        for _ in range(int(MPV_CONNECT_TIMEOUT / MPV_CONNECT_POLL)):
+            if os.path.exists(self.mpv.socket_path) and self.mpv.connect():
+                return True
+            if self._mpv_process is not None and self._mpv_process.poll() is not None:
+                return False
+            time.sleep(MPV_CONNECT_POLL)
+        return False
+
     def _emit(
         self, event_type: str, title: str = "", detail: str = "", queue_item_id: int | None = None
     ):
@@ -727,30 +746,25 @@ class Player:
         exit_code = -1
 
         try:
-            mpv_log = open("/tmp/mpv-debug.log", "w")
-
             # Pass Wayland display to mpv so it renders on the compositor
             env = os.environ.copy()
             if self._wayland_display:
                 env["WAYLAND_DISPLAY"] = self._wayland_display
                 env.setdefault("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
 
+            # mpv writes its own log via --log-file; --no-terminal leaves
+            # stdout/stderr empty, so don't hold a Python handle on the log
             self._mpv_process = subprocess.Popen(
                 cmd,
-                stdout=mpv_log,
-                stderr=mpv_log,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 env=env,
             )
 
             # Wait for mpv IPC socket (Pi needs 2-4s to create it)
-            connected = False
-            for _ in range(20):  # 10 seconds max
-                if self.mpv.connect():
-                    connected = True
-                    break
-                time.sleep(0.5)
+            connected = self._wait_for_mpv()
             if not connected:
-                logger.error("Failed to connect to mpv IPC after 10s")
+                logger.error("Failed to connect to mpv IPC after %ds", MPV_CONNECT_TIMEOUT)
 
             # Restore persisted volume
             if connected:
@@ -1228,10 +1242,7 @@ class Player:
         self._stop_requested = False
         self._next_start_time = start_time
         item = self.queue.add(url, title)
-        # Move it to the front by reordering
-        pending = self.queue.get_pending()
-        ids = [item.id] + [i.id for i in pending if i.id != item.id]
-        self.queue.reorder(ids)
+        self.queue.push_to_front(item.id)
         # Skip whatever is playing (including fallback)
         if self._current_item:
             self.skip()
@@ -1299,8 +1310,21 @@ class Player:
         return {"loop_enabled": self._loop_enabled, "loop_count": self._loop_count}
 
     def get_status(self) -> dict:
-        """Get combined player + mpv status."""
-        status = self.mpv.get_status()
+        """Get combined player + mpv status.
+
+        When the player loop is running with no current item and no
+        fallback, mpv is not running either, so the IPC connect attempt
+        is skipped and the status is built from the idle template.
+        """
+        if (
+            self._running
+            and self._current_item is None
+            and not self._fallback_active
+            and not self.mpv.connected
+        ):
+            status = dict(_IDLE_STATUS)
+        else:
+            status = self.mpv.get_status()
         status["player_running"] = self._running
         status["stopped"] = self._stop_requested
         status["fallback_active"] = self._fallback_active
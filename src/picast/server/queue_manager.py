@@ -7,7 +7,7 @@ Persists to SQLite for reliable crash recovery.
 import logging
 import re
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 
 from picast.server.database import Database
 
@@ -37,7 +37,11 @@ class QueueItem:
 
     @classmethod
     def from_dict(cls, data: dict) -> "QueueItem":
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        return cls(**{k: data[k] for k in _QUEUE_ITEM_FIELDS & data.keys()})
+
+
+# Field names accepted by QueueItem.from_dict (computed once, not per call)
+_QUEUE_ITEM_FIELDS = frozenset(f.name for f in fields(QueueItem))
 
 
 def _row_to_item(row: dict) -> QueueItem:
@@ -148,7 +152,7 @@ class QueueManager:
         """Move an existing item to the front of the pending queue.
 
         If the item is in a non-pending state (played, skipped, failed),
-        resets it to pending first. Then reorders so it's first.
+        resets it to pending first, then pushes it to the front.
         Returns True if the item was found and moved.
         """
         row = self._db.fetchone("SELECT * FROM queue WHERE id = ?", (item_id,))
@@ -164,12 +168,24 @@ class QueueManager:
             )
             self._db.commit()
 
-        # Reorder so this item is first among pending
-        pending = self.get_pending()
-        ids = [item_id] + [i.id for i in pending if i.id != item_id]
-        self.reorder(ids)
+        self.push_to_front(item_id)
         return True
 
+    def push_to_front(self, item_id: int) -> bool:
+        """Place a pending item ahead of all other pending items.
+
+        Single UPDATE: position becomes one less than the current minimum
+        pending position, so nothing else needs renumbering.
+        """
+        cursor = self._db.execute(
+            "UPDATE queue SET position = COALESCE("
+            "(SELECT MIN(position) - 1 FROM queue WHERE status = 'pending' AND id != ?), "
+            "position) WHERE id = ?",
+            (item_id, item_id),
+        )
+        self._db.commit()
+        return cursor.rowcount > 0
+
     def move_to_end(self, item_id: int) -> bool:
         """Move a queue item to the end of the pending queue.
 
@@ -230,25 +246,20 @@ class QueueManager:
         # Sorted position slots currently held by pending items
         slots = sorted(r["position"] for r in rows)
 
-        # Assign existing slots to the new order
-        idx = 0
+        # New order: requested pending ids first, then the rest of the pending
+        # items (not in the reorder list) keep their relative order
         seen = set()
+        ordered = []
         for item_id in item_ids:
-            if item_id in pending_ids and idx < len(slots):
-                self._db.execute(
-                    "UPDATE queue SET position = ? WHERE id = ?", (slots[idx], item_id)
-                )
+            if item_id in pending_ids and item_id not in seen:
                 seen.add(item_id)
-                idx += 1
-
-        # Any pending items not in the reorder list get remaining slots
-        for pid in pending_ids - seen:
-            if idx < len(slots):
-                self._db.execute(
-                    "UPDATE queue SET position = ? WHERE id = ?", (slots[idx], pid)
-                )
-                idx += 1
+                ordered.append(item_id)
+        ordered.extend(r["id"] for r in rows if r["id"] not in seen)
 
+        # Assign existing slots to the new order in one prepared statement
+        self._db.executemany(
+            "UPDATE queue SET position = ? WHERE id = ?", list(zip(slots, ordered))
+        )
         self._db.commit()
 
     def reset_stale_playing(self) -> int:
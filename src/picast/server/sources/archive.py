@@ -1,12 +1,14 @@
 """Internet Archive (archive.org) source handler."""
 
+import http.client
 import json
 import logging
 import subprocess
-import urllib.request
-from urllib.parse import quote, urlparse
+import threading
+from urllib.parse import urlencode, urlparse
 
-from picast.server.sources.base import SourceHandler, SourceItem
+from picast.server.sources import ytdl
+from picast.server.sources.base import MetadataCache, SourceHandler, SourceItem
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,62 @@ CONTENT_BLOCKLIST = (
     "xxx", "pornography", "nudity",
 )
 DISCOVER_YEAR_FLOOR = 1980
+ARCHIVE_HOST = "archive.org"
+USER_AGENT = "PiCast/0.13"
+SEARCH_FIELDS = ("identifier", "title", "year", "downloads")
+
+_ijson = None  # imported module, or False once the import has failed
+
+
+def _ijson_module():
+    global _ijson
+    if _ijson is None:
+        try:
+            import ijson
+
+            _ijson = ijson
+        except ImportError:
+            _ijson = False
+    return _ijson
+
+
+def _iter_docs(resp):
+    """Yield search result docs from an advancedsearch.php JSON response.
+
+    With ijson installed the docs are parsed incrementally straight off
+    the socket, so a large rows= search never holds the raw payload and
+    the full decoded tree at once. Without it the response is decoded
+    with json.load, which still skips the separate bytes copy.
+    """
+    ijson = _ijson_module()
+    if ijson:
+        yield from ijson.items(resp, "response.docs.item", use_float=True)
+    else:
+        yield from json.load(resp).get("response", {}).get("docs", [])
+
+
+def _doc_to_item(doc: dict) -> SourceItem | None:
+    identifier = doc.get("identifier", "")
+    if not identifier:
+        return None
+    title = doc.get("title", identifier)
+    year = doc.get("year", "")
+    if year:
+        title = f"{title} ({year})"
+    return SourceItem(
+        url=f"https://archive.org/details/{identifier}",
+        title=title,
+        source_type="archive",
+    )
+
+
+def _parse_search(resp) -> list[SourceItem]:
+    results = []
+    for doc in _iter_docs(resp):
+        item = _doc_to_item(doc)
+        if item:
+            results.append(item)
+    return results
 
 
 class ArchiveSource(SourceHandler):
@@ -26,9 +84,47 @@ class ArchiveSource(SourceHandler):
     """
 
     source_type = "archive"
+    hosts = frozenset({ARCHIVE_HOST})
 
-    def matches(self, url: str) -> bool:
-        return "archive.org" in url
+    def __init__(self, meta_cache_path: str = ""):
+        self._meta_cache = MetadataCache(path=meta_cache_path)
+        # One keep-alive HTTPS connection to archive.org, reused across
+        # searches so repeat requests skip the TCP + TLS handshake
+        self._conn: http.client.HTTPSConnection | None = None
+        self._conn_lock = threading.Lock()
+
+    def _get(self, path: str, parse, timeout: float = 15):
+        """GET a path on archive.org over the shared connection.
+
+        parse(resp) consumes the response body and its result is returned.
+        Reconnects once if the server dropped the idle connection.
+        """
+        with self._conn_lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = http.client.HTTPSConnection(ARCHIVE_HOST, timeout=timeout)
+                try:
+                    self._conn.request("GET", path, headers={"User-Agent": USER_AGENT})
+                    resp = self._conn.getresponse()
+                except (http.client.HTTPException, OSError):
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise
+                    continue
+                try:
+                    if resp.status != 200:
+                        raise http.client.HTTPException(
+                            f"HTTP {resp.status} from {ARCHIVE_HOST}"
+                        )
+                    result = parse(resp)
+                    # Drain anything the parser left so the connection can be reused
+                    resp.read()
+                    return result
+                except Exception:
+                    self._conn.close()
+                    self._conn = None
+                    raise
 
     def validate(self, url: str) -> tuple[bool, str]:
         """Validate Archive.org URL format."""
@@ -45,7 +141,29 @@ class ArchiveSource(SourceHandler):
         return True, ""
 
     def get_metadata(self, url: str) -> SourceItem | None:
-        """Get video metadata via yt-dlp."""
+        """Get video metadata via yt-dlp (cached per URL).
+
+        Uses the yt-dlp Python API when importable, else the CLI.
+        """
+        cached = self._meta_cache.get(url)
+        if cached is not None:
+            return cached
+        if ytdl.available():
+            info = ytdl.extract_info(url)
+            if info and info.get("_type") == "playlist":
+                # Multi-file items come back as a playlist; use the first file
+                info = next(iter(info.get("entries") or []), None)
+            if not info:
+                return None
+            item = SourceItem(
+                url=url,
+                title=info.get("title") or "",
+                source_type=self.source_type,
+                duration=info.get("duration") or 0,
+                thumbnail=info.get("thumbnail") or "",
+            )
+            self._meta_cache.put(url, item)
+            return item
         try:
             result = subprocess.run(
                 [
@@ -65,19 +183,17 @@ class ArchiveSource(SourceHandler):
                 line = result.stdout.strip().split("\n")[0]
                 parts = line.split("\t")
                 title = parts[0] if len(parts) > 0 else ""
-                duration = (
-                    float(parts[1])
-                    if len(parts) > 1 and parts[1] not in ("NA", "")
-                    else 0
-                )
+                duration = ytdl.parse_duration(parts[1]) if len(parts) > 1 else 0
                 thumbnail = parts[2] if len(parts) > 2 else ""
-                return SourceItem(
+                item = SourceItem(
                     url=url,
                     title=title,
-                    source_type="archive",
+                    source_type=self.source_type,
                     duration=duration,
                     thumbnail=thumbnail,
                 )
+                self._meta_cache.put(url, item)
+                return item
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
             logger.warning("yt-dlp metadata fetch failed for archive.org: %s", e)
         return None
@@ -135,43 +251,26 @@ class ArchiveSource(SourceHandler):
                 query_parts.append(f"NOT subject:{tag}")
 
         sort_map = {
-            "downloads": "downloads+desc",
-            "date": "addeddate+desc",
-            "title": "titleSorter+asc",
+            "downloads": "downloads desc",
+            "date": "addeddate desc",
+            "title": "titleSorter asc",
         }
-        sort_param = sort_map.get(sort, "downloads+desc")
+        sort_param = sort_map.get(sort, "downloads desc")
 
-        query = " AND ".join(query_parts)
-        url = (
-            f"https://archive.org/advancedsearch.php?"
-            f"q={quote(query)}&output=json&rows={rows}"
-            f"&fl[]=identifier&fl[]=title&fl[]=year&fl[]=downloads"
-            f"&sort[]={sort_param}"
-        )
+        params = [
+            ("q", " AND ".join(query_parts)),
+            ("output", "json"),
+            ("rows", rows),
+            *(("fl[]", field) for field in SEARCH_FIELDS),
+            ("sort[]", sort_param),
+        ]
+        path = f"/advancedsearch.php?{urlencode(params)}"
 
         try:
-            req = urllib.request.Request(url, headers={"User-Agent": "PiCast/0.13"})
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode())
+            return self._get(path, _parse_search)
         except Exception as e:
             logger.warning("Archive.org search failed: %s", e)
             return []
 
-        results = []
-        for doc in data.get("response", {}).get("docs", []):
-            identifier = doc.get("identifier", "")
-            if not identifier:
-                continue
-            title = doc.get("title", identifier)
-            year = doc.get("year", "")
-            if year:
-                title = f"{title} ({year})"
-            results.append(SourceItem(
-                url=f"https://archive.org/details/{identifier}",
-                title=title,
-                source_type="archive",
-            ))
-        return results
-
     def get_mpv_args(self, url: str) -> list[str]:
         return []
@@ -1,14 +1,61 @@
 """Base source handler and registry."""
 
+import functools
 import logging
+import sqlite3
+import sys
+import threading
+import time
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+METADATA_CACHE_TTL = 3600  # 1 hour
+METADATA_CACHE_MAX_SIZE = 512
 
-@dataclass
+METADATA_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    url TEXT PRIMARY KEY,
+    cached_at REAL NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    source_type TEXT NOT NULL DEFAULT '',
+    duration REAL NOT NULL DEFAULT 0,
+    thumbnail TEXT NOT NULL DEFAULT ''
+)
+"""
+
+
+@functools.lru_cache(maxsize=1024)
+def url_host(url: str) -> str:
+    """Lower-cased hostname of a URL, or "" for paths and malformed URLs.
+
+    Cached so registry dispatch parses each URL once, not once per handler.
+    """
+    try:
+        return urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+
+
+def host_suffixes(host: str):
+    """Yield host and each parent domain: a.b.c -> a.b.c, b.c, c."""
+    while host:
+        yield host
+        _, _, host = host.partition(".")
+
+
+def host_matches(host: str, domains: frozenset[str]) -> bool:
+    """True if host is one of domains or a subdomain of one."""
+    return any(suffix in domains for suffix in host_suffixes(host))
+
+
+@dataclass(slots=True)
 class SourceItem:
-    """A playable item from a source."""
+    """A playable item from a source.
+
+    Slotted, since searches and playlists build these by the thousand.
+    """
 
     url: str
     title: str = ""
@@ -27,14 +74,126 @@ class SourceItem:
         }
 
 
+class MetadataCache:
+    """Thread-safe TTL cache of SourceItem metadata keyed by URL.
+
+    yt-dlp metadata lookups cost a subprocess plus a network round trip
+    (1-3s each), so handlers keep results here and reuse them for repeat
+    requests. Oldest entries are evicted once max_size is exceeded.
+
+    When path is given, entries are also written to a small SQLite file
+    so a restarted server reuses lookups from the previous process. The
+    in-memory dict stays the first stop; disk is only read on a miss.
+    """
+
+    def __init__(
+        self,
+        ttl: float = METADATA_CACHE_TTL,
+        max_size: int = METADATA_CACHE_MAX_SIZE,
+        path: str = "",
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: dict[str, tuple[SourceItem, float]] = {}  # url -> (item, cached_at)
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str):
+        try:
+            db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(METADATA_CACHE_SCHEMA)
+            db.execute("DELETE FROM meta WHERE cached_at < ?", (time.time() - self.ttl,))
+        except sqlite3.Error as e:
+            logger.warning("Metadata disk cache unavailable at %s: %s", path, e)
+            return
+        self._db = db
+
+    def _get_disk(self, url: str) -> SourceItem | None:
+        """Load a fresh entry from disk into memory. Caller holds the lock."""
+        try:
+            row = self._db.execute(
+                "SELECT cached_at, title, source_type, duration, thumbnail"
+                " FROM meta WHERE url = ?",
+                (url,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Metadata disk cache read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        cached_at, title, source_type, duration, thumbnail = row
+        age = time.time() - cached_at
+        if age >= self.ttl:
+            return None
+        item = SourceItem(
+            url=url, title=title, source_type=sys.intern(source_type),
+            duration=duration, thumbnail=thumbnail,
+        )
+        # Carry the disk entry's age over so it expires on the same schedule
+        self._remember(url, item, time.monotonic() - age)
+        return item
+
+    def _remember(self, url: str, item: SourceItem, cached_at: float):
+        self._items.pop(url, None)
+        self._items[url] = (item, cached_at)
+        if len(self._items) > self.max_size:
+            # dicts keep insertion order, so the first key is the oldest
+            del self._items[next(iter(self._items))]
+
+    def get(self, url: str) -> SourceItem | None:
+        """Return the cached item for a URL, or None if missing/expired."""
+        with self._lock:
+            entry = self._items.get(url)
+            if entry is None:
+                return self._get_disk(url) if self._db else None
+            item, cached_at = entry
+            if time.monotonic() - cached_at >= self.ttl:
+                del self._items[url]
+                return None
+            return item
+
+    def put(self, url: str, item: SourceItem):
+        """Store an item, evicting the oldest entry when full."""
+        with self._lock:
+            self._remember(url, item, time.monotonic())
+            if self._db:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO meta"
+                        " (url, cached_at, title, source_type, duration, thumbnail)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (url, time.time(), item.title, item.source_type,
+                         item.duration, item.thumbnail),
+                    )
+                except sqlite3.Error as e:
+                    logger.warning("Metadata disk cache write failed: %s", e)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            if self._db:
+                try:
+                    self._db.execute("DELETE FROM meta")
+                except sqlite3.Error as e:
+                    logger.warning("Metadata disk cache clear failed: %s", e)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
 class SourceHandler:
     """Base class for source handlers."""
 
     source_type: str = ""
+    # Domains this handler owns; subdomains of them match too
+    hosts: frozenset[str] = frozenset()
 
     def matches(self, url: str) -> bool:
         """Return True if this handler can handle the given URL."""
-        return False
+        return bool(self.hosts) and host_matches(url_host(url), self.hosts)
 
     def validate(self, url: str) -> tuple[bool, str]:
         """Validate a URL before queueing.
@@ -62,17 +221,31 @@ class SourceRegistry:
 
     def __init__(self):
         self._handlers: list[SourceHandler] = []
+        self._by_host: dict[str, SourceHandler] = {}
 
     def register(self, handler: SourceHandler):
         """Register a source handler."""
         self._handlers.append(handler)
+        for host in handler.hosts:
+            self._by_host.setdefault(host, handler)
         logger.info("Registered source handler: %s", handler.source_type)
 
-    def detect(self, url: str) -> str:
-        """Detect source type from URL."""
+    def _match(self, url: str) -> SourceHandler | None:
+        """Find a handler by host first, then by asking each handler."""
+        for suffix in host_suffixes(url_host(url)):
+            handler = self._by_host.get(suffix)
+            if handler is not None:
+                return handler
         for handler in self._handlers:
             if handler.matches(url):
-                return handler.source_type
+                return handler
+        return None
+
+    def detect(self, url: str) -> str:
+        """Detect source type from URL."""
+        handler = self._match(url)
+        if handler:
+            return handler.source_type
         return "youtube"  # default fallback
 
     def get_handler(self, source_type: str) -> SourceHandler | None:
@@ -84,10 +257,7 @@ class SourceRegistry:
 
     def get_handler_for_url(self, url: str) -> SourceHandler | None:
         """Get the handler that matches a URL."""
-        for handler in self._handlers:
-            if handler.matches(url):
-                return handler
-        return None
+        return self._match(url)
 
     def get_metadata(self, url: str) -> SourceItem | None:
         """Get metadata using the appropriate handler."""
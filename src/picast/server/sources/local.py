@@ -28,7 +28,20 @@ class LocalSource(SourceHandler):
     source_type = "local"
 
     def __init__(self, media_dirs: list[str] | None = None):
-        self.media_dirs = media_dirs or self._default_media_dirs()
+        # Explicit dirs are kept as-is; defaults are scanned on first use
+        # because stat() on a stale network mount can block for seconds.
+        self._configured_dirs = media_dirs or None
+        self._media_dirs: list[str] | None = self._configured_dirs
+
+    @property
+    def media_dirs(self) -> list[str]:
+        if self._media_dirs is None:
+            self._media_dirs = self._default_media_dirs()
+        return self._media_dirs
+
+    def refresh(self) -> None:
+        """Forget the scanned default dirs so newly mounted drives show up."""
+        self._media_dirs = self._configured_dirs
 
     @staticmethod
     def _default_media_dirs() -> list[str]:
@@ -44,16 +57,22 @@ class LocalSource(SourceHandler):
 
         # External drives (Linux / Raspberry Pi)
         for mount_base in ["/media", "/mnt"]:
-            if os.path.isdir(mount_base):
+            try:
+                entries = list(os.scandir(mount_base))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                # Check user-specific mounts like /media/pi/DRIVE; a single
+                # unreadable or dead mount must not hide the others
                 try:
-                    for entry in os.scandir(mount_base):
-                        if entry.is_dir():
-                            # Check user-specific mounts like /media/pi/DRIVE
-                            for sub in os.scandir(entry.path):
-                                if sub.is_dir():
-                                    dirs.append(sub.path)
-                except PermissionError:
-                    pass
+                    with os.scandir(entry.path) as it:
+                        for sub in it:
+                            if sub.is_dir(follow_symlinks=False):
+                                dirs.append(sub.path)
+                except OSError:
+                    continue
 
         return dirs
 
@@ -80,7 +99,7 @@ class LocalSource(SourceHandler):
         return SourceItem(
             url=path,
             title=title,
-            source_type="local",
+            source_type=self.source_type,
         )
 
     def get_mpv_args(self, url: str) -> list[str]:
@@ -96,7 +115,7 @@ class LocalSource(SourceHandler):
                 SourceItem(
                     url=d,
                     title=os.path.basename(d) or d,
-                    source_type="local",
+                    source_type=self.source_type,
                 )
                 for d in self.media_dirs
                 if os.path.isdir(d)
@@ -105,30 +124,38 @@ class LocalSource(SourceHandler):
         if not os.path.isdir(path):
             return []
 
-        items = []
+        dirs: list[tuple[str, SourceItem]] = []
+        files: list[tuple[str, SourceItem]] = []
         try:
-            entries = sorted(os.scandir(path), key=lambda e: (not e.is_dir(), e.name.lower()))
-            for entry in entries:
-                if entry.name.startswith("."):
-                    continue
-                if entry.is_dir():
-                    items.append(SourceItem(
-                        url=entry.path,
-                        title=entry.name + "/",
-                        source_type="local",
-                    ))
-                elif entry.is_file():
-                    _, ext = os.path.splitext(entry.name.lower())
-                    if ext in MEDIA_EXTENSIONS:
-                        title, _ = os.path.splitext(entry.name)
-                        items.append(SourceItem(
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    # One lower() serves as sort key and extension lookup
+                    key = name.lower()
+                    if entry.is_dir():
+                        dirs.append((key, SourceItem(
+                            url=entry.path,
+                            title=name + "/",
+                            source_type=self.source_type,
+                        )))
+                        continue
+                    dot = key.rfind(".")
+                    if dot > 0 and key[dot:] in MEDIA_EXTENSIONS and entry.is_file():
+                        files.append((key, SourceItem(
                             url=entry.path,
-                            title=title,
-                            source_type="local",
-                        ))
+                            title=name[:dot],
+                            source_type=self.source_type,
+                        )))
         except PermissionError:
             logger.warning("Permission denied browsing: %s", path)
 
+        # Directories first, each group by case-insensitive name
+        dirs.sort(key=lambda pair: pair[0])
+        files.sort(key=lambda pair: pair[0])
+        items = [item for _, item in dirs]
+        items.extend(item for _, item in files)
         return items
 
     def scan_drives(self) -> list[dict]:
@@ -1,13 +1,18 @@
 """Twitch source handler using streamlink."""
 
+import json
 import logging
 import shutil
 import subprocess
+import time
 
 from picast.server.sources.base import SourceHandler, SourceItem
 
 logger = logging.getLogger(__name__)
 
+# Resolved HLS URLs carry short-lived access tokens
+STREAM_CACHE_TTL = 60  # seconds
+
 
 class TwitchSource(SourceHandler):
     """Handler for Twitch streams using streamlink.
@@ -16,13 +21,13 @@ class TwitchSource(SourceHandler):
     """
 
     source_type = "twitch"
+    hosts = frozenset({"twitch.tv"})
 
     def __init__(self, quality: str = "best"):
         self.quality = quality
         self._streamlink_available = shutil.which("streamlink") is not None
-
-    def matches(self, url: str) -> bool:
-        return "twitch.tv" in url
+        # url -> (streams dict from `streamlink --json`, monotonic timestamp)
+        self._stream_cache: dict[str, tuple[dict, float]] = {}
 
     def validate(self, url: str) -> tuple[bool, str]:
         """Validate Twitch URL format."""
@@ -45,7 +50,7 @@ class TwitchSource(SourceHandler):
             return SourceItem(
                 url=url,
                 title=f"{channel} (Twitch)",
-                source_type="twitch",
+                source_type=self.source_type,
             )
 
         try:
@@ -56,8 +61,10 @@ class TwitchSource(SourceHandler):
                 timeout=15,
             )
             if result.returncode == 0:
-                import json
                 data = json.loads(result.stdout)
+                streams = data.get("streams")
+                if streams:
+                    self._cache_streams(url, streams)
                 title = data.get("metadata", {}).get("title", "")
                 author = data.get("metadata", {}).get("author", "")
                 display = f"{author} - {title}" if author and title else title or author
@@ -65,7 +72,7 @@ class TwitchSource(SourceHandler):
                 return SourceItem(
                     url=url,
                     title=display or f"{channel} (Twitch)",
-                    source_type="twitch",
+                    source_type=self.source_type,
                 )
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
             logger.warning("streamlink metadata failed: %s", e)
@@ -74,7 +81,7 @@ class TwitchSource(SourceHandler):
         return SourceItem(
             url=url,
             title=f"{channel} (Twitch)",
-            source_type="twitch",
+            source_type=self.source_type,
         )
 
     def get_mpv_args(self, url: str) -> list[str]:
@@ -86,6 +93,10 @@ class TwitchSource(SourceHandler):
         if not self._streamlink_available:
             return url  # Let mpv/yt-dlp try directly
 
+        cached = self._cached_stream_url(url)
+        if cached:
+            return cached
+
         try:
             result = subprocess.run(
                 ["streamlink", "--stream-url", url, self.quality],
@@ -99,3 +110,25 @@ class TwitchSource(SourceHandler):
             logger.warning("streamlink URL resolution failed: %s", e)
 
         return url  # Fallback
+
+    def _cache_streams(self, url: str, streams: dict) -> None:
+        """Remember streams for url, dropping entries that have expired."""
+        now = time.monotonic()
+        for key, (_, ts) in list(self._stream_cache.items()):
+            if now - ts >= STREAM_CACHE_TTL:
+                self._stream_cache.pop(key, None)
+        self._stream_cache[url] = (streams, now)
+
+    def _cached_stream_url(self, url: str) -> str | None:
+        """Stream URL from a recent get_metadata() call, if still fresh."""
+        entry = self._stream_cache.get(url)
+        if entry is None:
+            return None
+        streams, ts = entry
+        if time.monotonic() - ts >= STREAM_CACHE_TTL:
+            self._stream_cache.pop(url, None)
+            return None
+        stream = streams.get(self.quality)
+        if isinstance(stream, dict):
+            return stream.get("url") or None
+        return None
@@ -4,21 +4,28 @@ from __future__ import annotations
 
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 from urllib.parse import parse_qs, urlparse
 
-from picast.server.sources.base import SourceHandler, SourceItem
+from picast.server.sources import ytdl
+from picast.server.sources.base import MetadataCache, SourceHandler, SourceItem
 
 if TYPE_CHECKING:
     from picast.config import ServerConfig
 
 logger = logging.getLogger(__name__)
 
+# Concurrent yt-dlp lookups per playlist; higher counts invite HTTP 429s
+PLAYLIST_METADATA_WORKERS = 4
+PLAYLIST_EXTRACT_TIMEOUT = 60
+
 
 class YouTubeSource(SourceHandler):
     """Handler for YouTube URLs using yt-dlp."""
 
     source_type = "youtube"
+    hosts = frozenset({"youtube.com", "youtu.be", "youtube-nocookie.com"})
 
     def __init__(
         self,
@@ -27,9 +34,11 @@ class YouTubeSource(SourceHandler):
             "+bestaudio/best[height<=720]"
         ),
         config: "ServerConfig | None" = None,
+        meta_cache_path: str = "",
     ):
         self.ytdl_format = ytdl_format
         self._config = config
+        self._meta_cache = MetadataCache(path=meta_cache_path)
 
     def _auth_args(self) -> list[str]:
         """Get yt-dlp auth arguments from config."""
@@ -38,10 +47,12 @@ class YouTubeSource(SourceHandler):
             return ytdl_auth_args(self._config)
         return []
 
-    def matches(self, url: str) -> bool:
-        return any(domain in url for domain in [
-            "youtube.com", "youtu.be", "youtube-nocookie.com",
-        ])
+    def _auth_params(self) -> dict:
+        """Get yt-dlp Python API auth options from config."""
+        if self._config:
+            from picast.config import ytdl_auth_params
+            return ytdl_auth_params(self._config)
+        return {}
 
     def validate(self, url: str) -> tuple[bool, str]:
         """Validate YouTube URL format."""
@@ -91,46 +102,85 @@ class YouTubeSource(SourceHandler):
 
         Returns (playlist_title, [(video_url, video_title), ...]).
         """
+        if ytdl.available():
+            return self._extract_playlist_inprocess(url)
+        playlist_title = ""
+        items = []
+
+        # Parse lines as yt-dlp prints them instead of buffering the
+        # whole listing, so large channels overlap fetch and parse
+        def on_line(line: str):
+            nonlocal playlist_title
+            parts = line.split("\t", 2)
+            if not playlist_title:
+                playlist_title = parts[0].strip()
+            video_url = parts[1].strip() if len(parts) > 1 else ""
+            title = parts[2].strip() if len(parts) > 2 else ""
+            if video_url:
+                # yt-dlp --flat-playlist may return just video IDs; ensure full URL
+                if not video_url.startswith("http"):
+                    video_url = f"https://www.youtube.com/watch?v={video_url}"
+                items.append((video_url, title))
+
+        cmd = [
+            "yt-dlp",
+            "--flat-playlist",
+            "--no-warnings",
+            "--print", "%(playlist_title)s\t%(url)s\t%(title)s",
+            *self._auth_args(),
+            url,
+        ]
         try:
-            result = subprocess.run(
-                [
-                    "yt-dlp",
-                    "--flat-playlist",
-                    "--no-warnings",
-                    "--print", "%(playlist_title)s\t%(url)s\t%(title)s",
-                    *self._auth_args(),
-                    url,
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-            if result.returncode != 0:
-                logger.warning("yt-dlp playlist extraction failed: %s", result.stderr.strip())
-                return ("", [])
-
-            playlist_title = ""
-            items = []
-            for line in result.stdout.strip().split("\n"):
-                if not line.strip():
-                    continue
-                parts = line.split("\t", 2)
-                if not playlist_title and len(parts) > 0:
-                    playlist_title = parts[0].strip()
-                video_url = parts[1].strip() if len(parts) > 1 else ""
-                title = parts[2].strip() if len(parts) > 2 else ""
-                if video_url:
-                    # yt-dlp --flat-playlist may return just video IDs; ensure full URL
-                    if not video_url.startswith("http"):
-                        video_url = f"https://www.youtube.com/watch?v={video_url}"
-                    items.append((video_url, title))
-            return (playlist_title, items)
-        except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
+            returncode, stderr, _ = ytdl.run_cli(cmd, on_line, PLAYLIST_EXTRACT_TIMEOUT)
+        except OSError as e:
             logger.warning("yt-dlp playlist extraction failed: %s", e)
             return ("", [])
+        if returncode != 0:
+            logger.warning(
+                "yt-dlp playlist extraction failed: %s",
+                stderr.strip() or f"exit code {returncode}",
+            )
+            return ("", [])
+        return (playlist_title, items)
+
+    def _extract_playlist_inprocess(self, url: str) -> tuple[str, list[tuple[str, str]]]:
+        """extract_playlist() via the yt-dlp Python API (flat extraction)."""
+        info = ytdl.extract_info(
+            url, extract_flat="in_playlist", noplaylist=False, **self._auth_params()
+        )
+        if not info:
+            return ("", [])
+        items = []
+        for entry in info.get("entries") or []:
+            video_url = (entry or {}).get("url") or ""
+            if not video_url:
+                continue
+            if not video_url.startswith("http"):
+                video_url = f"https://www.youtube.com/watch?v={video_url}"
+            items.append((video_url, entry.get("title") or ""))
+        return (info.get("title") or "", items)
 
     def get_metadata(self, url: str) -> SourceItem | None:
-        """Get video metadata via yt-dlp."""
+        """Get video metadata via yt-dlp (cached per URL).
+
+        Uses the yt-dlp Python API when importable, else the CLI.
+        """
+        cached = self._meta_cache.get(url)
+        if cached is not None:
+            return cached
+        if ytdl.available():
+            info = ytdl.extract_info(url, **self._auth_params())
+            if not info:
+                return None
+            item = SourceItem(
+                url=url,
+                title=info.get("title") or "",
+                source_type=self.source_type,
+                duration=info.get("duration") or 0,
+                thumbnail=info.get("thumbnail") or "",
+            )
+            self._meta_cache.put(url, item)
+            return item
         try:
             result = subprocess.run(
                 [
@@ -148,18 +198,91 @@ class YouTubeSource(SourceHandler):
             if result.returncode == 0 and result.stdout.strip():
                 parts = result.stdout.strip().split("\t")
                 title = parts[0] if len(parts) > 0 else ""
-                duration = float(parts[1]) if len(parts) > 1 and parts[1] != "NA" else 0
+                duration = ytdl.parse_duration(parts[1]) if len(parts) > 1 else 0
                 thumbnail = parts[2] if len(parts) > 2 else ""
-                return SourceItem(
+                item = SourceItem(
                     url=url,
                     title=title,
-                    source_type="youtube",
+                    source_type=self.source_type,
                     duration=duration,
                     thumbnail=thumbnail,
                 )
+                self._meta_cache.put(url, item)
+                return item
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
             logger.warning("yt-dlp metadata fetch failed: %s", e)
         return None
 
+    def get_metadata_batch(self, urls: list[str]) -> dict[str, SourceItem]:
+        """Get metadata for several URLs with a single yt-dlp process.
+
+        Cached URLs are answered from the cache; the rest go to one yt-dlp
+        invocation instead of one subprocess each. Returns {url: SourceItem};
+        URLs that yt-dlp could not resolve are left out.
+        """
+        results: dict[str, SourceItem] = {}
+        missing: dict[str, None] = {}  # ordered set
+        for url in urls:
+            cached = self._meta_cache.get(url)
+            if cached is not None:
+                results[url] = cached
+            else:
+                missing[url] = None
+        if not missing:
+            return results
+
+        try:
+            result = subprocess.run(
+                [
+                    "yt-dlp",
+                    "--no-warnings",
+                    "--no-download",
+                    "--no-playlist",
+                    "--print",
+                    "%(original_url)s\t%(title)s\t%(duration)s\t%(thumbnail)s",
+                    *self._auth_args(),
+                    *missing,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30 + 10 * len(missing),
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired, OSError) as e:
+            logger.warning("yt-dlp batch metadata fetch failed: %s", e)
+            return results
+
+        # yt-dlp carries on past per-URL errors, so parse whatever was printed
+        # even when the exit code is non-zero
+        for line in result.stdout.split("\n"):
+            parts = line.split("\t")
+            if len(parts) < 2 or parts[0] not in missing:
+                continue
+            url = parts[0]
+            duration = ytdl.parse_duration(parts[2]) if len(parts) > 2 else 0
+            item = SourceItem(
+                url=url,
+                title=parts[1],
+                source_type=self.source_type,
+                duration=duration,
+                thumbnail=parts[3] if len(parts) > 3 else "",
+            )
+            self._meta_cache.put(url, item)
+            results[url] = item
+        return results
+
+    def resolve_playlist_metadata(self, urls: list[str]) -> list[SourceItem]:
+        """Fetch full metadata for playlist entries concurrently.
+
+        Runs get_metadata over a small thread pool so an N-video playlist
+        costs roughly N / PLAYLIST_METADATA_WORKERS lookups of wall time.
+        Returns items in playlist order; unresolvable URLs are dropped.
+        """
+        if not urls:
+            return []
+        workers = min(PLAYLIST_METADATA_WORKERS, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            items = list(pool.map(self.get_metadata, urls))
+        return [item for item in items if item is not None]
+
     def get_mpv_args(self, url: str) -> list[str]:
         return [f"--ytdl-format={self.ytdl_format}"]
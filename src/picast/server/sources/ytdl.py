@@ -0,0 +1,106 @@
+"""In-process yt-dlp metadata extraction.
+
+yt-dlp is pip-installed alongside PiCast on the Pi, so metadata lookups
+can call its Python API instead of spawning a new interpreter per
+request. The module is imported lazily on first use; when it isn't
+importable, available() returns False and handlers fall back to the
+yt-dlp CLI (see run_cli).
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+_yt_dlp = None  # imported module, or False once the import has failed
+
+BASE_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "noplaylist": True,
+    "socket_timeout": 30,
+}
+
+
+def _module():
+    global _yt_dlp
+    if _yt_dlp is None:
+        try:
+            import yt_dlp
+
+            _yt_dlp = yt_dlp
+        except ImportError:
+            logger.info("yt_dlp module not importable, using yt-dlp CLI")
+            _yt_dlp = False
+    return _yt_dlp
+
+
+def parse_duration(value: str) -> float:
+    """Parse a yt-dlp --print duration field; "NA" or "" -> 0."""
+    try:
+        return float(value)
+    except ValueError:
+        return 0
+
+
+def available() -> bool:
+    """True if yt-dlp can be used in-process."""
+    return bool(_module())
+
+
+def extract_info(url: str, **opts) -> dict | None:
+    """Run YoutubeDL.extract_info(url, download=False).
+
+    A fresh YoutubeDL is built per call since instances aren't safe to
+    share between Flask request threads. Returns None on any extraction
+    error (unavailable video, network failure, ...).
+    """
+    yt_dlp = _module()
+    if not yt_dlp:
+        return None
+    try:
+        with yt_dlp.YoutubeDL({**BASE_OPTS, **opts}) as ydl:
+            return ydl.extract_info(url, download=False)
+    except Exception as e:
+        logger.warning("yt-dlp extraction failed for %s: %s", url, e)
+        return None
+
+
+def run_cli(
+    cmd: list[str], on_line: Callable[[str], None], timeout: float,
+) -> tuple[int, str, bool]:
+    """Run a yt-dlp command, passing each non-empty stdout line to on_line.
+
+    stderr is spooled to a temporary file rather than a pipe: a pipe
+    nobody reads until stdout closes fills up on a chatty run and stalls
+    yt-dlp until the timeout kills it. The process is killed after
+    timeout seconds. Returns (returncode, stderr, timed_out); raises
+    OSError if the command can't be started.
+    """
+    timed_out = threading.Event()
+    with tempfile.TemporaryFile(mode="w+", errors="replace") as err:
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=err, text=True,
+        ) as proc:
+
+            def kill():
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    line = line.rstrip("\n")
+                    if line:
+                        on_line(line)
+            finally:
+                timer.cancel()
+        err.seek(0)
+        return proc.returncode, err.read(), timed_out.is_set()
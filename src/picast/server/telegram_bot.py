@@ -8,12 +8,16 @@ Requires: pip install "picast[telegram]"
 """
 
 import asyncio
+import json
 import logging
+import re
 import threading
+import time
 from typing import Optional
 
 import httpx
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -25,26 +29,148 @@ from telegram.ext import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Status reads within this window share one /api/status request
+STATUS_CACHE_TTL = 0.5
+
+# Library/playlist listings change slowly; repeat /library or /playlists
+# within this window reuse the previous responses
+LISTING_CACHE_TTL = 5.0
+
+# Updates handled at once, so a slow /api/library doesn't hold up button taps.
+# The Bot API pool must exceed the number of in-flight calls to avoid
+# pool-timeout stalls.
+CONCURRENT_UPDATES = 32
+BOT_POOL_SIZE = 64
+
+# Failures talking to the PiCast API: transport/HTTP errors, plus ValueError
+# for unparseable JSON (and bad numeric arguments). Anything else is a bug
+# and reaches _on_error with its traceback.
+_API_ERRORS = (httpx.HTTPError, ValueError)
+
+# Speed button cycle: 1x -> 1.25x -> ... -> 2x -> 1x; off-cycle speeds reset to 1x
+_NEXT_SPEED = {1.0: 1.25, 1.25: 1.5, 1.5: 1.75, 1.75: 2.0, 2.0: 1.0}
+
+# Plain messages that are a single http(s) URL or absolute path get queued;
+# anything else is dropped without a /api/queue/add round trip
+_URL_RE = re.compile(r"(?:https?://[^\s/?#]+|/)\S*")
+
 
 def _format_time(seconds: float) -> str:
     """Format seconds as H:MM:SS or M:SS."""
-    if seconds <= 0:
-        return "0:00"
     s = int(seconds)
+    if s <= 0:
+        return "0:00"
+    if s < 3600:  # the common case: one divmod
+        m, s = divmod(s, 60)
+        return f"{m}:{s:02d}"
     h, s = divmod(s, 3600)
     m, s = divmod(s, 60)
-    if h:
-        return f"{h}:{m:02d}:{s:02d}"
-    return f"{m}:{s:02d}"
+    return f"{h}:{m:02d}:{s:02d}"
+
+
+# Progress bars are slices of these, for any width up to 64
+_BAR_FULL = "=" * 64
+_BAR_EMPTY = "-" * 64
 
 
 def _progress_bar(position: float, duration: float, width: int = 15) -> str:
     """Create a text progress bar."""
     if duration <= 0:
-        return "-" * width
-    ratio = min(position / duration, 1.0)
-    filled = int(ratio * width)
-    return "=" * filled + ">" + "-" * (width - filled - 1)
+        return _BAR_EMPTY[:width]
+    filled = int(min(position / duration, 1.0) * width)
+    return f"{_BAR_FULL[:filled]}>{_BAR_EMPTY[:max(width - filled - 1, 0)]}"
+
+
+def _trunc(text: str, limit: int = 50) -> str:
+    """Shorten text to at most limit characters, ending in "..." if cut."""
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _split_queue(items: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Split queue items into (playing, pending) in one pass."""
+    playing: list[dict] = []
+    pending: list[dict] = []
+    for item in items:
+        status = item["status"]
+        if status == "pending":
+            pending.append(item)
+        elif status == "playing":
+            playing.append(item)
+    return playing, pending
+
+
+def _pending_lines(pending: list[dict], limit: int = 10) -> list[str]:
+    """Numbered, truncated lines for the first `limit` pending items."""
+    trunc = _trunc
+    lines = [
+        f"  {i}. {trunc(item.get('title') or item['url'])}"
+        for i, item in enumerate(pending[:limit], 1)
+    ]
+    if len(pending) > limit:
+        lines.append(f"  ... +{len(pending) - limit} more")
+    return lines
+
+
+def _build_controls_keyboard(paused: bool) -> InlineKeyboardMarkup:
+    play_btn = ("Resume", "resume") if paused else ("Pause", "pause")
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(play_btn[0], callback_data=play_btn[1]),
+            InlineKeyboardButton("Skip", callback_data="skip"),
+            InlineKeyboardButton("Stop", callback_data="stop"),
+        ],
+        [
+            InlineKeyboardButton("Vol -", callback_data="vol_down"),
+            InlineKeyboardButton("Vol +", callback_data="vol_up"),
+            InlineKeyboardButton("Speed", callback_data="speed_cycle"),
+        ],
+        [
+            InlineKeyboardButton("Queue", callback_data="show_queue"),
+            InlineKeyboardButton("Refresh", callback_data="refresh_status"),
+        ],
+    ])
+
+
+# Keyboards and help text never change, so build them once at import
+# (PTB's TelegramObjects are immutable and safe to share between messages)
+_KB_PLAYING = _build_controls_keyboard(paused=False)
+_KB_PAUSED = _build_controls_keyboard(paused=True)
+_KB_EMPTY = InlineKeyboardMarkup([])
+_KB_IDLE = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Queue", callback_data="show_queue")],
+])
+_KB_QUEUE = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Clear Played", callback_data="clear_played"),
+        InlineKeyboardButton("Clear All", callback_data="clear_all"),
+    ],
+])
+_KB_REFRESH = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Refresh", callback_data="refresh_status")],
+])
+
+_HELP_TEXT = (
+    "PiCast Remote Control\n\n"
+    "Commands:\n"
+    "/status - Now playing with controls\n"
+    "/play <url> - Play a URL now\n"
+    "/queue - Show queue\n"
+    "/pause - Pause playback\n"
+    "/resume - Resume playback\n"
+    "/skip - Skip current video\n"
+    "/volume <0-100> - Set volume\n"
+    "/speed <0.25-4.0> - Set speed\n"
+    "/library - Browse library\n"
+    "/playlists - List playlists\n\n"
+    "Or just send a URL to add it to the queue."
+)
 
 
 class PiCastBot:
@@ -68,6 +194,32 @@ class PiCastBot:
         self.allowed_users = set(allowed_users or [])
         self._app: Optional[Application] = None
         self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # background thread's loop
+        self._stop_event: Optional[asyncio.Event] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._status_cache: Optional[tuple[float, dict]] = None  # (fetched_at, status)
+        self._status_gen = 0  # bumped by every mutation
+        self._listing_cache: dict[str, tuple[float, object]] = {}  # path -> (fetched_at, data)
+        self._status_lock = asyncio.Lock()
+        # Inline button callback_data -> handler(query)
+        self._cb_table = {
+            "pause": self._cb_pause,
+            "resume": self._cb_resume,
+            "skip": self._cb_skip,
+            "stop": self._cb_stop,
+            "vol_up": self._cb_vol_up,
+            "vol_down": self._cb_vol_down,
+            "speed_cycle": self._cb_speed_cycle,
+            "show_queue": self._cb_show_queue,
+            "refresh_status": self._edit_to_status,
+            "clear_played": self._cb_clear_played,
+            "clear_all": self._cb_clear_all,
+        }
+        # callback_data prefixes -> handler(query, rest_of_data)
+        self._cb_prefixes = (
+            ("lib_queue_", self._cb_lib_queue),
+            ("pl_queue_", self._cb_pl_queue),
+        )
 
     def _is_authorized(self, user_id: int) -> bool:
         """Check if a user is authorized."""
@@ -75,77 +227,140 @@ class PiCastBot:
             return True
         return user_id in self.allowed_users
 
+    def _client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for PiCast API calls.
+
+        Created on first use so it binds to the bot's own event loop.
+        Button presses chain several API calls, and reusing pooled
+        connections saves a TCP handshake on each one.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.api_url,
+                timeout=10,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._http
+
+    async def _close_client(self, app: Optional[Application] = None):
+        """Close the shared API client (also used as PTB's post_shutdown hook)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    @staticmethod
+    def _decode(resp: httpx.Response):
+        """Parse an API response, raising for 4xx/5xx.
+
+        The server's {"error": ...} message is used as the exception text
+        so handlers can show it to the user.
+        """
+        if resp.is_error:
+            try:
+                message = _json_loads(resp.content).get("error")
+            except (ValueError, AttributeError):
+                message = None
+            raise httpx.HTTPStatusError(
+                message or f"HTTP {resp.status_code}", request=resp.request, response=resp
+            )
+        return _json_loads(resp.content)
+
     async def _api_get(self, path: str) -> dict:
         """Make a GET request to the PiCast API."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{self.api_url}{path}", timeout=10)
-            return resp.json()
+        return self._decode(await self._client().get(path))
 
     async def _api_post(self, path: str, data: dict | None = None) -> dict:
         """Make a POST request to the PiCast API."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{self.api_url}{path}", json=data or {}, timeout=10)
-            return resp.json()
+        resp = await self._client().post(path, json=data or {})
+        self._invalidate_status()
+        return self._decode(resp)
 
     async def _api_delete(self, path: str) -> dict:
         """Make a DELETE request to the PiCast API."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.delete(f"{self.api_url}{path}", timeout=10)
-            return resp.json()
+        resp = await self._client().delete(path)
+        self._invalidate_status()
+        return self._decode(resp)
+
+    def _invalidate_status(self):
+        """Drop cached responses after a request that may have changed them."""
+        self._status_gen += 1
+        self._status_cache = None
+        self._listing_cache.clear()
+
+    async def _cached_get(self, path: str, ttl: float = LISTING_CACHE_TTL):
+        """GET path, reusing a response younger than ttl seconds."""
+        cached = self._listing_cache.get(path)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        gen = self._status_gen
+        data = await self._api_get(path)
+        if gen == self._status_gen:
+            self._listing_cache[path] = (time.monotonic(), data)
+        return data
+
+    async def _get_status(self) -> dict:
+        """GET /api/status, reusing a response younger than STATUS_CACHE_TTL.
+
+        Bursts of button presses collapse into one request; concurrent
+        callers wait on the lock and then share the fresh result. A
+        response that raced a POST/DELETE is returned but not cached.
+        """
+        async with self._status_lock:
+            cached = self._status_cache
+            if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+                return cached[1]
+            gen = self._status_gen
+            status = await self._api_get("/api/status")
+            if gen == self._status_gen:
+                self._status_cache = (time.monotonic(), status)
+            return status
 
-    def _controls_keyboard(self, paused: bool = False) -> InlineKeyboardMarkup:
-        """Build the inline control keyboard."""
-        play_btn = ("Resume", "resume") if paused else ("Pause", "pause")
-        return InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton(play_btn[0], callback_data=play_btn[1]),
-                InlineKeyboardButton("Skip", callback_data="skip"),
-                InlineKeyboardButton("Stop", callback_data="stop"),
-            ],
-            [
-                InlineKeyboardButton("Vol -", callback_data="vol_down"),
-                InlineKeyboardButton("Vol +", callback_data="vol_up"),
-                InlineKeyboardButton("Speed", callback_data="speed_cycle"),
-            ],
-            [
-                InlineKeyboardButton("Queue", callback_data="show_queue"),
-                InlineKeyboardButton("Refresh", callback_data="refresh_status"),
-            ],
-        ])
+    def _apply_local_mutation(self, result: dict, status: dict, **changes) -> Optional[dict]:
+        """Cache status updated with a change the server just acknowledged.
 
-    async def _format_status(self) -> tuple[str, InlineKeyboardMarkup]:
-        """Get formatted status text and keyboard."""
-        try:
-            status = await self._api_get("/api/status")
-        except (httpx.HTTPError, Exception) as e:
-            return f"Could not reach PiCast server:\n{e}", InlineKeyboardMarkup([])
+        Saves re-fetching /api/status when the outcome of a POST is known.
+        Returns None (so the caller re-fetches) if mpv rejected the change.
+        """
+        if not result.get("ok", True):
+            return None
+        status = {**status, **changes}
+        self._status_gen += 1
+        self._status_cache = (time.monotonic(), status)
+        return status
 
-        if status.get("idle", True):
-            return "Nothing playing. Send a URL to queue it.", InlineKeyboardMarkup([
-                [InlineKeyboardButton("Queue", callback_data="show_queue")],
-            ])
+    def _controls_keyboard(self, paused: bool = False) -> InlineKeyboardMarkup:
+        """Return the inline control keyboard for the play state."""
+        return _KB_PAUSED if paused else _KB_PLAYING
+
+    async def _format_status(
+        self, status: Optional[dict] = None,
+    ) -> tuple[str, InlineKeyboardMarkup]:
+        """Get formatted status text and keyboard, fetching status if not given."""
+        if status is None:
+            try:
+                status = await self._get_status()
+            except _API_ERRORS as e:
+                return f"Could not reach PiCast server:\n{e}", _KB_EMPTY
 
-        title = status.get("title", "Unknown")
-        position = status.get("position", 0)
-        duration = status.get("duration", 0)
-        volume = status.get("volume", 100)
-        speed = status.get("speed", 1.0)
-        paused = status.get("paused", False)
-        source = status.get("source_type", "")
-
-        state = "PAUSED" if paused else "PLAYING"
-        bar = _progress_bar(position, duration)
-
-        lines = [
-            f"{state}: {title}",
-            f"[{bar}]",
-            f"{_format_time(position)} / {_format_time(duration)}",
-            f"Vol: {int(volume)}%  Speed: {speed}x",
-        ]
+        if status.get("idle", True):
+            return "Nothing playing. Send a URL to queue it.", _KB_IDLE
+
+        get = status.get
+        position = get("position", 0)
+        duration = get("duration", 0)
+        paused = get("paused", False)
+        source = get("source_type", "")
+
+        text = (
+            f"{'PAUSED' if paused else 'PLAYING'}: {get('title', 'Unknown')}\n"
+            f"[{_progress_bar(position, duration)}]\n"
+            f"{_format_time(position)} / {_format_time(duration)}\n"
+            f"Vol: {int(get('volume', 100))}%  Speed: {get('speed', 1.0)}x"
+        )
         if source:
-            lines.append(f"Source: {source}")
+            text += f"\nSource: {source}"
 
-        return "\n".join(lines), self._controls_keyboard(paused)
+        return text, self._controls_keyboard(paused)
 
     # --- Command Handlers ---
 
@@ -155,37 +370,15 @@ class PiCastBot:
             await update.message.reply_text("Not authorized.")
             return
 
-        await update.message.reply_text(
-            "PiCast Remote Control\n\n"
-            "Commands:\n"
-            "/status - Now playing with controls\n"
-            "/play <url> - Play a URL now\n"
-            "/queue - Show queue\n"
-            "/pause - Pause playback\n"
-            "/resume - Resume playback\n"
-            "/skip - Skip current video\n"
-            "/volume <0-100> - Set volume\n"
-            "/speed <0.25-4.0> - Set speed\n"
-            "/library - Browse library\n"
-            "/playlists - List playlists\n\n"
-            "Or just send a URL to add it to the queue."
-        )
+        await update.message.reply_text(_HELP_TEXT)
 
     async def cmd_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         text, keyboard = await self._format_status()
         await update.message.reply_text(text, reply_markup=keyboard)
 
     async def cmd_play(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /play <url> command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         if not context.args:
             await update.message.reply_text("Usage: /play <url>")
             return
@@ -194,51 +387,35 @@ class PiCastBot:
         try:
             result = await self._api_post("/api/play", {"url": url})
             await update.message.reply_text(result.get("message", "Playing"))
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_pause(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /pause command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         try:
             await self._api_post("/api/pause")
             await update.message.reply_text("Paused")
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_resume(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /resume command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         try:
             await self._api_post("/api/resume")
             await update.message.reply_text("Resumed")
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_skip(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /skip command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         try:
             await self._api_post("/api/skip")
             await update.message.reply_text("Skipped")
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_queue(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /queue [url] command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         # If URL provided, add to queue
         if context.args:
             url = context.args[0]
@@ -247,15 +424,14 @@ class PiCastBot:
                 title = result.get("title", url)
                 await update.message.reply_text(f"Queued: {title}")
                 return
-            except (httpx.HTTPError, Exception) as e:
+            except _API_ERRORS as e:
                 await update.message.reply_text(f"Error: {e}")
                 return
 
         # Otherwise show queue
         try:
             items = await self._api_get("/api/queue")
-            pending = [i for i in items if i["status"] == "pending"]
-            playing = [i for i in items if i["status"] == "playing"]
+            playing, pending = _split_queue(items)
 
             if not pending and not playing:
                 await update.message.reply_text("Queue is empty.")
@@ -268,38 +444,21 @@ class PiCastBot:
 
             if pending:
                 lines.append(f"Up next ({len(pending)}):")
-                for i, item in enumerate(pending[:10], 1):
-                    title = item.get("title") or item["url"]
-                    # Truncate long titles
-                    if len(title) > 50:
-                        title = title[:47] + "..."
-                    lines.append(f"  {i}. {title}")
-                if len(pending) > 10:
-                    lines.append(f"  ... +{len(pending) - 10} more")
+                lines.extend(_pending_lines(pending))
 
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("Clear Played", callback_data="clear_played"),
-                    InlineKeyboardButton("Clear All", callback_data="clear_all"),
-                ],
-            ])
-            await update.message.reply_text("\n".join(lines), reply_markup=keyboard)
-        except (httpx.HTTPError, Exception) as e:
+            await update.message.reply_text("\n".join(lines), reply_markup=_KB_QUEUE)
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_volume(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /volume <level> command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         if not context.args:
             # Show current volume
             try:
-                status = await self._api_get("/api/status")
+                status = await self._get_status()
                 vol = status.get("volume", "?")
                 await update.message.reply_text(f"Volume: {int(vol)}%")
-            except (httpx.HTTPError, Exception) as e:
+            except _API_ERRORS as e:
                 await update.message.reply_text(f"Error: {e}")
             return
 
@@ -309,21 +468,17 @@ class PiCastBot:
             await update.message.reply_text(f"Volume: {level}%")
         except ValueError:
             await update.message.reply_text("Usage: /volume <0-100>")
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_speed(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /speed <rate> command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         if not context.args:
             try:
-                status = await self._api_get("/api/status")
+                status = await self._get_status()
                 spd = status.get("speed", 1.0)
                 await update.message.reply_text(f"Speed: {spd}x")
-            except (httpx.HTTPError, Exception) as e:
+            except _API_ERRORS as e:
                 await update.message.reply_text(f"Error: {e}")
             return
 
@@ -333,38 +488,33 @@ class PiCastBot:
             await update.message.reply_text(f"Speed: {spd}x")
         except ValueError:
             await update.message.reply_text("Usage: /speed <0.25-4.0>")
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_library(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /library command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         try:
-            items = await self._api_get("/api/library/recent?limit=10")
+            items, count_data = await asyncio.gather(
+                self._cached_get("/api/library/recent?limit=10"),
+                self._cached_get("/api/library/count"),
+            )
             if not items:
                 await update.message.reply_text("Library is empty.")
                 return
 
-            count_data = await self._api_get("/api/library/count")
             total = count_data.get("count", len(items))
 
             lines = [f"Library ({total} items, showing recent):"]
-            for item in items:
-                title = item.get("title") or item.get("url", "?")
-                if len(title) > 45:
-                    title = title[:42] + "..."
-                fav = " *" if item.get("favorite") else ""
-                lines.append(f"  {title}{fav}")
+            lines.extend(
+                f"  {_trunc(item.get('title') or item.get('url', '?'), 45)}"
+                f"{' *' if item.get('favorite') else ''}"
+                for item in items
+            )
 
             # Inline buttons for each item to re-queue
             buttons = []
             for item in items[:5]:
-                title = item.get("title") or "?"
-                if len(title) > 20:
-                    title = title[:17] + "..."
+                title = _trunc(item.get("title") or "?", 20)
                 buttons.append([InlineKeyboardButton(
                     f"Queue: {title}",
                     callback_data=f"lib_queue_{item['id']}",
@@ -372,17 +522,13 @@ class PiCastBot:
 
             keyboard = InlineKeyboardMarkup(buttons) if buttons else None
             await update.message.reply_text("\n".join(lines), reply_markup=keyboard)
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     async def cmd_playlists(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /playlists command."""
-        if not self._is_authorized(update.effective_user.id):
-            await update.message.reply_text("Not authorized.")
-            return
-
         try:
-            playlists = await self._api_get("/api/playlists")
+            playlists = await self._cached_get("/api/playlists")
             if not playlists:
                 await update.message.reply_text("No playlists.")
                 return
@@ -399,11 +545,95 @@ class PiCastBot:
 
             keyboard = InlineKeyboardMarkup(buttons) if buttons else None
             await update.message.reply_text("\n".join(lines), reply_markup=keyboard)
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error: {e}")
 
     # --- Callback Query Handler (inline keyboard buttons) ---
 
+    async def _edit_to_status(self, query, status: Optional[dict] = None):
+        text, keyboard = await self._format_status(status)
+        # Telegram rejects edits that change nothing, so only send what differs
+        message = query.message
+        try:
+            if message is None or message.text != text:
+                await query.edit_message_text(text, reply_markup=keyboard)
+            elif message.reply_markup != keyboard:
+                await query.edit_message_reply_markup(reply_markup=keyboard)
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
+
+    async def _set_paused(self, query, paused: bool):
+        # The POST decides the new state, so a status read alongside it
+        # only needs the flag patched in
+        result, status = await asyncio.gather(
+            self._api_post("/api/pause" if paused else "/api/resume"),
+            self._get_status(),
+        )
+        await self._edit_to_status(query, self._apply_local_mutation(result, status, paused=paused))
+
+    async def _cb_pause(self, query):
+        await self._set_paused(query, True)
+
+    async def _cb_resume(self, query):
+        await self._set_paused(query, False)
+
+    async def _cb_skip(self, query):
+        # Give the player a moment to load the next item, counting
+        # the POST's own round trip toward that wait
+        await asyncio.gather(self._api_post("/api/skip"), asyncio.sleep(0.5))
+        await self._edit_to_status(query)
+
+    async def _cb_stop(self, query):
+        await self._api_post("/api/stop")
+        await query.edit_message_text("Stopped.")
+
+    async def _change_volume(self, query, delta: int):
+        status = await self._get_status()
+        vol = max(0, min(100, int(status.get("volume", 50)) + delta))
+        result = await self._api_post("/api/volume", {"level": vol})
+        await self._edit_to_status(query, self._apply_local_mutation(result, status, volume=vol))
+
+    async def _cb_vol_up(self, query):
+        await self._change_volume(query, 10)
+
+    async def _cb_vol_down(self, query):
+        await self._change_volume(query, -10)
+
+    async def _cb_speed_cycle(self, query):
+        status = await self._get_status()
+        # Snap to the 0.25 grid so float noise still finds its step
+        current = round(status.get("speed", 1.0) * 4) / 4
+        speed = _NEXT_SPEED.get(current, 1.0)
+        result = await self._api_post("/api/speed", {"speed": speed})
+        await self._edit_to_status(query, self._apply_local_mutation(result, status, speed=speed))
+
+    async def _cb_show_queue(self, query):
+        items = await self._api_get("/api/queue")
+        _, pending = _split_queue(items)
+        if not pending:
+            await query.edit_message_text("Queue is empty.")
+            return
+        lines = [f"Queue ({len(pending)}):", *_pending_lines(pending)]
+        await query.edit_message_text("\n".join(lines), reply_markup=_KB_REFRESH)
+
+    async def _cb_clear_played(self, query):
+        await self._api_post("/api/queue/clear-played")
+        await query.edit_message_text("Cleared played items.")
+
+    async def _cb_clear_all(self, query):
+        await self._api_post("/api/queue/clear")
+        await query.edit_message_text("Queue cleared.")
+
+    async def _cb_lib_queue(self, query, lib_id: str):
+        await self._api_post(f"/api/library/{int(lib_id)}/queue")
+        await query.edit_message_text("Added to queue.")
+
+    async def _cb_pl_queue(self, query, pl_id: str):
+        result = await self._api_post(f"/api/playlists/{int(pl_id)}/queue")
+        queued = result.get("queued", 0)
+        await query.edit_message_text(f"Queued {queued} items from playlist.")
+
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle inline keyboard button presses."""
         query = update.callback_query
@@ -415,154 +645,87 @@ class PiCastBot:
         await query.answer()
 
         try:
-            if data == "pause":
-                await self._api_post("/api/pause")
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
-
-            elif data == "resume":
-                await self._api_post("/api/resume")
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
-
-            elif data == "skip":
-                await self._api_post("/api/skip")
-                await asyncio.sleep(0.5)
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
-
-            elif data == "stop":
-                await self._api_post("/api/stop")
-                await query.edit_message_text("Stopped.")
-
-            elif data == "vol_up":
-                status = await self._api_get("/api/status")
-                vol = min(100, int(status.get("volume", 50)) + 10)
-                await self._api_post("/api/volume", {"level": vol})
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
-
-            elif data == "vol_down":
-                status = await self._api_get("/api/status")
-                vol = max(0, int(status.get("volume", 50)) - 10)
-                await self._api_post("/api/volume", {"level": vol})
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
-
-            elif data == "speed_cycle":
-                status = await self._api_get("/api/status")
-                current = status.get("speed", 1.0)
-                speeds = [1.0, 1.25, 1.5, 1.75, 2.0]
-                idx = 0
-                for i, s in enumerate(speeds):
-                    if abs(current - s) < 0.05:
-                        idx = (i + 1) % len(speeds)
+            handler = self._cb_table.get(data)
+            if handler:
+                await handler(query)
+            else:
+                for prefix, prefix_handler in self._cb_prefixes:
+                    if data.startswith(prefix):
+                        await prefix_handler(query, data[len(prefix):])
                         break
-                await self._api_post("/api/speed", {"speed": speeds[idx]})
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
-
-            elif data == "show_queue":
-                items = await self._api_get("/api/queue")
-                pending = [i for i in items if i["status"] == "pending"]
-                if not pending:
-                    await query.edit_message_text("Queue is empty.")
-                else:
-                    lines = [f"Queue ({len(pending)}):"]
-                    for i, item in enumerate(pending[:10], 1):
-                        title = item.get("title") or item["url"]
-                        if len(title) > 50:
-                            title = title[:47] + "..."
-                        lines.append(f"  {i}. {title}")
-                    keyboard = InlineKeyboardMarkup([
-                        [InlineKeyboardButton("Refresh", callback_data="refresh_status")],
-                    ])
-                    await query.edit_message_text("\n".join(lines), reply_markup=keyboard)
-
-            elif data == "refresh_status":
-                text, keyboard = await self._format_status()
-                await query.edit_message_text(text, reply_markup=keyboard)
 
-            elif data == "clear_played":
-                await self._api_post("/api/queue/clear-played")
-                await query.edit_message_text("Cleared played items.")
-
-            elif data == "clear_all":
-                await self._api_post("/api/queue/clear")
-                await query.edit_message_text("Queue cleared.")
-
-            elif data.startswith("lib_queue_"):
-                lib_id = int(data.split("_")[2])
-                await self._api_post(f"/api/library/{lib_id}/queue")
-                await query.edit_message_text("Added to queue.")
-
-            elif data.startswith("pl_queue_"):
-                pl_id = int(data.split("_")[2])
-                result = await self._api_post(f"/api/playlists/{pl_id}/queue")
-                queued = result.get("queued", 0)
-                await query.edit_message_text(f"Queued {queued} items from playlist.")
-
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             logger.error("Callback error: %s", e)
             try:
                 await query.edit_message_text(f"Error: {e}")
-            except Exception:
+            except TelegramError:
                 pass
 
     # --- URL Handler (auto-queue URLs sent as messages) ---
 
     async def handle_url(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Auto-queue URLs sent as plain messages."""
-        if not self._is_authorized(update.effective_user.id):
-            return
-
         text = update.message.text.strip()
-        # Check if it looks like a URL
-        if not (text.startswith("http://") or text.startswith("https://") or text.startswith("/")):
+        if not _URL_RE.fullmatch(text):
             return
 
         try:
             result = await self._api_post("/api/queue/add", {"url": text})
-            title = result.get("title") or text
-            if len(title) > 50:
-                title = title[:47] + "..."
+            title = _trunc(result.get("title") or text)
             keyboard = InlineKeyboardMarkup([
                 [InlineKeyboardButton("Play Now", callback_data=f"play_now_{result['id']}")],
             ])
             await update.message.reply_text(f"Queued: {title}", reply_markup=keyboard)
-        except (httpx.HTTPError, Exception) as e:
+        except _API_ERRORS as e:
             await update.message.reply_text(f"Error adding to queue: {e}")
 
+    async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE):
+        """Log exceptions that escaped a handler."""
+        logger.error("Telegram handler error", exc_info=context.error)
+
     def build_application(self) -> Application:
         """Build the Telegram application with all handlers."""
-        self._app = Application.builder().token(self.token).build()
-
-        # Command handlers
-        self._app.add_handler(CommandHandler("start", self.cmd_start))
-        self._app.add_handler(CommandHandler("help", self.cmd_start))
-        self._app.add_handler(CommandHandler("status", self.cmd_status))
-        self._app.add_handler(CommandHandler("play", self.cmd_play))
-        self._app.add_handler(CommandHandler("pause", self.cmd_pause))
-        self._app.add_handler(CommandHandler("resume", self.cmd_resume))
-        self._app.add_handler(CommandHandler("skip", self.cmd_skip))
-        self._app.add_handler(CommandHandler("queue", self.cmd_queue))
-        self._app.add_handler(CommandHandler("q", self.cmd_queue))
-        self._app.add_handler(CommandHandler("volume", self.cmd_volume))
-        self._app.add_handler(CommandHandler("vol", self.cmd_volume))
-        self._app.add_handler(CommandHandler("speed", self.cmd_speed))
-        self._app.add_handler(CommandHandler("library", self.cmd_library))
-        self._app.add_handler(CommandHandler("lib", self.cmd_library))
-        self._app.add_handler(CommandHandler("playlists", self.cmd_playlists))
-        self._app.add_handler(CommandHandler("pl", self.cmd_playlists))
-
-        # Inline keyboard callback
-        self._app.add_handler(CallbackQueryHandler(self.handle_callback))
-
-        # URL auto-queue (catch-all for messages with URLs)
-        self._app.add_handler(MessageHandler(
-            filters.TEXT & ~filters.COMMAND,
-            self.handle_url,
-        ))
+        self._app = (
+            Application.builder()
+            .token(self.token)
+            .concurrent_updates(CONCURRENT_UPDATES)
+            .connection_pool_size(BOT_POOL_SIZE)
+            .pool_timeout(30)
+            .get_updates_pool_timeout(60)
+            .post_shutdown(self._close_client)
+            .build()
+        )
+
+        # Unauthorized users are dropped at dispatch time, before a handler
+        # task is created. /start still answers them, and callback queries
+        # are checked in handle_callback.
+        cmd_filter = filters.UpdateType.MESSAGES  # CommandHandler's default
+        url_filter = filters.TEXT & ~filters.COMMAND
+        if self.allowed_users:
+            user_filter = filters.User(user_id=self.allowed_users)
+            cmd_filter &= user_filter
+            url_filter &= user_filter
+
+        self._app.add_handlers([
+            # Commands, with their short aliases
+            CommandHandler(["start", "help"], self.cmd_start),
+            CommandHandler("status", self.cmd_status, filters=cmd_filter),
+            CommandHandler("play", self.cmd_play, filters=cmd_filter),
+            CommandHandler("pause", self.cmd_pause, filters=cmd_filter),
+            CommandHandler("resume", self.cmd_resume, filters=cmd_filter),
+            CommandHandler("skip", self.cmd_skip, filters=cmd_filter),
+            CommandHandler(["queue", "q"], self.cmd_queue, filters=cmd_filter),
+            CommandHandler(["volume", "vol"], self.cmd_volume, filters=cmd_filter),
+            CommandHandler("speed", self.cmd_speed, filters=cmd_filter),
+            CommandHandler(["library", "lib"], self.cmd_library, filters=cmd_filter),
+            CommandHandler(["playlists", "pl"], self.cmd_playlists, filters=cmd_filter),
+            # Inline keyboard callback
+            CallbackQueryHandler(self.handle_callback),
+            # URL auto-queue (catch-all for messages with URLs)
+            MessageHandler(url_filter, self.handle_url),
+        ])
+
+        self._app.add_error_handler(self._on_error)
 
         return self._app
 
@@ -584,22 +747,24 @@ class PiCastBot:
 
     def _run_in_thread(self):
         """Run the bot in a new event loop (for background thread)."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        asyncio.run(self._amain())
 
-        app = self.build_application()
-        loop.run_until_complete(app.initialize())
-        loop.run_until_complete(app.start())
-        loop.run_until_complete(app.updater.start_polling(drop_pending_updates=True))
+    async def _amain(self):
+        """Poll for updates until stop_background() sets the stop event."""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
 
-        # Keep running until the thread is stopped
+        app = self.build_application()
+        await app.initialize()
+        await app.start()
+        await app.updater.start_polling(drop_pending_updates=True)
         try:
-            loop.run_forever()
+            await self._stop_event.wait()
         finally:
-            loop.run_until_complete(app.updater.stop())
-            loop.run_until_complete(app.stop())
-            loop.run_until_complete(app.shutdown())
-            loop.close()
+            await app.updater.stop()
+            await app.stop()
+            await app.shutdown()
+            await self._close_client()
 
     def send_notification_sync(self, chat_id: int, text: str):
         """Send a message synchronously (for NotificationManager background thread).
@@ -624,11 +789,10 @@ class PiCastBot:
     def stop_background(self):
         """Stop the background bot thread."""
         if self._thread and self._thread.is_alive():
-            # Get the event loop from the thread and stop it
-            if self._app and self._app.updater and self._app.updater._running:
-                loop = self._app.updater._loop
-                if loop and loop.is_running():
-                    loop.call_soon_threadsafe(loop.stop)
+            if self._loop and self._stop_event:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
             self._thread.join(timeout=10)
             self._thread = None
+            self._loop = None
+            self._stop_event = None
             logger.info("Telegram bot stopped")
@@ -7,20 +7,50 @@ Named youtube_discovery (not discovery) to avoid conflict with
 the existing discovery.py module (zeroconf/mDNS device discovery).
 """
 
+import json
 import logging
+import os
 import shutil
-import subprocess
+import sqlite3
+import threading
 import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
-from picast.config import ServerConfig, ThemeConfig, ytdl_auth_args
+from picast.config import ServerConfig, ThemeConfig, ytdl_auth_args, ytdl_auth_params
 from picast.server.autoplay_pool import AutoPlayPool
+from picast.server.sources import ytdl
 from picast.server.taste_profile import TasteProfile
 
 logger = logging.getLogger(__name__)
 
+# Blocks searched at once by discover_all. Queries within a block stay
+# sequential with the configured delay, so this bounds the request rate.
+MAX_PARALLEL_BLOCKS = 3
 
-@dataclass
+# yt-dlp is killed after this many seconds per search term
+SEARCH_TIMEOUT = 60
+
+# yt-dlp --print fields are joined with the ASCII unit separator, which,
+# unlike a tab, can't turn up inside a video title
+FIELD_SEP = "\x1f"
+RESULT_TEMPLATE = FIELD_SEP.join(["%(id)s", "%(title)s", "%(duration)s"])
+
+DISCOVERY_CACHE_TTL = 6 * 3600  # 6 hours
+
+DISCOVERY_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    cached_at REAL NOT NULL,
+    results TEXT NOT NULL,
+    PRIMARY KEY (query, max_results)
+)
+"""
+
+
+@dataclass(slots=True, frozen=True)
 class DiscoveryResult:
     """A single search result from yt-dlp."""
 
@@ -30,6 +60,81 @@ class DiscoveryResult:
     url: str
 
 
+def _parse_duration(value: str) -> int:
+    """Whole seconds from a printed duration; 'NA', 'None' etc. -> 0."""
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
+def _parse_result(line: str) -> DiscoveryResult | None:
+    """Parse an id/title/duration line printed with RESULT_TEMPLATE."""
+    video_id, _, rest = line.partition(FIELD_SEP)
+    title, sep, dur_str = rest.partition(FIELD_SEP)
+    if not sep:
+        return None
+    return DiscoveryResult(
+        video_id, title, _parse_duration(dur_str), f"https://www.youtube.com/watch?v={video_id}",
+    )
+
+
+class SearchCache:
+    """SQLite TTL cache of search results keyed by (query, max_results).
+
+    Block themes are re-searched on every discovery run, usually with the
+    same queries; a cached search skips the yt-dlp subprocess, the network
+    round trip and the rate-limit delay before it. Stored on disk so the
+    results outlive a server restart.
+    """
+
+    def __init__(self, path: str, ttl: float = DISCOVERY_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        try:
+            db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(DISCOVERY_CACHE_SCHEMA)
+            db.execute("DELETE FROM searches WHERE cached_at < ?", (time.time() - ttl,))
+        except sqlite3.Error as e:
+            logger.warning("Discovery cache unavailable at %s: %s", path, e)
+            return
+        self._db = db
+
+    def get(self, query: str, max_results: int) -> list["DiscoveryResult"] | None:
+        """Return cached results, or None if missing/expired."""
+        if self._db is None:
+            return None
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT cached_at, results FROM searches"
+                    " WHERE query = ? AND max_results = ?",
+                    (query, max_results),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Discovery cache read failed: %s", e)
+                return None
+        if row is None or time.time() - row[0] >= self.ttl:
+            return None
+        return [DiscoveryResult(*fields) for fields in json.loads(row[1])]
+
+    def put(self, query: str, max_results: int, results: list["DiscoveryResult"]):
+        if self._db is None:
+            return
+        payload = json.dumps([[r.video_id, r.title, r.duration, r.url] for r in results])
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO searches"
+                    " (query, max_results, cached_at, results) VALUES (?, ?, ?, ?)",
+                    (query, max_results, time.time(), payload),
+                )
+            except sqlite3.Error as e:
+                logger.warning("Discovery cache write failed: %s", e)
+
+
 class DiscoveryAgent:
     """Finds new videos for autoplay pools via YouTube search."""
 
@@ -38,27 +143,92 @@ class DiscoveryAgent:
         pool: AutoPlayPool,
         server_config: ServerConfig | None = None,
         delay: float = 5.0,
+        max_parallel_blocks: int = MAX_PARALLEL_BLOCKS,
+        cache_path: str = "",
+        cache_ttl: float = DISCOVERY_CACHE_TTL,
     ):
         self.pool = pool
         self.server_config = server_config
         self.delay = delay
+        self.max_parallel_blocks = max_parallel_blocks
+        self._cache = SearchCache(cache_path, cache_ttl) if cache_path and cache_ttl > 0 else None
 
     def search_youtube(self, query: str, max_results: int = 5) -> list[DiscoveryResult]:
         """Search YouTube via yt-dlp flat-playlist mode.
 
         Returns a list of DiscoveryResult. Handles missing yt-dlp,
-        timeouts, and NA duration values gracefully.
+        timeouts, and NA duration values gracefully. Served from the
+        search cache when one is configured and holds a fresh entry.
+        """
+        cached = self._cache.get(query, max_results) if self._cache else None
+        if cached is not None:
+            return cached
+        return self._run_search(query, max_results)
+
+    def _run_search(self, query: str, max_results: int) -> list[DiscoveryResult]:
+        """Run a yt-dlp search, storing non-empty results in the cache.
+
+        Uses the yt-dlp Python API when importable, else the CLI.
         """
+        if ytdl.available():
+            results = self._search_inprocess(query, max_results)
+        else:
+            results = self._search_cli(query, max_results)
+        # Failures return []; an empty success is not worth keeping either
+        if results and self._cache:
+            self._cache.put(query, max_results, results)
+        return results
+
+    def _search_inprocess(self, query: str, max_results: int) -> list[DiscoveryResult]:
+        """Flat ytsearch via the yt-dlp Python API, skipping interpreter startup."""
+        auth = ytdl_auth_params(self.server_config) if self.server_config else {}
+        info = ytdl.extract_info(
+            f"ytsearch{max_results}:{query}",
+            extract_flat=True, noplaylist=False, **auth,
+        )
+        if not info:
+            return []
+        results = []
+        for entry in info.get("entries") or []:
+            video_id = (entry or {}).get("id")
+            if not video_id:
+                continue
+            results.append(DiscoveryResult(
+                video_id=video_id,
+                title=entry.get("title") or "",
+                duration=int(entry.get("duration") or 0),
+                url=f"https://www.youtube.com/watch?v={video_id}",
+            ))
+        return results
+
+    def _ytdlp_print(
+        self,
+        search_terms: list[str],
+        template: str,
+        on_line: Callable[[str], None],
+        extra_args: tuple[str, ...] = (),
+        timeout: float = SEARCH_TIMEOUT,
+    ) -> bool:
+        """Run yt-dlp --flat-playlist over search terms.
+
+        Each printed line goes to on_line as yt-dlp emits it, so nothing
+        buffers the whole output. Returns False (after logging) if yt-dlp
+        is missing or is killed for running past timeout, meaning the
+        lines seen so far should be discarded. A non-zero exit is logged
+        but returns True: with several search terms it only means one of
+        them failed, and the others' lines are still good.
+        """
+        label = ", ".join(search_terms)
         if not shutil.which("yt-dlp"):
             logger.error("yt-dlp not found in PATH")
-            return []
+            return False
 
-        search_term = f"ytsearch{max_results}:{query}"
         cmd = [
-            "yt-dlp", search_term,
+            "yt-dlp", *search_terms,
             "--flat-playlist",
-            "--print", "%(id)s\t%(title)s\t%(duration)s",
+            "--print", template,
             "--no-warnings",
+            *extra_args,
         ]
 
         # Add auth args from config
@@ -66,104 +236,162 @@ class DiscoveryAgent:
             cmd.extend(ytdl_auth_args(self.server_config))
 
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=60,
-            )
-        except subprocess.TimeoutExpired:
-            logger.warning("yt-dlp search timed out for query: %s", query)
-            return []
+            returncode, stderr, timed_out = ytdl.run_cli(cmd, on_line, timeout)
         except FileNotFoundError:
             logger.error("yt-dlp not found")
-            return []
+            return False
 
-        if result.returncode != 0:
-            logger.warning("yt-dlp search failed for '%s': %s", query, result.stderr.strip())
-            return []
+        if timed_out:
+            logger.warning("yt-dlp search timed out for: %s", label)
+            return False
+        if returncode != 0:
+            logger.warning("yt-dlp search failed for '%s': %s", label, stderr.strip())
+        return True
 
-        results = []
-        for line in result.stdout.strip().splitlines():
-            parts = line.split("\t", 2)
-            if len(parts) < 3:
-                continue
-            video_id, title, dur_str = parts
-            # Duration can be 'NA', 'None', or a number
-            try:
-                duration = int(float(dur_str))
-            except (ValueError, TypeError):
-                duration = 0
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            results.append(DiscoveryResult(
-                video_id=video_id, title=title, duration=duration, url=url,
-            ))
+    def _search_cli(self, query: str, max_results: int) -> list[DiscoveryResult]:
+        """Flat ytsearch via a yt-dlp subprocess."""
+        results: list[DiscoveryResult] = []
+
+        def on_line(line: str):
+            result = _parse_result(line)
+            if result:
+                results.append(result)
+
+        ok = self._ytdlp_print(
+            [f"ytsearch{max_results}:{query}"], RESULT_TEMPLATE, on_line,
+        )
+        return results if ok else []
+
+    def _search_cli_batch(
+        self, queries: list[str], max_results: int,
+    ) -> dict[str, list[DiscoveryResult]]:
+        """Search several queries in one yt-dlp process.
 
+        A search's playlist title is its query, so each printed line is
+        prefixed with it to attribute results. yt-dlp paces its own
+        requests with --sleep-requests instead of us sleeping between
+        processes.
+        """
+        extra: tuple[str, ...] = ()
+        if self.delay > 0:
+            extra = ("--sleep-requests", str(self.delay))
+        found: dict[str, list[DiscoveryResult]] = {q: [] for q in queries}
+
+        def on_line(line: str):
+            query, _, rest = line.partition(FIELD_SEP)
+            result = _parse_result(rest)
+            if result and query in found:
+                found[query].append(result)
+
+        ok = self._ytdlp_print(
+            [f"ytsearch{max_results}:{q}" for q in queries],
+            f"%(playlist)s{FIELD_SEP}{RESULT_TEMPLATE}",
+            on_line,
+            extra_args=extra,
+            timeout=SEARCH_TIMEOUT * len(queries),
+        )
+        return found if ok else {q: [] for q in queries}
+
+    def search_youtube_batch(
+        self, queries: list[str], max_results: int = 5,
+    ) -> dict[str, list[DiscoveryResult]]:
+        """Search YouTube for several queries; returns {query: results}.
+
+        Cached queries are served from the cache. The rest share a single
+        yt-dlp process on the CLI path, or run one after another with the
+        rate-limit delay between them when yt-dlp is importable (no
+        process startup to amortize there).
+        """
+        results: dict[str, list[DiscoveryResult]] = {}
+        missing = []
+        for query in dict.fromkeys(queries):
+            cached = self._cache.get(query, max_results) if self._cache else None
+            if cached is None:
+                missing.append(query)
+            else:
+                results[query] = cached
+
+        if len(missing) > 1 and not ytdl.available():
+            for query, hits in self._search_cli_batch(missing, max_results).items():
+                if hits and self._cache:
+                    self._cache.put(query, max_results, hits)
+                results[query] = hits
+        else:
+            for i, query in enumerate(missing):
+                if i > 0:
+                    time.sleep(self.delay)
+                results[query] = self._run_search(query, max_results)
         return results
 
     def filter_by_duration(
         self,
-        results: list[DiscoveryResult],
+        results: Iterable[DiscoveryResult],
         min_duration: int = 0,
         max_duration: int = 0,
-    ) -> list[DiscoveryResult]:
-        """Filter results by duration bounds.
+    ) -> Iterator[DiscoveryResult]:
+        """Yield results within the duration bounds (0 = no bound).
 
         Unknown duration (0) is kept unless max_duration is set.
         """
-        filtered = []
+        lo = min_duration if min_duration > 0 else None
+        hi = max_duration if max_duration > 0 else None
         for r in results:
-            if r.duration == 0:
+            d = r.duration
+            if d == 0:
                 # Unknown duration: skip only if max_duration is set
-                if max_duration > 0:
-                    continue
-                filtered.append(r)
+                if hi is None:
+                    yield r
                 continue
-            if min_duration > 0 and r.duration < min_duration:
+            if lo is not None and d < lo:
                 continue
-            if max_duration > 0 and r.duration > max_duration:
+            if hi is not None and d > hi:
                 continue
-            filtered.append(r)
-        return filtered
+            yield r
 
-    def discover_for_block(self, block_name: str, theme: ThemeConfig) -> dict:
-        """Run discovery for a single block.
+    def _search_block(self, theme: ThemeConfig) -> list[list[DiscoveryResult]]:
+        """Run a block's queries as one batch.
+
+        Returns one result list per query, in theme order.
+        """
+        found = self.search_youtube_batch(theme.queries, theme.max_results)
+        return [found[query] for query in theme.queries]
+
+    def _add_to_pool(
+        self,
+        block_name: str,
+        theme: ThemeConfig,
+        batches: list[list[DiscoveryResult]],
+    ) -> dict:
+        """Filter per-query search results and add them to the block's pool.
 
         Returns stats dict: {block, queries_run, found, added, skipped}.
         """
-        stats = {
+        # One transaction for the whole block, filtered by duration
+        added, skipped = self.pool.add_videos_bulk(
+            block_name,
+            [
+                (r.url, r.title, r.duration)
+                for results in batches
+                for r in self.filter_by_duration(
+                    results, theme.min_duration, theme.max_duration,
+                )
+            ],
+            source="discovery",
+        )
+        return {
             "block": block_name,
-            "queries_run": 0,
-            "found": 0,
-            "added": 0,
-            "skipped": 0,
+            "queries_run": len(batches),
+            "found": sum(len(results) for results in batches),
+            "added": added,
+            "skipped": skipped,
         }
 
-        if not theme.queries:
-            return stats
-
-        for i, query in enumerate(theme.queries):
-            if i > 0:
-                time.sleep(self.delay)
-
-            results = self.search_youtube(query, theme.max_results)
-            stats["queries_run"] += 1
-            stats["found"] += len(results)
-
-            # Filter by duration
-            results = self.filter_by_duration(
-                results, theme.min_duration, theme.max_duration,
-            )
-
-            # Add to pool
-            for r in results:
-                added = self.pool.add_video(
-                    block_name, r.url, r.title, source="discovery",
-                    duration=r.duration,
-                )
-                if added:
-                    stats["added"] += 1
-                else:
-                    stats["skipped"] += 1
+    def discover_for_block(self, block_name: str, theme: ThemeConfig) -> dict:
+        """Run discovery for a single block.
 
-        return stats
+        Returns stats dict: {block, queries_run, found, added, skipped}.
+        """
+        return self._add_to_pool(block_name, theme, self._search_block(theme))
 
     def discover_from_profile(
         self,
@@ -192,31 +420,57 @@ class DiscoveryAgent:
         seen_ids: set[str] = set()
         results: list[DiscoveryResult] = []
 
-        for i, query in enumerate(queries[:max_queries]):
-            if i > 0:
-                time.sleep(self.delay)
-
-            hits = self.search_youtube(query, max_results_per_query)
-            hits = self.filter_by_duration(hits, max_duration=max_duration)
-
-            for hit in hits:
+        queries = queries[:max_queries]
+        batches = self.search_youtube_batch(queries, max_results_per_query)
+        for query in queries:
+            for hit in self.filter_by_duration(batches[query], max_duration=max_duration):
                 if hit.video_id not in seen_ids:
                     seen_ids.add(hit.video_id)
                     results.append(hit)
 
         logger.info(
             "Profile discovery (mood=%s): %d queries -> %d results",
-            mood, min(len(queries), max_queries), len(results),
+            mood, len(queries), len(results),
         )
         return results
 
     def discover_all(self, themes: dict[str, ThemeConfig]) -> list[dict]:
         """Run discovery for all configured blocks.
 
-        Returns list of per-block stats dicts.
+        Returns list of per-block stats dicts, in themes order.
+        A query shared by several blocks (at the same max_results) is
+        searched once, by the first block that lists it, and its results
+        go to every block that asked. Searches for up to
+        max_parallel_blocks blocks run concurrently, but no more than
+        there are CPU cores: each yt-dlp process is CPU-bound while it
+        starts up. Pool writes then happen here, on the calling thread.
         """
-        all_stats = []
-        for block_name, theme in themes.items():
-            stats = self.discover_for_block(block_name, theme)
-            all_stats.append(stats)
-        return all_stats
+        blocks = list(themes.items())
+        claimed: set[tuple[str, int]] = set()
+        owned: list[tuple[list[str], int]] = []
+        for _, theme in blocks:
+            queries = []
+            for query in theme.queries:
+                key = (query, theme.max_results)
+                if key not in claimed:
+                    claimed.add(key)
+                    queries.append(query)
+            owned.append((queries, theme.max_results))
+
+        workers = min(self.max_parallel_blocks, len(blocks), os.cpu_count() or 1)
+        if workers <= 1:
+            searches = [self.search_youtube_batch(q, n) for q, n in owned]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                searches = list(executor.map(self.search_youtube_batch, *zip(*owned)))
+
+        found: dict[tuple[str, int], list[DiscoveryResult]] = {}
+        for (_, n), results in zip(owned, searches):
+            for query, hits in results.items():
+                found[(query, n)] = hits
+        return [
+            self._add_to_pool(
+                name, theme, [found[(query, theme.max_results)] for query in theme.queries],
+            )
+            for name, theme in blocks
+        ]
@@ -9,11 +9,22 @@ Designed to be idempotent — running multiple times updates existing config.
 """
 
 import json
-import urllib.error
-import urllib.parse
-import urllib.request
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib  # Python 3.9-3.10 fallback
+    except ImportError:
+        tomllib = None
+
+# Concurrent per-block POSTs when the server has no bulk import endpoint
+IMPORT_WORKERS = 4
+
 # Default config location on Pi
 CONFIG_DIR = Path.home() / ".config" / "picast"
 CONFIG_FILE = CONFIG_DIR / "picast.toml"
@@ -60,24 +71,26 @@ def _load_toml(path: Path) -> dict:
     """Load existing TOML config, returning empty dict if missing."""
     if not path.exists():
         return {}
-    try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            # Fallback: basic TOML parsing not available, start fresh
-            print("  Warning: TOML parser not available, starting with fresh config")
-            return {}
-    with open(path, "rb") as f:
-        return tomllib.load(f)
+    if tomllib is None:
+        # Fallback: basic TOML parsing not available, start fresh
+        print("  Warning: TOML parser not available, starting with fresh config")
+        return {}
+    return tomllib.loads(path.read_text(encoding="utf-8"))
+
+
+def _walk_tables(prefix: tuple, table: dict) -> Iterator[tuple[tuple, dict]]:
+    """Yield (header path, scalar values) for a table and its sub-tables."""
+    yield prefix, {k: v for k, v in table.items() if not isinstance(v, dict)}
+    for k, v in table.items():
+        if isinstance(v, dict):
+            yield from _walk_tables(prefix + (k,), v)
 
 
 def _write_toml(path: Path, data: dict):
     """Write config dict as TOML.
 
     Uses a simple serializer since tomli/tomllib are read-only.
-    Preserves comments where possible by doing targeted section updates.
+    Tables without scalar values of their own get no header line.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -86,52 +99,16 @@ def _write_toml(path: Path, data: dict):
     lines.append("# Generated/updated by picast-setup")
     lines.append("")
 
-    for section, values in data.items():
-        if isinstance(values, dict):
-            # Check for nested tables (e.g., autoplay.themes.focus)
-            simple_vals = {}
-            nested = {}
-            for k, v in values.items():
-                if isinstance(v, dict):
-                    nested[k] = v
-                else:
-                    simple_vals[k] = v
-
-            if simple_vals:
-                lines.append(f"[{section}]")
-                for k, v in simple_vals.items():
-                    lines.append(f"{k} = {_toml_value(v)}")
-                lines.append("")
-
-            for sub_name, sub_vals in nested.items():
-                if isinstance(sub_vals, dict):
-                    # Could be double-nested (autoplay.themes.focus)
-                    has_sub_dict = any(isinstance(sv, dict) for sv in sub_vals.values())
-                    if has_sub_dict:
-                        simple_sub = {
-                            sk: sv for sk, sv in sub_vals.items() if not isinstance(sv, dict)
-                        }
-                        if simple_sub:
-                            lines.append(f"[{section}.{sub_name}]")
-                            for sk, sv in simple_sub.items():
-                                lines.append(f"{sk} = {_toml_value(sv)}")
-                            lines.append("")
-                        for ssn, ssv in sub_vals.items():
-                            if isinstance(ssv, dict):
-                                lines.append(f"[{section}.{sub_name}.{ssn}]")
-                                for ssk, ssval in ssv.items():
-                                    lines.append(f"{ssk} = {_toml_value(ssval)}")
-                                lines.append("")
-                    else:
-                        lines.append(f"[{section}.{sub_name}]")
-                        for sk, sv in sub_vals.items():
-                            lines.append(f"{sk} = {_toml_value(sv)}")
-                        lines.append("")
-        else:
-            # Top-level key (unusual for picast.toml but handle it)
-            lines.append(f"{section} = {_toml_value(values)}")
+    for table_path, scalars in _walk_tables((), data):
+        if not scalars:
+            continue
+        if table_path:
+            lines.append(f"[{'.'.join(table_path)}]")
+        for k, v in scalars.items():
+            lines.append(f"{k} = {_toml_value(v)}")
+        lines.append("")
 
-    with open(path, "w") as f:
+    with open(path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines) + "\n")
 
 
@@ -144,11 +121,12 @@ def _toml_value(val) -> str:
     if isinstance(val, float):
         return str(val)
     if isinstance(val, str):
-        return f'"{val}"'
+        # JSON string escapes are valid TOML basic-string escapes
+        return json.dumps(val, ensure_ascii=False)
     if isinstance(val, list):
         items = ", ".join(_toml_value(v) for v in val)
         return f"[{items}]"
-    return f'"{val}"'
+    return json.dumps(str(val), ensure_ascii=False)
 
 
 def _merge_section(config: dict, section: str, updates: dict):
@@ -163,6 +141,10 @@ def validate_pushover(api_token: str, user_key: str) -> tuple[bool, str]:
 
     Returns (success, message).
     """
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
     data = urllib.parse.urlencode(
         {
             "token": api_token,
@@ -181,7 +163,7 @@ def validate_pushover(api_token: str, user_key: str) -> tuple[bool, str]:
             method="POST",
         )
         with urllib.request.urlopen(req, timeout=10) as resp:
-            result = json.loads(resp.read())
+            result = json.load(resp)
             if result.get("status") == 1:
                 return True, "Notification sent! Check your phone."
             return False, f"API returned status {result.get('status')}: {result}"
@@ -204,9 +186,8 @@ def detect_chromium_cookies() -> str | None:
     Returns the browser name suitable for yt-dlp --cookies-from-browser,
     or None if no cookies found.
     """
-    for cookie_path in CHROMIUM_COOKIE_PATHS:
-        if cookie_path.exists():
-            return "chromium"
+    if any(map(os.path.exists, CHROMIUM_COOKIE_PATHS)):
+        return "chromium"
     return None
 
 
@@ -215,11 +196,14 @@ def check_pipulse_connection(host: str, port: int) -> tuple[bool, str]:
 
     Returns (success, message).
     """
+    import urllib.error
+    import urllib.request
+
     url = f"http://{host}:{port}/api/health"
     try:
         req = urllib.request.Request(url)
         with urllib.request.urlopen(req, timeout=5) as resp:
-            data = json.loads(resp.read())
+            data = json.load(resp)
             version = data.get("version", "unknown")
             return True, f"Connected! PiPulse v{version}"
     except urllib.error.URLError as e:
@@ -233,11 +217,14 @@ def fetch_pipulse_blocks(host: str, port: int) -> tuple[bool, dict | str]:
 
     Returns (success, blocks_dict_or_error_message).
     """
+    import urllib.error
+    import urllib.request
+
     url = f"http://{host}:{port}/api/pitim/blocks"
     try:
         req = urllib.request.Request(url)
         with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
+            data = json.load(resp)
             blocks = data.get("blocks", data)
             return True, blocks
     except urllib.error.URLError as e:
@@ -246,11 +233,29 @@ def fetch_pipulse_blocks(host: str, port: int) -> tuple[bool, dict | str]:
         return False, f"Error: {e}"
 
 
+def _post_json(url: str, payload: dict, timeout: float = 5) -> dict:
+    import urllib.request
+
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.load(resp)
+
+
 def import_blocks_to_picast(blocks: dict, server_url: str = "http://localhost:5050"):
-    """Import block metadata into PiCast via its API."""
-    imported = 0
-    for block_name, meta in blocks.items():
-        data = {
+    """Import block metadata into PiCast via its API.
+
+    Sends every block in one bulk request; servers without the bulk
+    endpoint get one request per block.
+    """
+    import urllib.error
+
+    payload = [
+        {
             "block_name": block_name,
             "display_name": meta.get("display_name", block_name),
             "emoji": meta.get("emoji", ""),
@@ -260,21 +265,31 @@ def import_blocks_to_picast(blocks: dict, server_url: str = "http://localhost:50
             "block_type": meta.get("block_type", ""),
             "energy": meta.get("energy", ""),
         }
-        body = json.dumps(data).encode()
+        for block_name, meta in blocks.items()
+    ]
+    if not payload:
+        return 0
+    try:
+        result = _post_json(
+            f"{server_url}/api/settings/blocks/bulk", {"blocks": payload}, timeout=10
+        )
+        return int(result.get("imported", 0))
+    except urllib.error.HTTPError as e:
+        # Older servers answer 405: "bulk" matches the DELETE-only /blocks/<name> route
+        if e.code not in (404, 405):
+            return 0
+    except Exception:
+        return 0
+
+    # Older server without the bulk endpoint: one POST per block, a few at a time
+    def post_one(data: dict) -> bool:
         try:
-            req = urllib.request.Request(
-                f"{server_url}/api/settings/blocks",
-                data=body,
-                method="POST",
-                headers={"Content-Type": "application/json"},
-            )
-            with urllib.request.urlopen(req, timeout=5) as resp:
-                result = json.loads(resp.read())
-                if result.get("ok"):
-                    imported += 1
+            return bool(_post_json(f"{server_url}/api/settings/blocks", data).get("ok"))
         except Exception:
-            pass
-    return imported
+            return False
+
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as executor:
+        return sum(executor.map(post_one, payload))
 
 
 def run_wizard(config_path: str | None = None):
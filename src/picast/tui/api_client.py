@@ -4,15 +4,59 @@ Provides both sync and async methods for all API endpoints.
 Used by the TUI to poll status and send commands.
 """
 
+import asyncio
+import contextlib
+import json
 import logging
+import random
+import time
 from typing import Any
+from urllib.parse import urlencode
 
 import httpx
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 5.0
 
+# The TUI polls every second; keep idle sockets open well past that so
+# polls and commands reuse a warm connection instead of reconnecting.
+POOL_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=75.0)
+
+# Failed connection attempts are retried this many times by the transport
+CONNECT_RETRIES = 1
+
+# Transient network errors are retried with capped, jittered exponential
+# backoff. The request never reached the server on a connect error, so any
+# call may retry; a dropped read may come after the server acted, so only
+# idempotent calls retry those.
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2.0
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+_TRANSIENT_ERRORS = _CONNECT_ERRORS + (httpx.ReadError, httpx.RemoteProtocolError)
+
+# Seconds read-mostly listings are served from the client cache. Any
+# non-GET request through the client clears the cache.
+LIBRARY_CACHE_TTL = 3.0
+PLAYLISTS_CACHE_TTL = 5.0
+HEALTH_CACHE_TTL = 2.0
+
+# Sections served by the server's /api/poll bundle endpoint
+POLL_SECTIONS = ("status", "queue", "health")
+
+# POSTs that set state rather than change it, so repeating them is harmless
+IDEMPOTENT_POST_PATHS = frozenset(
+    {"/api/pause", "/api/resume", "/api/stop", "/api/volume", "/api/speed"}
+)
+
 
 class PiCastAPIError(Exception):
     """Error communicating with PiCast server."""
@@ -22,60 +66,123 @@ class PiCastAPIError(Exception):
         self.status_code = status_code
 
 
+@contextlib.contextmanager
+def _translate_errors(base_url: str):
+    """Re-raise httpx failures as PiCastAPIError."""
+    try:
+        yield
+    except httpx.ConnectError:
+        raise PiCastAPIError(f"Cannot connect to {base_url}")
+    except httpx.TimeoutException:
+        raise PiCastAPIError("Request timed out")
+    except httpx.HTTPStatusError as e:
+        raise PiCastAPIError(str(e), e.response.status_code)
+
+
+def _should_retry(method: str, path: str, error: Exception, attempt: int) -> bool:
+    if attempt + 1 >= RETRY_ATTEMPTS:
+        return False
+    if isinstance(error, _CONNECT_ERRORS):
+        return True
+    return method != "post" or path in IDEMPOTENT_POST_PATHS
+
+
+def _retry_delay(attempt: int) -> float:
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt * (1 + random.uniform(0, 0.5)))
+
+
+def _decode(
+    resp: httpx.Response, method: str, path: str, etags: dict[str, tuple[str, Any]],
+) -> Any:
+    """Parse a response body, reusing the stored one on 304 Not Modified."""
+    if resp.status_code == 304 and path in etags:
+        return etags[path][1]
+    resp.raise_for_status()
+    data = _json_loads(resp.content)
+    if method == "get":
+        etag = resp.headers.get("ETag")
+        if etag:
+            etags[path] = (etag, data)
+    return data
+
+
 class PiCastClient:
     """HTTP client for the PiCast REST API.
 
     Usage:
-        client = PiCastClient("raspberrypi.local", 5000)
-        status = client.get_status()
-        client.pause()
-        client.add_to_queue("https://youtube.com/watch?v=abc")
+        with PiCastClient("raspberrypi.local", 5000) as client:
+            status = client.get_status()
+            client.pause()
+            client.add_to_queue("https://youtube.com/watch?v=abc")
     """
 
     def __init__(self, host: str = "raspberrypi.local", port: int = 5000):
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
-        self._client = httpx.Client(base_url=self.base_url, timeout=DEFAULT_TIMEOUT)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=DEFAULT_TIMEOUT,
+            transport=httpx.HTTPTransport(limits=POOL_LIMITS, retries=CONNECT_RETRIES),
+        )
+        self._poll_supported = True
+        self._cache: dict[str, tuple[float, Any]] = {}  # path -> (fetched_at, data)
+        self._cache_gen = 0
+        self._etags: dict[str, tuple[str, Any]] = {}  # path -> (etag, parsed body)
 
     def close(self):
         self._client.close()
 
-    def _get(self, path: str) -> Any:
+    def __enter__(self) -> "PiCastClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _request(self, method: str, path: str, **kwargs) -> Any:
+        attempt = 0
+        if method == "get" and path in self._etags:
+            kwargs["headers"] = {"If-None-Match": self._etags[path][0]}
         try:
-            resp = self._client.get(path)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+            with _translate_errors(self.base_url):
+                while True:
+                    try:
+                        resp = getattr(self._client, method)(path, **kwargs)
+                        break
+                    except _TRANSIENT_ERRORS as e:
+                        if not _should_retry(method, path, e, attempt):
+                            raise
+                        time.sleep(_retry_delay(attempt))
+                        attempt += 1
+                return _decode(resp, method, path, self._etags)
+        finally:
+            if method != "get":
+                self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        self._cache_gen += 1
+        self._cache.clear()
+
+    def _cached_get(self, path: str, ttl: float) -> Any:
+        """GET through the TTL cache; skips storing if a write raced it."""
+        hit = self._cache.get(path)
+        now = time.monotonic()
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        gen = self._cache_gen
+        data = self._get(path)
+        if gen == self._cache_gen:
+            self._cache[path] = (now, data)
+        return data
+
+    def _get(self, path: str) -> Any:
+        return self._request("get", path)
 
     def _post(self, path: str, data: dict | None = None) -> Any:
-        try:
-            resp = self._client.post(path, json=data)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+        return self._request("post", path, json=data)
 
     def _delete(self, path: str) -> Any:
-        try:
-            resp = self._client.delete(path)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+        return self._request("delete", path)
 
     # --- Player Control ---
 
@@ -83,7 +190,21 @@ class PiCastClient:
         return self._get("/api/status")
 
     def get_health(self) -> dict:
-        return self._get("/api/health")
+        return self._cached_get("/api/health", HEALTH_CACHE_TTL)
+
+    def get_poll_bundle(self, include: tuple[str, ...] = POLL_SECTIONS) -> dict:
+        """Fetch several polled endpoints in one round trip: {section: payload}.
+
+        Servers without /api/poll get one request per section.
+        """
+        if self._poll_supported:
+            try:
+                return self._get(f"/api/poll?include={','.join(include)}")
+            except PiCastAPIError as e:
+                if e.status_code != 404:
+                    raise
+                self._poll_supported = False
+        return {name: self._get(f"/api/{name}") for name in include}
 
     def play(self, url: str, title: str = "") -> dict:
         return self._post("/api/play", {"url": url, "title": title})
@@ -135,16 +256,19 @@ class PiCastClient:
     # --- Library ---
 
     def get_library(self, sort: str = "recent", limit: int = 50, offset: int = 0) -> list[dict]:
-        return self._get(f"/api/library?sort={sort}&limit={limit}&offset={offset}")
+        return self._cached_get(
+            "/api/library?" + urlencode({"sort": sort, "limit": limit, "offset": offset}),
+            LIBRARY_CACHE_TTL,
+        )
 
     def search_library(self, query: str) -> list[dict]:
-        return self._get(f"/api/library/search?q={query}")
+        return self._get("/api/library/search?" + urlencode({"q": query}))
 
     def get_library_item(self, library_id: int) -> dict:
         return self._get(f"/api/library/{library_id}")
 
     def update_notes(self, library_id: int, notes: str) -> dict:
-        return self._client.put(f"/api/library/{library_id}/notes", json={"notes": notes}).json()
+        return self._request("put", f"/api/library/{library_id}/notes", json={"notes": notes})
 
     def toggle_favorite(self, library_id: int) -> dict:
         return self._post(f"/api/library/{library_id}/favorite")
@@ -158,13 +282,13 @@ class PiCastClient:
     # --- Playlists ---
 
     def get_playlists(self) -> list[dict]:
-        return self._get("/api/playlists")
+        return self._cached_get("/api/playlists", PLAYLISTS_CACHE_TTL)
 
     def create_playlist(self, name: str, description: str = "") -> dict:
         return self._post("/api/playlists", {"name": name, "description": description})
 
     def get_playlist(self, playlist_id: int) -> dict:
-        return self._get(f"/api/playlists/{playlist_id}")
+        return self._cached_get(f"/api/playlists/{playlist_id}", PLAYLISTS_CACHE_TTL)
 
     def queue_playlist(self, playlist_id: int) -> dict:
         return self._post(f"/api/playlists/{playlist_id}/queue")
@@ -179,53 +303,90 @@ class PiCastClient:
 class AsyncPiCastClient:
     """Async HTTP client for the PiCast REST API.
 
-    For use with Textual's async workers.
+    For use with Textual's async workers. Call close() when done, or use
+    it as ``async with AsyncPiCastClient(host, port) as client:``.
     """
 
     def __init__(self, host: str = "raspberrypi.local", port: int = 5000):
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=DEFAULT_TIMEOUT)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=DEFAULT_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(limits=POOL_LIMITS, retries=CONNECT_RETRIES),
+        )
+        self._poll_supported = True
+        self._cache: dict[str, tuple[float, Any]] = {}  # path -> (fetched_at, data)
+        self._cache_gen = 0
+        self._etags: dict[str, tuple[str, Any]] = {}  # path -> (etag, parsed body)
+        self._inflight: dict[str, asyncio.Task] = {}  # path -> pending GET
 
     async def close(self):
         await self._client.aclose()
 
-    async def _get(self, path: str) -> Any:
+    async def __aenter__(self) -> "AsyncPiCastClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        attempt = 0
+        if method == "get" and path in self._etags:
+            kwargs["headers"] = {"If-None-Match": self._etags[path][0]}
         try:
-            resp = await self._client.get(path)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+            with _translate_errors(self.base_url):
+                while True:
+                    try:
+                        resp = await getattr(self._client, method)(path, **kwargs)
+                        break
+                    except _TRANSIENT_ERRORS as e:
+                        if not _should_retry(method, path, e, attempt):
+                            raise
+                        await asyncio.sleep(_retry_delay(attempt))
+                        attempt += 1
+                return _decode(resp, method, path, self._etags)
+        finally:
+            if method != "get":
+                self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        self._cache_gen += 1
+        self._cache.clear()
+
+    async def _cached_get(self, path: str, ttl: float) -> Any:
+        """GET through the TTL cache; skips storing if a write raced it."""
+        hit = self._cache.get(path)
+        now = time.monotonic()
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        gen = self._cache_gen
+        data = await self._get(path)
+        if gen == self._cache_gen:
+            self._cache[path] = (now, data)
+        return data
+
+    async def _get(self, path: str) -> Any:
+        """GET, sharing one request between concurrent callers of the same path."""
+        task = self._inflight.get(path)
+        if task is None:
+            task = asyncio.create_task(self._request("get", path))
+            self._inflight[path] = task
+            task.add_done_callback(lambda t: self._finish_inflight(path, t))
+        # Shielded so one caller being cancelled does not fail the others
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, path: str, task: asyncio.Task) -> None:
+        self._inflight.pop(path, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller was cancelled
 
     async def _post(self, path: str, data: dict | None = None) -> Any:
-        try:
-            resp = await self._client.post(path, json=data)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+        return await self._request("post", path, json=data)
 
     async def _delete(self, path: str) -> Any:
-        try:
-            resp = await self._client.delete(path)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+        return await self._request("delete", path)
 
     # --- Player Control ---
 
@@ -233,7 +394,34 @@ class AsyncPiCastClient:
         return await self._get("/api/status")
 
     async def get_health(self) -> dict:
-        return await self._get("/api/health")
+        return await self._cached_get("/api/health", HEALTH_CACHE_TTL)
+
+    async def get_poll_bundle(self, include: tuple[str, ...] = POLL_SECTIONS) -> dict:
+        """Fetch several polled endpoints in one round trip: {section: payload}.
+
+        Servers without /api/poll get one request per section.
+        """
+        if self._poll_supported:
+            try:
+                return await self._get(f"/api/poll?include={','.join(include)}")
+            except PiCastAPIError as e:
+                if e.status_code != 404:
+                    raise
+                self._poll_supported = False
+        payloads = await asyncio.gather(*(self._get(f"/api/{name}") for name in include))
+        return dict(zip(include, payloads))
+
+    async def fetch_dashboard(self) -> dict:
+        """Fetch the polled sections and the playlists concurrently.
+
+        A section whose request failed holds the exception instead of a payload.
+        """
+        bundle, playlists = await asyncio.gather(
+            self.get_poll_bundle(), self.get_playlists(), return_exceptions=True,
+        )
+        if isinstance(bundle, BaseException):
+            bundle = dict.fromkeys(POLL_SECTIONS, bundle)
+        return {**bundle, "playlists": playlists}
 
     async def play(self, url: str, title: str = "") -> dict:
         return await self._post("/api/play", {"url": url, "title": title})
@@ -288,25 +476,21 @@ class AsyncPiCastClient:
         self, sort: str = "recent", limit: int = 50,
         offset: int = 0,
     ) -> list[dict]:
-        return await self._get(f"/api/library?sort={sort}&limit={limit}&offset={offset}")
+        return await self._cached_get(
+            "/api/library?" + urlencode({"sort": sort, "limit": limit, "offset": offset}),
+            LIBRARY_CACHE_TTL,
+        )
 
     async def search_library(self, query: str) -> list[dict]:
-        return await self._get(f"/api/library/search?q={query}")
+        return await self._get("/api/library/search?" + urlencode({"q": query}))
 
     async def get_library_item(self, library_id: int) -> dict:
         return await self._get(f"/api/library/{library_id}")
 
     async def update_notes(self, library_id: int, notes: str) -> dict:
-        try:
-            resp = await self._client.put(f"/api/library/{library_id}/notes", json={"notes": notes})
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.ConnectError:
-            raise PiCastAPIError(f"Cannot connect to {self.base_url}")
-        except httpx.TimeoutException:
-            raise PiCastAPIError("Request timed out")
-        except httpx.HTTPStatusError as e:
-            raise PiCastAPIError(str(e), e.response.status_code)
+        return await self._request(
+            "put", f"/api/library/{library_id}/notes", json={"notes": notes},
+        )
 
     async def toggle_favorite(self, library_id: int) -> dict:
         return await self._post(f"/api/library/{library_id}/favorite")
@@ -320,13 +504,13 @@ class AsyncPiCastClient:
     # --- Playlists ---
 
     async def get_playlists(self) -> list[dict]:
-        return await self._get("/api/playlists")
+        return await self._cached_get("/api/playlists", PLAYLISTS_CACHE_TTL)
 
     async def create_playlist(self, name: str, description: str = "") -> dict:
         return await self._post("/api/playlists", {"name": name, "description": description})
 
     async def get_playlist(self, playlist_id: int) -> dict:
-        return await self._get(f"/api/playlists/{playlist_id}")
+        return await self._cached_get(f"/api/playlists/{playlist_id}", PLAYLISTS_CACHE_TTL)
 
     async def queue_playlist(self, playlist_id: int) -> dict:
         return await self._post(f"/api/playlists/{playlist_id}/queue")
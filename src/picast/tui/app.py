@@ -3,6 +3,7 @@
 Run with `picast` command on your Mac to connect to the Pi server.
 """
 
+import asyncio
 import logging
 
 from textual import work
@@ -10,18 +11,21 @@ from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Vertical
 from textual.screen import ModalScreen
-from textual.widgets import Input, Label, TextArea
+from textual.widgets import Input, Label
 
 from picast.tui.api_client import AsyncPiCastClient, PiCastAPIError
 from picast.tui.widgets.controls import ControlsBar
 from picast.tui.widgets.header_bar import HeaderBar
-from picast.tui.widgets.library_list import LibraryList
 from picast.tui.widgets.now_playing import NowPlaying
-from picast.tui.widgets.playlist_list import PlaylistList
 from picast.tui.widgets.queue_list import QueueList
 
 logger = logging.getLogger(__name__)
 
+# Seconds between status polls while connected. While the server is
+# unreachable the interval doubles after each failure, up to the max.
+POLL_INTERVAL = 1.0
+POLL_MAX_INTERVAL = 5.0
+
 
 class AddURLScreen(ModalScreen[str | None]):
     """Modal screen for adding a URL to the queue."""
@@ -135,252 +139,6 @@ class HelpScreen(ModalScreen):
         self.dismiss()
 
 
-class LibraryScreen(ModalScreen):
-    """Library browser screen."""
-
-    DEFAULT_CSS = """
-    LibraryScreen {
-        align: center middle;
-    }
-    LibraryScreen > Container {
-        width: 80;
-        height: 24;
-        border: thick $primary;
-        background: $surface;
-        padding: 1 2;
-    }
-    """
-
-    BINDINGS = [
-        Binding("escape", "dismiss_screen", "Close"),
-        Binding("q", "queue_item", "Queue Selected"),
-        Binding("f", "toggle_fav", "Toggle Favorite"),
-        Binding("n", "edit_notes", "Notes"),
-        Binding("d", "delete_item", "Delete"),
-    ]
-
-    def compose(self) -> ComposeResult:
-        with Container():
-            yield LibraryList()
-
-    async def on_mount(self) -> None:
-        await self._refresh()
-
-    async def _refresh(self) -> None:
-        api = self.app.api
-        if api:
-            try:
-                items = await api.get_library()
-                self.query_one(LibraryList).update_library(items)
-            except Exception:
-                pass
-
-    async def action_dismiss_screen(self) -> None:
-        self.dismiss()
-
-    async def action_queue_item(self) -> None:
-        item = self.query_one(LibraryList).get_selected_item()
-        if item and self.app.api:
-            try:
-                await self.app.api.queue_library_item(item["id"])
-                self.app.notify(f"Queued: {item.get('title', item['url'])}", timeout=2)
-            except Exception:
-                pass
-
-    async def action_toggle_fav(self) -> None:
-        item = self.query_one(LibraryList).get_selected_item()
-        if item and self.app.api:
-            try:
-                await self.app.api.toggle_favorite(item["id"])
-                await self._refresh()
-            except Exception:
-                pass
-
-    async def action_edit_notes(self) -> None:
-        item = self.query_one(LibraryList).get_selected_item()
-        if item:
-            self.app.push_screen(
-                NotesScreen(item["id"], item.get("title", ""), item.get("notes", "")),
-            )
-
-    async def action_delete_item(self) -> None:
-        item = self.query_one(LibraryList).get_selected_item()
-        if item and self.app.api:
-            try:
-                await self.app.api.delete_library_item(item["id"])
-                await self._refresh()
-                self.app.notify("Deleted from library", timeout=2)
-            except Exception:
-                pass
-
-
-class NotesScreen(ModalScreen):
-    """Edit notes for a library item."""
-
-    DEFAULT_CSS = """
-    NotesScreen {
-        align: center middle;
-    }
-    NotesScreen > Container {
-        width: 70;
-        height: 14;
-        border: thick $accent;
-        background: $surface;
-        padding: 1 2;
-    }
-    NotesScreen Label {
-        margin-bottom: 1;
-    }
-    NotesScreen TextArea {
-        height: 8;
-    }
-    """
-
-    BINDINGS = [
-        Binding("escape", "save_and_close", "Save & Close"),
-    ]
-
-    def __init__(self, library_id: int, title: str, notes: str):
-        super().__init__()
-        self._library_id = library_id
-        self._title = title
-        self._notes = notes
-
-    def compose(self) -> ComposeResult:
-        with Container():
-            yield Label(f"Notes: {self._title[:50]}")
-            yield TextArea(self._notes, id="notes-area")
-            yield Label("[Esc] Save and close", classes="help-footer")
-
-    def on_mount(self) -> None:
-        self.query_one("#notes-area", TextArea).focus()
-
-    async def action_save_and_close(self) -> None:
-        text = self.query_one("#notes-area", TextArea).text
-        if self.app.api:
-            try:
-                await self.app.api.update_notes(self._library_id, text)
-                self.app.notify("Notes saved", timeout=2)
-            except Exception:
-                pass
-        self.dismiss()
-
-
-class PlaylistScreen(ModalScreen):
-    """Playlist browser screen."""
-
-    DEFAULT_CSS = """
-    PlaylistScreen {
-        align: center middle;
-    }
-    PlaylistScreen > Container {
-        width: 70;
-        height: 20;
-        border: thick $secondary;
-        background: $surface;
-        padding: 1 2;
-    }
-    """
-
-    BINDINGS = [
-        Binding("escape", "dismiss_screen", "Close"),
-        Binding("a", "create_playlist", "New Collection"),
-        Binding("q", "queue_playlist", "Queue All"),
-        Binding("d", "delete_playlist", "Delete"),
-    ]
-
-    def compose(self) -> ComposeResult:
-        with Container():
-            yield PlaylistList()
-
-    async def on_mount(self) -> None:
-        await self._refresh()
-
-    async def _refresh(self) -> None:
-        api = self.app.api
-        if api:
-            try:
-                playlists = await api.get_playlists()
-                self.query_one(PlaylistList).update_playlists(playlists)
-            except Exception:
-                pass
-
-    async def action_dismiss_screen(self) -> None:
-        self.dismiss()
-
-    async def action_queue_playlist(self) -> None:
-        pl = self.query_one(PlaylistList).get_selected_playlist()
-        if pl and self.app.api:
-            try:
-                result = await self.app.api.queue_playlist(pl["id"])
-                count = result.get("queued", 0)
-                self.app.notify(f"Queued {count} items from '{pl['name']}'", timeout=3)
-            except Exception:
-                pass
-
-    def action_create_playlist(self) -> None:
-        self.app.push_screen(
-            CreatePlaylistScreen(),
-            self._on_playlist_created,
-        )
-
-    async def _on_playlist_created(self, name: str | None) -> None:
-        if name and self.app.api:
-            try:
-                await self.app.api.create_playlist(name)
-                await self._refresh()
-                self.app.notify(f"Created playlist: {name}", timeout=2)
-            except Exception:
-                self.app.notify("Failed to create playlist", severity="error", timeout=3)
-
-    async def action_delete_playlist(self) -> None:
-        pl = self.query_one(PlaylistList).get_selected_playlist()
-        if pl and self.app.api:
-            try:
-                await self.app.api.delete_playlist(pl["id"])
-                await self._refresh()
-                self.app.notify(f"Deleted playlist: {pl['name']}", timeout=2)
-            except Exception:
-                pass
-
-
-class CreatePlaylistScreen(ModalScreen[str | None]):
-    """Modal for creating a new playlist."""
-
-    DEFAULT_CSS = """
-    CreatePlaylistScreen {
-        align: center middle;
-    }
-    CreatePlaylistScreen > Container {
-        width: 60;
-        height: auto;
-        max-height: 7;
-        border: thick $secondary;
-        background: $surface;
-        padding: 1 2;
-    }
-    """
-
-    BINDINGS = [
-        Binding("escape", "cancel", "Cancel"),
-    ]
-
-    def compose(self) -> ComposeResult:
-        with Container():
-            yield Label("Create collection:")
-            yield Input(placeholder="Collection name...", id="pl-name-input")
-
-    def on_mount(self) -> None:
-        self.query_one("#pl-name-input", Input).focus()
-
-    def on_input_submitted(self, event: Input.Submitted) -> None:
-        name = event.value.strip()
-        self.dismiss(name if name else None)
-
-    def action_cancel(self) -> None:
-        self.dismiss(None)
-
-
 class DeviceScreen(ModalScreen[tuple[str, int] | None]):
     """Device switcher screen - select which Pi to control."""
 
@@ -510,6 +268,7 @@ class PiCastApp(App):
         self.devices = devices or []
         self.api: AsyncPiCastClient | None = None
         self._poll_active = True
+        self._poll_kick: asyncio.Event | None = None
         self._last_volume = 100
         self._last_speed = 1.0
 
@@ -524,6 +283,7 @@ class PiCastApp(App):
         self.api = AsyncPiCastClient(self.host, self.port)
         header = self.query_one(HeaderBar)
         header.device_name = f"{self.host}:{self.port}"
+        self._poll_kick = asyncio.Event()
         self._poll_status()
 
     async def on_unmount(self) -> None:
@@ -533,13 +293,19 @@ class PiCastApp(App):
 
     @work(exclusive=True, group="poll")
     async def _poll_status(self) -> None:
-        """Poll the server for status updates every second."""
-        import asyncio
+        """Poll the server for status updates, backing off while disconnected.
 
+        A command or manual refresh sets _poll_kick to poll right away.
+        """
+        interval = POLL_INTERVAL
         while self._poll_active:
+            # Cleared before the request so a kick that lands while it is
+            # in flight still triggers the next poll straight away
+            self._poll_kick.clear()
             try:
-                status = await self.api.get_status()
-                queue = await self.api.get_queue()
+                bundle = await self.api.get_poll_bundle(("status", "queue"))
+                status = bundle["status"]
+                queue = bundle["queue"]
 
                 self.query_one(HeaderBar).connected = True
                 self.query_one(NowPlaying).update_status(status)
@@ -547,13 +313,24 @@ class PiCastApp(App):
 
                 self._last_volume = int(status.get("volume", 100) or 100)
                 self._last_speed = status.get("speed", 1.0) or 1.0
+                interval = POLL_INTERVAL
 
             except PiCastAPIError:
                 self.query_one(HeaderBar).connected = False
+                interval = min(interval * 2, POLL_MAX_INTERVAL)
             except Exception:
                 self.query_one(HeaderBar).connected = False
+                interval = min(interval * 2, POLL_MAX_INTERVAL)
+
+            try:
+                await asyncio.wait_for(self._poll_kick.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
 
-            await asyncio.sleep(1)
+    def _kick_poll(self) -> None:
+        """Wake the poll loop so the UI reflects a change without waiting."""
+        if self._poll_kick is not None:
+            self._poll_kick.set()
 
     @work(exclusive=True, group="command")
     async def _send_command(self, coro) -> None:
@@ -564,6 +341,8 @@ class PiCastApp(App):
             self.notify(str(e), severity="error", timeout=3)
         except Exception as e:
             self.notify(f"Error: {e}", severity="error", timeout=3)
+        finally:
+            self._kick_poll()
 
     # --- Actions ---
 
@@ -589,6 +368,7 @@ class PiCastApp(App):
             result = await self.api.add_to_queue(url)
             title = result.get("title", "") or url
             self.notify(f"Added: {title}", timeout=3)
+            self._kick_poll()
         except PiCastAPIError as e:
             self.notify(str(e), severity="error", timeout=3)
 
@@ -634,11 +414,16 @@ class PiCastApp(App):
 
     async def action_refresh(self) -> None:
         self.notify("Refreshing...", timeout=1)
+        self._kick_poll()
 
     def action_show_history(self) -> None:
+        from picast.tui.screens import LibraryScreen
+
         self.push_screen(LibraryScreen())
 
     def action_show_collections(self) -> None:
+        from picast.tui.screens import PlaylistScreen
+
         self.push_screen(PlaylistScreen())
 
     def action_switch_device(self) -> None:
@@ -671,6 +456,7 @@ class PiCastApp(App):
         header.connected = False
 
         self.notify(f"Switched to {host}:{port}", timeout=2)
+        self._kick_poll()
 
     def action_show_help(self) -> None:
         self.push_screen(HelpScreen())
@@ -0,0 +1,266 @@
+"""Library and collection screens for the PiCast TUI.
+
+Kept out of picast.tui.app so their widgets (including Textual's
+TextArea) are only imported when the user first opens one of them.
+"""
+
+from textual import work
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import Input, Label, TextArea
+
+from picast.tui.widgets.library_list import LibraryList
+from picast.tui.widgets.playlist_list import PlaylistList
+
+
+class LibraryScreen(ModalScreen):
+    """Library browser screen."""
+
+    DEFAULT_CSS = """
+    LibraryScreen {
+        align: center middle;
+    }
+    LibraryScreen > Container {
+        width: 80;
+        height: 24;
+        border: thick $primary;
+        background: $surface;
+        padding: 1 2;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "dismiss_screen", "Close"),
+        Binding("q", "queue_item", "Queue Selected"),
+        Binding("f", "toggle_fav", "Toggle Favorite"),
+        Binding("n", "edit_notes", "Notes"),
+        Binding("d", "delete_item", "Delete"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        with Container():
+            yield LibraryList()
+
+    async def on_mount(self) -> None:
+        await self._refresh()
+
+    async def _refresh(self) -> None:
+        api = self.app.api
+        if api:
+            try:
+                items = await api.get_library()
+                self.query_one(LibraryList).update_library(items)
+            except Exception:
+                pass
+
+    async def action_dismiss_screen(self) -> None:
+        self.dismiss()
+
+    @work(group="command")
+    async def action_queue_item(self) -> None:
+        item = self.query_one(LibraryList).get_selected_item()
+        if item and self.app.api:
+            try:
+                await self.app.api.queue_library_item(item["id"])
+                self.app.notify(f"Queued: {item.get('title', item['url'])}", timeout=2)
+            except Exception:
+                pass
+
+    @work(group="command")
+    async def action_toggle_fav(self) -> None:
+        item = self.query_one(LibraryList).get_selected_item()
+        if item and self.app.api:
+            try:
+                await self.app.api.toggle_favorite(item["id"])
+                await self._refresh()
+            except Exception:
+                pass
+
+    async def action_edit_notes(self) -> None:
+        item = self.query_one(LibraryList).get_selected_item()
+        if item:
+            self.app.push_screen(
+                NotesScreen(item["id"], item.get("title", ""), item.get("notes", "")),
+            )
+
+    @work(group="command")
+    async def action_delete_item(self) -> None:
+        item = self.query_one(LibraryList).get_selected_item()
+        if item and self.app.api:
+            try:
+                await self.app.api.delete_library_item(item["id"])
+                await self._refresh()
+                self.app.notify("Deleted from library", timeout=2)
+            except Exception:
+                pass
+
+
+class NotesScreen(ModalScreen):
+    """Edit notes for a library item."""
+
+    DEFAULT_CSS = """
+    NotesScreen {
+        align: center middle;
+    }
+    NotesScreen > Container {
+        width: 70;
+        height: 14;
+        border: thick $accent;
+        background: $surface;
+        padding: 1 2;
+    }
+    NotesScreen Label {
+        margin-bottom: 1;
+    }
+    NotesScreen TextArea {
+        height: 8;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "save_and_close", "Save & Close"),
+    ]
+
+    def __init__(self, library_id: int, title: str, notes: str):
+        super().__init__()
+        self._library_id = library_id
+        self._title = title
+        self._notes = notes
+
+    def compose(self) -> ComposeResult:
+        with Container():
+            yield Label(f"Notes: {self._title[:50]}")
+            yield TextArea(self._notes, id="notes-area")
+            yield Label("[Esc] Save and close", classes="help-footer")
+
+    def on_mount(self) -> None:
+        self.query_one("#notes-area", TextArea).focus()
+
+    async def action_save_and_close(self) -> None:
+        text = self.query_one("#notes-area", TextArea).text
+        if self.app.api:
+            try:
+                await self.app.api.update_notes(self._library_id, text)
+                self.app.notify("Notes saved", timeout=2)
+            except Exception:
+                pass
+        self.dismiss()
+
+
+class PlaylistScreen(ModalScreen):
+    """Playlist browser screen."""
+
+    DEFAULT_CSS = """
+    PlaylistScreen {
+        align: center middle;
+    }
+    PlaylistScreen > Container {
+        width: 70;
+        height: 20;
+        border: thick $secondary;
+        background: $surface;
+        padding: 1 2;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "dismiss_screen", "Close"),
+        Binding("a", "create_playlist", "New Collection"),
+        Binding("q", "queue_playlist", "Queue All"),
+        Binding("d", "delete_playlist", "Delete"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        with Container():
+            yield PlaylistList()
+
+    async def on_mount(self) -> None:
+        await self._refresh()
+
+    async def _refresh(self) -> None:
+        api = self.app.api
+        if api:
+            try:
+                playlists = await api.get_playlists()
+                self.query_one(PlaylistList).update_playlists(playlists)
+            except Exception:
+                pass
+
+    async def action_dismiss_screen(self) -> None:
+        self.dismiss()
+
+    @work(group="command")
+    async def action_queue_playlist(self) -> None:
+        pl = self.query_one(PlaylistList).get_selected_playlist()
+        if pl and self.app.api:
+            try:
+                result = await self.app.api.queue_playlist(pl["id"])
+                count = result.get("queued", 0)
+                self.app.notify(f"Queued {count} items from '{pl['name']}'", timeout=3)
+            except Exception:
+                pass
+
+    def action_create_playlist(self) -> None:
+        self.app.push_screen(
+            CreatePlaylistScreen(),
+            self._on_playlist_created,
+        )
+
+    async def _on_playlist_created(self, name: str | None) -> None:
+        if name and self.app.api:
+            try:
+                await self.app.api.create_playlist(name)
+                await self._refresh()
+                self.app.notify(f"Created playlist: {name}", timeout=2)
+            except Exception:
+                self.app.notify("Failed to create playlist", severity="error", timeout=3)
+
+    @work(group="command")
+    async def action_delete_playlist(self) -> None:
+        pl = self.query_one(PlaylistList).get_selected_playlist()
+        if pl and self.app.api:
+            try:
+                await self.app.api.delete_playlist(pl["id"])
+                await self._refresh()
+                self.app.notify(f"Deleted playlist: {pl['name']}", timeout=2)
+            except Exception:
+                pass
+
+
+class CreatePlaylistScreen(ModalScreen[str | None]):
+    """Modal for creating a new playlist."""
+
+    DEFAULT_CSS = """
+    CreatePlaylistScreen {
+        align: center middle;
+    }
+    CreatePlaylistScreen > Container {
+        width: 60;
+        height: auto;
+        max-height: 7;
+        border: thick $secondary;
+        background: $surface;
+        padding: 1 2;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        with Container():
+            yield Label("Create collection:")
+            yield Input(placeholder="Collection name...", id="pl-name-input")
+
+    def on_mount(self) -> None:
+        self.query_one("#pl-name-input", Input).focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        name = event.value.strip()
+        self.dismiss(name if name else None)
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
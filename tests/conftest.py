@@ -1,5 +1,9 @@
 """Shared test fixtures for PiCast test suite."""
 
+import io
+import subprocess
+import threading
+
 import pytest
 
 from picast.config import ServerConfig
@@ -8,6 +12,89 @@ from picast.server.database import Database
 from picast.server.events import EventBus
 from picast.server.library import Library
 from picast.server.queue_manager import QueueManager
+from picast.server.sources import ytdl
+
+
+@pytest.fixture(autouse=True)
+def ytdl_cli_only(monkeypatch):
+    """Keep source handlers on the (mockable) yt-dlp CLI path.
+
+    Tests that cover the in-process path install a fake yt_dlp module.
+    """
+    monkeypatch.setattr(ytdl, "_yt_dlp", False)
+
+
+class FakePopen:
+    """Stand-in for subprocess.Popen serving canned yt-dlp output.
+
+    Each call takes the next queued result and the last one is reused once
+    the queue runs down; an exception in the queue is raised instead.
+    """
+
+    results: list = []
+    commands: list = []
+
+    def __init__(self, cmd, stderr=None, **kwargs):
+        FakePopen.commands.append(cmd)
+        queue = FakePopen.results
+        result = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(result, BaseException):
+            raise result
+        self.stdout = io.StringIO(result.get("stdout", ""))
+        stderr_text = result.get("stderr", "")
+        if stderr is subprocess.PIPE or stderr is None:
+            self.stderr = io.StringIO(stderr_text)
+        else:
+            stderr.write(stderr_text)  # spooled to a file by the caller
+            stderr.flush()
+            self.stderr = None
+        self.returncode = None
+        self._returncode = result.get("returncode", 0)
+
+    def kill(self):
+        self._returncode = -9
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.returncode = self._returncode
+
+
+class _ImmediateTimer:
+    """threading.Timer stand-in that fires as soon as it is started."""
+
+    def __init__(self, interval, function):
+        self.function = function
+
+    def start(self):
+        self.function()
+
+    def cancel(self):
+        pass
+
+
+@pytest.fixture
+def fake_popen(monkeypatch):
+    """Patch subprocess.Popen with FakePopen.
+
+    Call the fixture with the stdout/returncode/stderr to serve, or with a
+    side_effect list of such dicts (or exceptions), one per call. With
+    timeout=True the run_cli watchdog kills the process straight away.
+    It returns the list of commands that were run.
+    """
+
+    def install(stdout="", returncode=0, stderr="", side_effect=None, timeout=False):
+        if side_effect is None:
+            side_effect = [{"stdout": stdout, "returncode": returncode, "stderr": stderr}]
+        FakePopen.results = list(side_effect)
+        FakePopen.commands = []
+        monkeypatch.setattr(subprocess, "Popen", FakePopen)
+        if timeout:
+            monkeypatch.setattr(threading, "Timer", _ImmediateTimer)
+        return FakePopen.commands
+
+    return install
 
 
 @pytest.fixture
@@ -22,6 +22,40 @@ class TestStatusEndpoint:
         assert data["idle"] is True
 
 
+class TestPollEndpoint:
+    def test_poll_bundles_all_sections(self, client):
+        resp = client.get("/api/poll")
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert set(data) == {"status", "queue", "health"}
+        assert data["status"]["idle"] is True
+        assert data["queue"] == []
+        assert data["health"]["status"] == "ok"
+
+    def test_poll_include_subset(self, client):
+        client.post("/api/queue/add", json={"url": "https://www.youtube.com/watch?v=abc"})
+        resp = client.get("/api/poll?include=status,queue,bogus")
+        data = resp.get_json()
+        assert set(data) == {"status", "queue"}
+        assert data["queue"][0]["url"] == "https://www.youtube.com/watch?v=abc"
+
+
+class TestConditionalGet:
+    def test_unchanged_queue_returns_304(self, client):
+        first = client.get("/api/queue")
+        etag = first.headers["ETag"]
+        resp = client.get("/api/queue", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+    def test_changed_queue_returns_body(self, client):
+        etag = client.get("/api/queue").headers["ETag"]
+        client.post("/api/queue/add", json={"url": "https://www.youtube.com/watch?v=abc"})
+        resp = client.get("/api/queue", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert len(resp.get_json()) == 1
+
+
 class TestQueueEndpoints:
     def test_add_to_queue(self, client):
         resp = client.post("/api/queue/add", json={"url": "https://www.youtube.com/watch?v=abc"})
@@ -138,21 +172,14 @@ class TestImportPlaylistEndpoint:
         resp = client.post("/api/queue/import-playlist", json={"url": "https://www.youtube.com/watch?v=abc"})
         assert resp.status_code == 400
 
-    def test_import_playlist_success(self, client, monkeypatch):
+    def test_import_playlist_success(self, client, fake_popen):
         """Mocked playlist import adds videos to queue."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(
-                args=args[0], returncode=0,
-                stdout=(
-                    "My PL\thttps://www.youtube.com/watch?v=x\tVid 1\n"
-                    "My PL\thttps://www.youtube.com/watch?v=y\tVid 2\n"
-                ),
-                stderr="",
-            )
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        fake_popen(
+            stdout=(
+                "My PL\thttps://www.youtube.com/watch?v=x\tVid 1\n"
+                "My PL\thttps://www.youtube.com/watch?v=y\tVid 2\n"
+            ),
+        )
         resp = client.post("/api/queue/import-playlist",
                            json={"url": "https://www.youtube.com/playlist?list=PLtest"})
         assert resp.status_code == 200
@@ -164,14 +191,9 @@ class TestImportPlaylistEndpoint:
         queue = client.get("/api/queue").get_json()
         assert len(queue) == 2
 
-    def test_import_playlist_empty(self, client, monkeypatch):
+    def test_import_playlist_empty(self, client, fake_popen):
         """Empty playlist returns 404."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(args=args[0], returncode=0, stdout="", stderr="")
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        fake_popen()
         resp = client.post("/api/queue/import-playlist",
                            json={"url": "https://www.youtube.com/playlist?list=PLempty"})
         assert resp.status_code == 404
@@ -189,21 +211,14 @@ class TestImportPlaylistToCollection:
         )
         assert resp.status_code == 400
 
-    def test_import_to_collection_success(self, client, monkeypatch):
+    def test_import_to_collection_success(self, client, fake_popen):
         """Imports playlist as a named collection."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(
-                args=args[0], returncode=0,
-                stdout=(
-                    "Cool Playlist\thttps://www.youtube.com/watch?v=a\tVid A\n"
-                    "Cool Playlist\thttps://www.youtube.com/watch?v=b\tVid B\n"
-                ),
-                stderr="",
-            )
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        fake_popen(
+            stdout=(
+                "Cool Playlist\thttps://www.youtube.com/watch?v=a\tVid A\n"
+                "Cool Playlist\thttps://www.youtube.com/watch?v=b\tVid B\n"
+            ),
+        )
         resp = client.post("/api/playlists/import-playlist",
                            json={"url": "https://www.youtube.com/playlist?list=PLtest"})
         assert resp.status_code == 200
@@ -217,14 +232,9 @@ class TestImportPlaylistToCollection:
         assert pl["name"] == "Cool Playlist"
         assert len(pl["items"]) == 2
 
-    def test_import_to_collection_empty(self, client, monkeypatch):
+    def test_import_to_collection_empty(self, client, fake_popen):
         """Empty playlist returns 404."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(args=args[0], returncode=0, stdout="", stderr="")
-
-        monkeypatch.setattr(subprocess, "run", mock_run)
+        fake_popen()
         resp = client.post("/api/playlists/import-playlist",
                            json={"url": "https://www.youtube.com/playlist?list=PLempty"})
         assert resp.status_code == 404
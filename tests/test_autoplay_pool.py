@@ -63,6 +63,22 @@ class TestPoolCRUD:
         result = pool.add_video("test-block", "https://www.youtube.com/watch?v=abc12345678", "Test Again")
         assert result is None
 
+    def test_add_videos_bulk(self, pool):
+        pool.add_video("test-block", "https://www.youtube.com/watch?v=abc12345678", "Existing")
+        added, skipped = pool.add_videos_bulk(
+            "test-block",
+            [
+                ("https://www.youtube.com/watch?v=abc12345678", "Dup", 60),
+                ("https://www.youtube.com/watch?v=def12345678", "New", 120),
+                ("https://www.youtube.com/watch?v=def12345678", "New again", 120),
+            ],
+            source="discovery",
+        )
+        assert (added, skipped) == (1, 2)
+        video = pool.get_video("test-block", "def12345678")
+        assert video["source"] == "discovery"
+        assert video["duration"] == 120
+
     def test_same_video_different_blocks(self, pool):
         r1 = pool.add_video("block-a", "https://www.youtube.com/watch?v=abc12345678", "Test")
         r2 = pool.add_video("block-b", "https://www.youtube.com/watch?v=abc12345678", "Test")
@@ -5,6 +5,7 @@ from picast.config import (
     ServerConfig,
     _parse_config,
     ytdl_auth_args,
+    ytdl_auth_params,
     ytdl_raw_options_auth,
 )
 
@@ -96,6 +97,21 @@ class TestYtdlRawOptionsAuth:
         assert result == "cookies-from-browser=firefox"
 
 
+class TestYtdlAuthParams:
+    def test_no_auth(self):
+        assert ytdl_auth_params(ServerConfig()) == {}
+
+    def test_cookies_from_browser(self):
+        config = ServerConfig(ytdl_cookies_from_browser="chromium", ytdl_po_token="tok123")
+        assert ytdl_auth_params(config) == {"cookiesfrombrowser": ("chromium",)}
+
+    def test_po_token(self):
+        config = ServerConfig(ytdl_po_token="tok123")
+        params = ytdl_auth_params(config)
+        assert params["extractor_args"]["youtube"]["po_token"] == ["tok123"]
+        assert params["extractor_args"]["youtube"]["player_client"] == ["web"]
+
+
 class TestPipulseConfig:
     def test_defaults(self):
         config = PipulseConfig()
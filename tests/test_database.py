@@ -72,6 +72,10 @@ class TestDatabase:
         row = db.fetchone("PRAGMA journal_mode")
         assert row is not None
 
+    def test_synchronous_normal(self, db):
+        row = db.fetchone("PRAGMA synchronous")
+        assert row["synchronous"] == 1  # NORMAL
+
     def test_foreign_keys_enabled(self, db):
         row = db.fetchone("PRAGMA foreign_keys")
         assert row["foreign_keys"] == 1
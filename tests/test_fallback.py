@@ -90,6 +90,23 @@ class TestPlayerFallbackStatus:
         assert status["fallback_active"] is True
 
 
+    def test_idle_status_skips_mpv_ipc(self):
+        """Idle player loop with mpv disconnected doesn't try to reach mpv."""
+        mpv = MagicMock(spec=MPVClient)
+        mpv.connected = False
+        queue = MagicMock(spec=QueueManager)
+        player = Player(mpv, queue)
+        player._running = True
+
+        status = player.get_status()
+        mpv.get_status.assert_not_called()
+        assert status["idle"] is True
+        assert status["connected"] is False
+        assert status["player_running"] is True
+        assert status["url"] == ""
+        assert "loop_enabled" in status
+
+
 class TestPlayerFallbackLoop:
     """Test _loop() fallback activation logic."""
 
@@ -170,6 +170,27 @@ class TestBlockMetadataCRUD:
         assert blocks[0]["display_name"] == "Morning v2"
         assert blocks[0]["emoji"] == "sun"
 
+    def test_bulk_upsert(self, fresh_client):
+        resp = fresh_client.post(
+            "/api/settings/blocks/bulk",
+            json={
+                "blocks": [
+                    {"block_name": "morning", "display_name": "Morning", "emoji": "sun"},
+                    {"block_name": "evening"},
+                    {"display_name": "no name"},
+                ]
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.get_json() == {"ok": True, "imported": 2}
+        blocks = {b["block_name"]: b for b in fresh_client.get("/api/settings/blocks").get_json()}
+        assert blocks["morning"]["emoji"] == "sun"
+        assert blocks["evening"]["display_name"] == "evening"
+
+    def test_bulk_requires_list(self, fresh_client):
+        resp = fresh_client.post("/api/settings/blocks/bulk", json={"blocks": "morning"})
+        assert resp.status_code == 400
+
     def test_delete_block(self, fresh_client):
         fresh_client.post(
             "/api/settings/blocks",
@@ -2,7 +2,7 @@
 
 
 from picast.server.database import Database
-from picast.server.queue_manager import QueueManager
+from picast.server.queue_manager import QueueItem, QueueManager
 
 
 class TestQueueManager:
@@ -114,6 +114,36 @@ class TestQueueManager:
         assert pending[1].id == item1.id
         assert pending[2].id == item2.id
 
+    def test_reorder_partial_keeps_rest_in_order(self, queue):
+        item1 = queue.add("https://www.youtube.com/watch?v=a")
+        item2 = queue.add("https://www.youtube.com/watch?v=b")
+        item3 = queue.add("https://www.youtube.com/watch?v=c")
+        queue.reorder([item3.id])
+        assert [i.id for i in queue.get_pending()] == [item3.id, item1.id, item2.id]
+
+    def test_push_to_front(self, queue):
+        item1 = queue.add("https://www.youtube.com/watch?v=a")
+        item2 = queue.add("https://www.youtube.com/watch?v=b")
+        item3 = queue.add("https://www.youtube.com/watch?v=c")
+        assert queue.push_to_front(item3.id) is True
+        assert [i.id for i in queue.get_pending()] == [item3.id, item1.id, item2.id]
+
+    def test_push_to_front_only_item(self, queue):
+        item = queue.add("https://www.youtube.com/watch?v=a")
+        assert queue.push_to_front(item.id) is True
+        assert queue.get_next().id == item.id
+
+    def test_push_to_front_nonexistent(self, queue):
+        assert queue.push_to_front(999) is False
+
+    def test_item_from_dict_ignores_unknown_keys(self):
+        item = QueueItem.from_dict(
+            {"id": 7, "url": "https://youtu.be/abc", "status": "played", "position": 3}
+        )
+        assert item.id == 7
+        assert item.status == "played"
+        assert QueueItem.from_dict(item.to_dict()) == item
+
     def test_import_queue_txt(self, queue, tmp_path):
         queue_txt = tmp_path / "queue.txt"
         queue_txt.write_text(
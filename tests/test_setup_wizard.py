@@ -15,6 +15,7 @@ from picast.setup_wizard import (
     _write_toml,
     detect_chromium_cookies,
     fetch_pipulse_blocks,
+    import_blocks_to_picast,
     check_pipulse_connection,
     validate_pushover,
 )
@@ -36,6 +37,9 @@ class TestTomlValue:
     def test_string(self):
         assert _toml_value("hello") == '"hello"'
 
+    def test_string_escaped(self):
+        assert _toml_value('a"b\\c') == '"a\\"b\\\\c"'
+
     def test_list(self):
         assert _toml_value([1, 2, 3]) == "[1, 2, 3]"
 
@@ -106,6 +110,12 @@ class TestWriteToml:
         content2 = f.read_text()
         assert content1 == content2
 
+    def test_special_characters_roundtrip(self, tmp_path):
+        f = tmp_path / "special.toml"
+        data = {"youtube": {"po_token": 'ab"c\\d', "note": "line1\nline2 caf\u00e9"}}
+        _write_toml(f, data)
+        assert _load_toml(f) == data
+
     def test_nested_tables(self, tmp_path):
         f = tmp_path / "nested.toml"
         data = {
@@ -123,9 +133,18 @@ class TestWriteToml:
         assert "[autoplay.themes.focus]" in content
         assert 'queries = ["lofi beats"]' in content
 
+    def test_deeply_nested_tables(self, tmp_path):
+        f = tmp_path / "deep.toml"
+        data = {"a": {"b": {"c": {"d": {"x": 1}}}}}
+        _write_toml(f, data)
+        content = f.read_text()
+        assert "[a.b.c.d]" in content
+        assert "[a]" not in content
+        assert _load_toml(f) == data
+
 
 class TestValidatePushover:
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_success(self, mock_urlopen):
         mock_resp = MagicMock()
         mock_resp.read.return_value = json.dumps({"status": 1}).encode()
@@ -137,7 +156,7 @@ class TestValidatePushover:
         assert ok is True
         assert "sent" in msg.lower()
 
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_invalid_token(self, mock_urlopen):
         import urllib.error
         error_body = json.dumps({"errors": ["invalid token"]}).encode()
@@ -149,7 +168,7 @@ class TestValidatePushover:
         assert ok is False
         assert "invalid" in msg.lower() or "credentials" in msg.lower()
 
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_connection_error(self, mock_urlopen):
         import urllib.error
         mock_urlopen.side_effect = urllib.error.URLError("network down")
@@ -179,7 +198,7 @@ class TestDetectChromiumCookies:
 
 
 class TestPipulseConnection:
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_success(self, mock_urlopen):
         mock_resp = MagicMock()
         mock_resp.read.return_value = json.dumps({"status": "ok", "version": "1.3.0"}).encode()
@@ -191,7 +210,7 @@ class TestPipulseConnection:
         assert ok is True
         assert "1.3.0" in msg
 
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_connection_refused(self, mock_urlopen):
         import urllib.error
         mock_urlopen.side_effect = urllib.error.URLError("Connection refused")
@@ -201,7 +220,7 @@ class TestPipulseConnection:
 
 
 class TestFetchPipulseBlocks:
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_success(self, mock_urlopen):
         blocks = {
             "blocks": {
@@ -218,7 +237,7 @@ class TestFetchPipulseBlocks:
         assert ok is True
         assert "morning" in data
 
-    @patch("picast.setup_wizard.urllib.request.urlopen")
+    @patch("urllib.request.urlopen")
     def test_connection_error(self, mock_urlopen):
         import urllib.error
         mock_urlopen.side_effect = urllib.error.URLError("timeout")
@@ -269,3 +288,62 @@ class TestSetupStatusEndpoint:
         r = client.get("/api/settings/setup-status")
         d = r.get_json()
         assert d["pipulse"]["configured"] is False
+
+
+class TestImportBlocks:
+    BLOCKS = {
+        "morning": {"display_name": "Morning Foundation", "emoji": "sunrise"},
+        "evening": {"display_name": "Evening"},
+    }
+
+    @staticmethod
+    def _response(payload):
+        resp = MagicMock()
+        resp.read.return_value = json.dumps(payload).encode()
+        resp.__enter__ = MagicMock(return_value=resp)
+        resp.__exit__ = MagicMock(return_value=False)
+        return resp
+
+    @patch("urllib.request.urlopen")
+    def test_single_bulk_request(self, mock_urlopen):
+        mock_urlopen.return_value = self._response({"ok": True, "imported": 2})
+
+        assert import_blocks_to_picast(self.BLOCKS) == 2
+        assert mock_urlopen.call_count == 1
+        req = mock_urlopen.call_args[0][0]
+        assert req.full_url.endswith("/api/settings/blocks/bulk")
+        sent = json.loads(req.data)["blocks"]
+        assert [b["block_name"] for b in sent] == ["morning", "evening"]
+
+    @patch("urllib.request.urlopen")
+    def test_falls_back_without_bulk_endpoint(self, mock_urlopen):
+        import urllib.error
+
+        not_allowed = urllib.error.HTTPError("url", 405, "Method Not Allowed", {}, None)
+        mock_urlopen.side_effect = [
+            not_allowed,
+            self._response({"ok": True}),
+            self._response({"ok": True}),
+        ]
+
+        assert import_blocks_to_picast(self.BLOCKS) == 2
+        urls = [c[0][0].full_url for c in mock_urlopen.call_args_list]
+        assert urls[1].endswith("/api/settings/blocks")
+
+    @patch("urllib.request.urlopen")
+    def test_fallback_posts_every_block(self, mock_urlopen):
+        import urllib.error
+
+        blocks = {f"block{i}": {"display_name": f"Block {i}"} for i in range(10)}
+
+        def respond(req, timeout=None):
+            if req.full_url.endswith("/bulk"):
+                raise urllib.error.HTTPError(req.full_url, 405, "Method Not Allowed", {}, None)
+            return self._response({"ok": True})
+
+        mock_urlopen.side_effect = respond
+
+        assert import_blocks_to_picast(blocks) == 10
+        reqs = [c[0][0] for c in mock_urlopen.call_args_list[1:]]
+        assert all(r.full_url.endswith("/api/settings/blocks") for r in reqs)
+        assert sorted(json.loads(r.data)["block_name"] for r in reqs) == sorted(blocks)
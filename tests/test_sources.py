@@ -3,7 +3,9 @@
 
 
 from picast.config import ServerConfig
-from picast.server.sources.base import SourceItem, SourceRegistry
+from picast.server.sources import ytdl
+from picast.server.sources.archive import ArchiveSource
+from picast.server.sources.base import MetadataCache, SourceItem, SourceRegistry
 from picast.server.sources.local import MEDIA_EXTENSIONS, LocalSource
 from picast.server.sources.twitch import TwitchSource
 from picast.server.sources.youtube import YouTubeSource
@@ -38,6 +40,15 @@ class TestSourceRegistry:
         assert reg.detect("/home/pi/video.mp4") == "local"
         assert reg.detect("file:///home/pi/video.mp4") == "local"
 
+    def test_detect_by_host_before_handler_scan(self):
+        reg = SourceRegistry()
+        reg.register(LocalSource(media_dirs=["/tmp"]))
+        reg.register(ArchiveSource())
+        # LocalSource would claim the .mp4 extension; the host index wins
+        assert reg.detect("https://archive.org/download/film/film.mp4") == "archive"
+        assert reg.detect("https://www.archive.org/details/film") == "archive"
+        assert reg.detect("/home/pi/video.mp4") == "local"
+
     def test_detect_fallback(self):
         reg = SourceRegistry()
         assert reg.detect("https://unknown.com/video") == "youtube"
@@ -71,6 +82,12 @@ class TestYouTubeSource:
         assert yt.matches("https://vimeo.com/123") is False
         assert yt.matches("/local/file.mp4") is False
 
+    def test_matches_host_not_substring(self):
+        yt = YouTubeSource()
+        assert yt.matches("https://music.youtube.com/watch?v=abc") is True
+        assert yt.matches("https://evil.example/youtube.com/watch?v=abc") is False
+        assert yt.matches("https://notyoutube.com/watch?v=abc") is False
+
     def test_mpv_args(self):
         yt = YouTubeSource("bestvideo+bestaudio")
         args = yt.get_mpv_args("https://youtube.com/watch?v=abc")
@@ -95,70 +112,56 @@ class TestYouTubeSource:
         assert yt.is_playlist("not a url") is False
         assert yt.is_playlist("") is False
 
-    def test_extract_playlist_mocked(self, monkeypatch):
+    def test_extract_playlist_mocked(self, fake_popen):
         """Test playlist extraction with mocked subprocess."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            result = subprocess.CompletedProcess(
-                args=args[0],
-                returncode=0,
-                stdout=(
-                    "My Playlist\thttps://www.youtube.com/watch?v=aaa\tFirst Video\n"
-                    "My Playlist\thttps://www.youtube.com/watch?v=bbb\tSecond Video\n"
-                ),
-                stderr="",
-            )
-            return result
-
+        fake_popen(
+            stdout=(
+                "My Playlist\thttps://www.youtube.com/watch?v=aaa\tFirst Video\n"
+                "My Playlist\thttps://www.youtube.com/watch?v=bbb\tSecond Video\n"
+            ),
+        )
         yt = YouTubeSource()
-        monkeypatch.setattr(subprocess, "run", mock_run)
         title, items = yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest")
         assert title == "My Playlist"
         assert len(items) == 2
         assert items[0] == ("https://www.youtube.com/watch?v=aaa", "First Video")
         assert items[1] == ("https://www.youtube.com/watch?v=bbb", "Second Video")
 
-    def test_extract_playlist_empty(self, monkeypatch):
+    def test_extract_playlist_empty(self, fake_popen):
         """Empty playlist returns empty tuple."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(args=args[0], returncode=0, stdout="", stderr="")
-
+        fake_popen()
         yt = YouTubeSource()
-        monkeypatch.setattr(subprocess, "run", mock_run)
         title, items = yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest")
         assert title == ""
         assert items == []
 
-    def test_extract_playlist_failure(self, monkeypatch):
+    def test_extract_playlist_failure(self, fake_popen, caplog):
         """Failed yt-dlp returns empty tuple."""
-        import subprocess
-
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(
-                args=args[0], returncode=1, stdout="", stderr="ERROR",
-            )
-
+        fake_popen(
+            stdout="PL\thttps://www.youtube.com/watch?v=x\tVid\n",
+            returncode=1,
+            stderr="ERROR: private playlist",
+        )
         yt = YouTubeSource()
-        monkeypatch.setattr(subprocess, "run", mock_run)
         title, items = yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest")
         assert title == ""
         assert items == []
+        assert "ERROR: private playlist" in caplog.text
 
-    def test_extract_playlist_bare_video_ids(self, monkeypatch):
-        """Video IDs without full URLs get expanded."""
+    def test_extract_playlist_missing_binary(self, monkeypatch):
         import subprocess
 
-        def mock_run(*args, **kwargs):
-            return subprocess.CompletedProcess(
-                args=args[0], returncode=0,
-                stdout="Test PL\tabc123\tA Video\n", stderr="",
-            )
+        def missing(*args, **kwargs):
+            raise FileNotFoundError("yt-dlp")
 
+        monkeypatch.setattr(subprocess, "Popen", missing)
+        yt = YouTubeSource()
+        assert yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest") == ("", [])
+
+    def test_extract_playlist_bare_video_ids(self, fake_popen):
+        """Video IDs without full URLs get expanded."""
+        fake_popen(stdout="Test PL\tabc123\tA Video\n")
         yt = YouTubeSource()
-        monkeypatch.setattr(subprocess, "run", mock_run)
         title, items = yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest")
         assert title == "Test PL"
         assert len(items) == 1
@@ -183,8 +186,16 @@ class TestYouTubeSource:
         assert "--extractor-args" in args
         assert "po_token=abc123" in args[1]
 
-    def test_extract_playlist_includes_auth(self, monkeypatch):
+    def test_extract_playlist_includes_auth(self, fake_popen):
         """Auth args are passed to yt-dlp in extract_playlist."""
+        commands = fake_popen(stdout="PL\thttps://www.youtube.com/watch?v=x\tVid\n")
+        config = ServerConfig(ytdl_cookies_from_browser="chromium")
+        yt = YouTubeSource(config=config)
+        yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest")
+        assert "--cookies-from-browser=chromium" in commands[0]
+
+    def test_get_metadata_includes_auth(self, monkeypatch):
+        """Auth args are passed to yt-dlp in get_metadata."""
         import subprocess
 
         captured_cmd = []
@@ -193,35 +204,263 @@ class TestYouTubeSource:
             captured_cmd.extend(cmd)
             return subprocess.CompletedProcess(
                 args=cmd, returncode=0,
-                stdout="PL\thttps://www.youtube.com/watch?v=x\tVid\n",
+                stdout="Title\t120\thttps://img.youtube.com/vi/x/default.jpg",
                 stderr="",
             )
 
         config = ServerConfig(ytdl_cookies_from_browser="chromium")
         yt = YouTubeSource(config=config)
         monkeypatch.setattr(subprocess, "run", mock_run)
-        yt.extract_playlist("https://www.youtube.com/playlist?list=PLtest")
+        yt.get_metadata("https://www.youtube.com/watch?v=abc")
         assert "--cookies-from-browser=chromium" in captured_cmd
 
-    def test_get_metadata_includes_auth(self, monkeypatch):
-        """Auth args are passed to yt-dlp in get_metadata."""
+
+    def test_get_metadata_cached(self, monkeypatch):
+        """Repeat lookups for the same URL reuse the first yt-dlp result."""
         import subprocess
 
-        captured_cmd = []
+        calls = []
 
         def mock_run(cmd, **kwargs):
-            captured_cmd.extend(cmd)
+            calls.append(cmd)
             return subprocess.CompletedProcess(
-                args=cmd, returncode=0,
-                stdout="Title\t120\thttps://img.youtube.com/vi/x/default.jpg",
-                stderr="",
+                args=cmd, returncode=0, stdout="Title\t120\tthumb", stderr="",
             )
 
-        config = ServerConfig(ytdl_cookies_from_browser="chromium")
-        yt = YouTubeSource(config=config)
+        yt = YouTubeSource()
         monkeypatch.setattr(subprocess, "run", mock_run)
-        yt.get_metadata("https://www.youtube.com/watch?v=abc")
-        assert "--cookies-from-browser=chromium" in captured_cmd
+        first = yt.get_metadata("https://www.youtube.com/watch?v=abc")
+        second = yt.get_metadata("https://www.youtube.com/watch?v=abc")
+        assert first.title == "Title"
+        assert second is first
+        assert len(calls) == 1
+
+    def test_get_metadata_failure_not_cached(self, monkeypatch):
+        import subprocess
+
+        calls = []
+
+        def mock_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(args=cmd, returncode=1, stdout="", stderr="")
+
+        yt = YouTubeSource()
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        assert yt.get_metadata("https://www.youtube.com/watch?v=abc") is None
+        assert yt.get_metadata("https://www.youtube.com/watch?v=abc") is None
+        assert len(calls) == 2
+
+    def test_get_metadata_batch_single_process(self, monkeypatch):
+        """Uncached URLs are resolved by one yt-dlp run; cached ones are reused."""
+        import subprocess
+
+        calls = []
+
+        def mock_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(
+                args=cmd, returncode=1,  # one URL failed
+                stdout=(
+                    "https://youtu.be/aaa\tFirst\t60\tthumb-a\n"
+                    "https://youtu.be/bbb\tSecond\tNA\tthumb-b\n"
+                ),
+                stderr="ERROR: ccc unavailable",
+            )
+
+        yt = YouTubeSource()
+        cached = SourceItem(url="https://youtu.be/zzz", title="Cached")
+        yt._meta_cache.put("https://youtu.be/zzz", cached)
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        urls = [
+            "https://youtu.be/aaa", "https://youtu.be/bbb",
+            "https://youtu.be/ccc", "https://youtu.be/zzz",
+        ]
+        results = yt.get_metadata_batch(urls)
+        assert len(calls) == 1
+        assert "https://youtu.be/zzz" not in calls[0]
+        assert results["https://youtu.be/aaa"].duration == 60
+        assert results["https://youtu.be/bbb"].duration == 0
+        assert "https://youtu.be/ccc" not in results
+        assert results["https://youtu.be/zzz"] is cached
+        # Batch results feed the per-URL cache
+        assert yt.get_metadata("https://youtu.be/aaa").title == "First"
+        assert len(calls) == 1
+
+    def test_resolve_playlist_metadata_keeps_order(self, monkeypatch):
+        yt = YouTubeSource()
+
+        def fake_get_metadata(url):
+            if url.endswith("bad"):
+                return None
+            return SourceItem(url=url, title=url[-3:])
+
+        monkeypatch.setattr(yt, "get_metadata", fake_get_metadata)
+        urls = [f"https://youtu.be/v{i:02d}" for i in range(10)]
+        items = yt.resolve_playlist_metadata(urls[:5] + ["https://youtu.be/bad"] + urls[5:])
+        assert [i.url for i in items] == urls
+        assert yt.resolve_playlist_metadata([]) == []
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL recording the options it was built with."""
+
+    instances = []
+    info = {}
+
+    def __init__(self, opts):
+        self.opts = opts
+        FakeYoutubeDL.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=True):
+        assert download is False
+        if isinstance(self.info, Exception):
+            raise self.info
+        return self.info
+
+
+class TestInProcessYtdl:
+    def _install(self, monkeypatch, info):
+        import types
+
+        FakeYoutubeDL.instances = []
+        FakeYoutubeDL.info = info
+        monkeypatch.setattr(ytdl, "_yt_dlp", types.SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+
+    def _no_subprocess(self, monkeypatch):
+        import subprocess
+
+        def fail(*args, **kwargs):
+            raise AssertionError("subprocess should not be used")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+
+    def test_youtube_metadata_inprocess(self, monkeypatch):
+        self._install(monkeypatch, {"title": "T", "duration": 95, "thumbnail": "th"})
+        self._no_subprocess(monkeypatch)
+        config = ServerConfig(ytdl_cookies_from_browser="chromium")
+        item = YouTubeSource(config=config).get_metadata("https://youtu.be/abc")
+        assert (item.title, item.duration, item.thumbnail) == ("T", 95, "th")
+        opts = FakeYoutubeDL.instances[0].opts
+        assert opts["cookiesfrombrowser"] == ("chromium",)
+        assert opts["skip_download"] is True
+
+    def test_youtube_metadata_inprocess_error(self, monkeypatch):
+        self._install(monkeypatch, RuntimeError("Video unavailable"))
+        self._no_subprocess(monkeypatch)
+        assert YouTubeSource().get_metadata("https://youtu.be/abc") is None
+
+    def test_extract_playlist_inprocess(self, monkeypatch):
+        self._install(monkeypatch, {
+            "title": "My PL",
+            "entries": [
+                {"url": "https://www.youtube.com/watch?v=aaa", "title": "A"},
+                {"url": "bbb", "title": "B"},
+                {"url": None},
+            ],
+        })
+        self._no_subprocess(monkeypatch)
+        title, items = YouTubeSource().extract_playlist(
+            "https://www.youtube.com/playlist?list=PLtest"
+        )
+        assert title == "My PL"
+        assert items == [
+            ("https://www.youtube.com/watch?v=aaa", "A"),
+            ("https://www.youtube.com/watch?v=bbb", "B"),
+        ]
+        assert FakeYoutubeDL.instances[0].opts["extract_flat"] == "in_playlist"
+
+    def test_archive_multifile_uses_first_entry(self, monkeypatch):
+        self._install(monkeypatch, {
+            "_type": "playlist",
+            "entries": [{"title": "Part 1", "duration": 600}, {"title": "Part 2"}],
+        })
+        self._no_subprocess(monkeypatch)
+        item = ArchiveSource().get_metadata("https://archive.org/details/x")
+        assert item.title == "Part 1"
+        assert item.duration == 600
+
+    def test_parse_duration(self):
+        assert ytdl.parse_duration("212.5") == 212.5
+        assert ytdl.parse_duration("NA") == 0
+        assert ytdl.parse_duration("") == 0
+
+    def test_run_cli_drains_large_stderr(self):
+        """A run writing more than a pipe buffer to stderr must not stall."""
+        import sys
+
+        lines = []
+        code = "import sys; sys.stderr.write('x' * 200000); print('done')"
+        returncode, stderr, timed_out = ytdl.run_cli(
+            [sys.executable, "-c", code], lines.append, timeout=10,
+        )
+        assert (returncode, timed_out) == (0, False)
+        assert lines == ["done"]
+        assert len(stderr) == 200000
+
+
+class TestMetadataCache:
+    def test_get_missing(self):
+        assert MetadataCache().get("http://a") is None
+
+    def test_put_get(self):
+        cache = MetadataCache()
+        item = SourceItem(url="http://a", title="A")
+        cache.put("http://a", item)
+        assert cache.get("http://a") is item
+
+    def test_expired_entry_dropped(self, monkeypatch):
+        import time
+
+        cache = MetadataCache(ttl=10)
+        cache.put("http://a", SourceItem(url="http://a"))
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get("http://a") is None
+        assert len(cache) == 0
+
+    def test_evicts_oldest_when_full(self):
+        cache = MetadataCache(max_size=2)
+        for url in ("http://a", "http://b", "http://c"):
+            cache.put(url, SourceItem(url=url))
+        assert len(cache) == 2
+        assert cache.get("http://a") is None
+        assert cache.get("http://c") is not None
+
+    def test_disk_cache_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "meta.db")
+        item = SourceItem(
+            url="http://a", title="A", source_type="youtube", duration=61.0, thumbnail="t"
+        )
+        MetadataCache(path=path).put("http://a", item)
+        loaded = MetadataCache(path=path).get("http://a")
+        assert loaded.to_dict() == item.to_dict()
+
+    def test_disk_cache_respects_ttl(self, tmp_path, monkeypatch):
+        import time
+
+        path = str(tmp_path / "meta.db")
+        MetadataCache(ttl=10, path=path).put("http://a", SourceItem(url="http://a"))
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        assert MetadataCache(ttl=10, path=path).get("http://a") is None
+
+    def test_disk_cache_clear(self, tmp_path):
+        path = str(tmp_path / "meta.db")
+        cache = MetadataCache(path=path)
+        cache.put("http://a", SourceItem(url="http://a"))
+        cache.clear()
+        assert MetadataCache(path=path).get("http://a") is None
+
+    def test_unopenable_disk_cache_falls_back_to_memory(self, tmp_path):
+        cache = MetadataCache(path=str(tmp_path / "missing" / "meta.db"))
+        cache.put("http://a", SourceItem(url="http://a"))
+        assert cache.get("http://a") is not None
 
 
 class TestLocalSource:
@@ -266,6 +505,37 @@ class TestLocalSource:
         # .txt should be excluded
         assert "text" not in names
 
+    def test_browse_orders_dirs_first_case_insensitive(self, tmp_path):
+        (tmp_path / "b.MKV").touch()
+        (tmp_path / "A.mp4").touch()
+        (tmp_path / "zeta").mkdir()
+        (tmp_path / "Alpha").mkdir()
+        (tmp_path / "clip.tar.gz").touch()
+        local = LocalSource(media_dirs=[str(tmp_path)])
+        titles = [i.title for i in local.browse(str(tmp_path))]
+        assert titles == ["Alpha/", "zeta/", "A", "b"]
+
+    def test_default_media_dirs_scanned_lazily(self, monkeypatch):
+        calls = []
+
+        def fake_scan():
+            calls.append(1)
+            return [f"/media/drive{len(calls)}"]
+
+        monkeypatch.setattr(LocalSource, "_default_media_dirs", staticmethod(fake_scan))
+        local = LocalSource()
+        assert calls == []
+        assert local.media_dirs == ["/media/drive1"]
+        assert local.media_dirs == ["/media/drive1"]
+        assert len(calls) == 1
+        local.refresh()
+        assert local.media_dirs == ["/media/drive2"]
+
+    def test_refresh_keeps_configured_dirs(self):
+        local = LocalSource(media_dirs=["/tmp"])
+        local.refresh()
+        assert local.media_dirs == ["/tmp"]
+
     def test_browse_nonexistent(self):
         local = LocalSource()
         items = local.browse("/nonexistent/path/xyz")
@@ -323,6 +593,173 @@ class TestTwitchSource:
         assert "testchannel" in meta.title
         assert meta.source_type == "twitch"
 
+    def test_stream_url_reuses_metadata_json(self, monkeypatch):
+        import json
+        import subprocess
+
+        calls = []
+        payload = {
+            "metadata": {"author": "chan", "title": "Live"},
+            "streams": {"best": {"type": "hls", "url": "https://hls.example/best.m3u8"}},
+        }
+
+        def mock_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(
+                args=cmd, returncode=0, stdout=json.dumps(payload), stderr="",
+            )
+
+        tw = TwitchSource()
+        tw._streamlink_available = True
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        meta = tw.get_metadata("https://www.twitch.tv/chan")
+        assert meta.title == "chan - Live"
+        assert tw.get_stream_url("https://www.twitch.tv/chan") == "https://hls.example/best.m3u8"
+        assert len(calls) == 1
+
+    def test_stream_url_cache_expires(self, monkeypatch):
+        import subprocess
+
+        from picast.server.sources import twitch
+
+        calls = []
+
+        def mock_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(
+                args=cmd, returncode=0, stdout="https://hls.example/fresh.m3u8\n", stderr="",
+            )
+
+        tw = TwitchSource()
+        tw._streamlink_available = True
+        tw._stream_cache["https://www.twitch.tv/chan"] = (
+            {"best": {"url": "https://hls.example/stale.m3u8"}},
+            twitch.time.monotonic() - twitch.STREAM_CACHE_TTL - 1,
+        )
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        assert tw.get_stream_url("https://www.twitch.tv/chan") == "https://hls.example/fresh.m3u8"
+        assert len(calls) == 1
+
+    def test_stream_cache_drops_expired_entries(self, monkeypatch):
+        import json
+        import subprocess
+
+        from picast.server.sources import twitch
+
+        payload = {"streams": {"best": {"url": "https://hls.example/best.m3u8"}}}
+        monkeypatch.setattr(
+            subprocess, "run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(
+                args=cmd, returncode=0, stdout=json.dumps(payload), stderr="",
+            ),
+        )
+        tw = TwitchSource()
+        tw._streamlink_available = True
+        tw._stream_cache["https://www.twitch.tv/gone"] = (
+            {"best": {"url": "https://hls.example/gone.m3u8"}},
+            twitch.time.monotonic() - twitch.STREAM_CACHE_TTL - 1,
+        )
+        tw.get_metadata("https://www.twitch.tv/chan")
+        assert list(tw._stream_cache) == ["https://www.twitch.tv/chan"]
+
+
+class TestArchiveSource:
+    def test_matches_exact_host(self):
+        ar = ArchiveSource()
+        assert ar.matches("https://archive.org/details/foo") is True
+        assert ar.matches("https://www.archive.org/details/foo") is True
+        assert ar.matches("http://evil.com/archive.org/foo") is False
+        assert ar.matches("https://archive.org.evil.com/details/foo") is False
+
+
+class TestArchiveSearch:
+    def _conn(self, docs, status=200, body=None):
+        import io
+        import json
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        if body is None:
+            body = json.dumps({"response": {"docs": docs}}).encode()
+        conn = MagicMock()
+        conn.getresponse.side_effect = lambda: SimpleNamespace(
+            status=status, read=io.BytesIO(body).read
+        )
+        return conn
+
+    def test_search_reuses_connection(self, monkeypatch):
+        import http.client
+
+        conn = self._conn([{"identifier": "night_of_x", "title": "Night", "year": "1985"}])
+        created = []
+
+        def fake_conn(host, timeout=None):
+            created.append(host)
+            return conn
+
+        monkeypatch.setattr(http.client, "HTTPSConnection", fake_conn)
+        archive = ArchiveSource()
+        first = archive.search(genre="horror")
+        archive.search(keyword="night")
+        assert created == ["archive.org"]
+        assert conn.request.call_count == 2
+        assert first[0].url == "https://archive.org/details/night_of_x"
+        assert first[0].title == "Night (1985)"
+
+    def test_search_reconnects_after_dropped_connection(self, monkeypatch):
+        import http.client
+
+        stale = self._conn([])
+        stale.request.side_effect = http.client.RemoteDisconnected("closed")
+        fresh = self._conn([{"identifier": "a", "title": "A"}])
+        conns = [stale, fresh]
+        monkeypatch.setattr(http.client, "HTTPSConnection", lambda host, timeout=None: conns.pop(0))
+        results = ArchiveSource().search()
+        assert stale.close.called
+        assert [r.title for r in results] == ["A"]
+
+    def test_search_http_error_returns_empty(self, monkeypatch):
+        import http.client
+
+        conn = self._conn([], status=503)
+        monkeypatch.setattr(http.client, "HTTPSConnection", lambda host, timeout=None: conn)
+        assert ArchiveSource().search() == []
+
+    def test_search_encodes_keyword(self, monkeypatch):
+        import http.client
+        from urllib.parse import parse_qs, urlsplit
+
+        conn = self._conn([])
+        monkeypatch.setattr(http.client, "HTTPSConnection", lambda host, timeout=None: conn)
+        ArchiveSource().search(keyword="Tom & Jerry+", sort="title", rows=10)
+        path = conn.request.call_args[0][1]
+        params = parse_qs(urlsplit(path).query)
+        assert "title:(Tom & Jerry+)" in params["q"][0]
+        assert params["fl[]"] == ["identifier", "title", "year", "downloads"]
+        assert params["sort[]"] == ["titleSorter asc"]
+        assert params["rows"] == ["10"]
+
+    def test_search_without_ijson(self, monkeypatch):
+        import http.client
+
+        from picast.server.sources import archive
+
+        monkeypatch.setattr(archive, "_ijson", False)
+        conn = self._conn([{"identifier": "a", "title": "A"}, {"title": "no id"}])
+        monkeypatch.setattr(http.client, "HTTPSConnection", lambda host, timeout=None: conn)
+        results = ArchiveSource().search()
+        assert [r.url for r in results] == ["https://archive.org/details/a"]
+
+    def test_search_bad_json_drops_connection(self, monkeypatch):
+        import http.client
+
+        conn = self._conn([], body=b"not json")
+        monkeypatch.setattr(http.client, "HTTPSConnection", lambda host, timeout=None: conn)
+        archive = ArchiveSource()
+        assert archive.search() == []
+        assert conn.close.called
+        assert archive._conn is None
+
 
 class TestYouTubeValidation:
     def test_valid_watch_url(self):
@@ -447,3 +884,7 @@ class TestSourceItem:
         assert d["title"] == "A"
         assert d["source_type"] == "youtube"
         assert "duration" in d
+
+    def test_slotted(self):
+        item = SourceItem(url="http://a")
+        assert not hasattr(item, "__dict__")
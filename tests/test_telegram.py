@@ -4,7 +4,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from picast.server.telegram_bot import PiCastBot, _format_time, _progress_bar
+from picast.server.telegram_bot import (
+    PiCastBot,
+    _format_time,
+    _pending_lines,
+    _progress_bar,
+    _split_queue,
+    _trunc,
+)
 
 # --- Helper formatting tests ---
 
@@ -22,6 +29,10 @@ class TestFormatTime:
     def test_hours(self):
         assert _format_time(3661) == "1:01:01"
 
+    def test_hour_boundary(self):
+        assert _format_time(3599.9) == "59:59"
+        assert _format_time(3600) == "1:00:00"
+
     def test_negative(self):
         assert _format_time(-5) == "0:00"
 
@@ -40,12 +51,52 @@ class TestProgressBar:
     def test_full(self):
         bar = _progress_bar(100, 100)
         assert bar.count("=") == 15
+        assert "-" not in bar
+
+    def test_exact_output(self):
+        assert _progress_bar(25, 100, width=8) == "==>-----"
 
     def test_zero_duration(self):
         bar = _progress_bar(0, 0)
         assert bar == "-" * 15
 
 
+class TestTrunc:
+    def test_short_unchanged(self):
+        assert _trunc("x" * 50) == "x" * 50
+
+    def test_long_cut(self):
+        assert _trunc("x" * 51) == "x" * 47 + "..."
+
+    def test_custom_limit(self):
+        assert _trunc("abcdefghij", 8) == "abcde..."
+
+
+class TestSplitQueue:
+    def test_split(self):
+        items = [
+            {"id": 1, "status": "played"},
+            {"id": 2, "status": "playing"},
+            {"id": 3, "status": "pending"},
+            {"id": 4, "status": "pending"},
+        ]
+        playing, pending = _split_queue(items)
+        assert [i["id"] for i in playing] == [2]
+        assert [i["id"] for i in pending] == [3, 4]
+
+
+class TestPendingLines:
+    def test_numbered_with_url_fallback(self):
+        lines = _pending_lines([{"title": "A", "url": "u1"}, {"title": "", "url": "u2"}])
+        assert lines == ["  1. A", "  2. u2"]
+
+    def test_overflow_summary(self):
+        pending = [{"title": f"T{i}", "url": "u"} for i in range(12)]
+        lines = _pending_lines(pending)
+        assert len(lines) == 11
+        assert lines[-1] == "  ... +2 more"
+
+
 # --- Bot initialization tests ---
 
 
@@ -74,6 +125,114 @@ class TestBotInit:
         assert bot._is_authorized(999) is False
 
 
+# --- API client tests ---
+
+
+class TestApiClient:
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self):
+        import httpx
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        bot = PiCastBot("tok", api_url="http://pi:5050")
+        bot._http = httpx.AsyncClient(
+            base_url=bot.api_url, transport=httpx.MockTransport(handler)
+        )
+        client = bot._client()
+        assert await bot._api_get("/api/status") == {"ok": True}
+        await bot._api_post("/api/pause")
+        assert bot._client() is client
+        assert [str(r.url) for r in requests] == [
+            "http://pi:5050/api/status",
+            "http://pi:5050/api/pause",
+        ]
+        await bot._close_client()
+        assert bot._http is None
+
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises_with_server_message(self):
+        import httpx
+
+        bot = PiCastBot("tok")
+        bot._http = httpx.AsyncClient(
+            base_url=bot.api_url,
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(400, json={"error": "url required"})
+            ),
+        )
+        with pytest.raises(httpx.HTTPStatusError, match="url required"):
+            await bot._api_post("/api/play")
+
+    @pytest.mark.asyncio
+    async def test_error_status_without_json_body(self):
+        import httpx
+
+        bot = PiCastBot("tok")
+        bot._http = httpx.AsyncClient(
+            base_url=bot.api_url,
+            transport=httpx.MockTransport(lambda request: httpx.Response(502, text="bad")),
+        )
+        with pytest.raises(httpx.HTTPStatusError, match="HTTP 502"):
+            await bot._api_get("/api/status")
+
+
+class TestStatusCache:
+    @pytest.mark.asyncio
+    async def test_repeat_reads_share_one_request(self):
+        bot = PiCastBot("tok")
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = {"volume": 50}
+            await bot._get_status()
+            await bot._get_status()
+        mock_get.assert_awaited_once_with("/api/status")
+
+    @pytest.mark.asyncio
+    async def test_post_invalidates(self):
+        import httpx
+
+        bot = PiCastBot("tok")
+        bot._http = httpx.AsyncClient(
+            base_url=bot.api_url,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})),
+        )
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = {"volume": 50}
+            await bot._get_status()
+            await bot._api_post("/api/volume", {"level": 60})
+            await bot._get_status()
+        assert mock_get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_refetched(self):
+        bot = PiCastBot("tok")
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = {}
+            await bot._get_status()
+            fetched_at, status = bot._status_cache
+            bot._status_cache = (fetched_at - 1, status)
+            await bot._get_status()
+        assert mock_get.await_count == 2
+
+
+    @pytest.mark.asyncio
+    async def test_listing_reused_until_mutation(self):
+        bot = PiCastBot("tok")
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = [{"id": 1, "name": "Mix"}]
+            await bot._cached_get("/api/playlists")
+            await bot._cached_get("/api/playlists")
+            assert mock_get.await_count == 1
+            bot._invalidate_status()
+            await bot._cached_get("/api/playlists")
+        assert mock_get.await_count == 2
+
+
 # --- Controls keyboard tests ---
 
 
@@ -97,6 +256,11 @@ class TestControlsKeyboard:
         buttons = [btn.text for row in kb.inline_keyboard for btn in row]
         assert "Skip" in buttons
 
+    def test_keyboards_are_shared(self):
+        bot = PiCastBot("tok")
+        assert bot._controls_keyboard(paused=True) is bot._controls_keyboard(paused=True)
+        assert bot._controls_keyboard() is not bot._controls_keyboard(paused=True)
+
     def test_keyboard_has_volume(self):
         bot = PiCastBot("tok")
         kb = bot._controls_keyboard()
@@ -173,6 +337,11 @@ class TestCommandHandlers:
             text = update.message.reply_text.call_args[0][0]
             assert "PLAYING" in text
             assert "Test Video" in text
+            assert text.splitlines()[2:] == [
+                "0:30 / 2:00",
+                "Vol: 80%  Speed: 1.0x",
+                "Source: youtube",
+            ]
 
     @pytest.mark.asyncio
     async def test_play_no_url(self, bot):
@@ -215,6 +384,25 @@ class TestCommandHandlers:
             await bot.cmd_skip(update, _make_context())
             mock_post.assert_called_once_with("/api/skip")
 
+    @pytest.mark.asyncio
+    async def test_pause_api_error_replies(self, bot):
+        import httpx
+
+        update = _make_update(user_id=123)
+        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            mock_post.side_effect = httpx.ConnectError("refused")
+            await bot.cmd_pause(update, _make_context())
+        text = update.message.reply_text.call_args[0][0]
+        assert text == "Error: refused"
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_propagates(self, bot):
+        update = _make_update(user_id=123)
+        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            mock_post.side_effect = KeyError("bug")
+            with pytest.raises(KeyError):
+                await bot.cmd_pause(update, _make_context())
+
     @pytest.mark.asyncio
     async def test_queue_show_empty(self, bot):
         update = _make_update(user_id=123)
@@ -340,6 +528,27 @@ class TestURLHandler:
         await bot.handle_url(update, _make_context())
         update.message.reply_text.assert_not_called()
 
+    @pytest.mark.parametrize("text", [
+        "https://",
+        "https://youtube.com/watch?v=a and more",
+        "check https://youtube.com",
+        "ftp://example.com/file.mp4",
+    ])
+    @pytest.mark.asyncio
+    async def test_rejects_malformed_without_api_call(self, bot, text):
+        update = _make_update(user_id=123, text=text)
+        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            await bot.handle_url(update, _make_context())
+        mock_post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_queues_local_path(self, bot):
+        update = _make_update(user_id=123, text="/media/pi/USB/movie.mkv")
+        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            mock_post.return_value = {"id": 1, "title": "movie"}
+            await bot.handle_url(update, _make_context())
+        mock_post.assert_called_once_with("/api/queue/add", {"url": "/media/pi/USB/movie.mkv"})
+
 
 # --- Callback handler tests ---
 
@@ -362,13 +571,149 @@ class TestCallbackHandler:
     @pytest.mark.asyncio
     async def test_pause_callback(self, bot):
         update = self._make_callback_update("pause")
-        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post, \
+        with patch.object(bot, "_api_get", new_callable=AsyncMock, return_value={}), \
+             patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post, \
              patch.object(bot, "_format_status", new_callable=AsyncMock) as mock_status:
             mock_post.return_value = {"ok": True}
             mock_status.return_value = ("Paused status", MagicMock())
             await bot.handle_callback(update, _make_context())
             mock_post.assert_called_once_with("/api/pause")
 
+    @pytest.mark.asyncio
+    async def test_pause_patches_status_locally(self, bot):
+        update = self._make_callback_update("pause")
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get, \
+             patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            mock_get.return_value = {"idle": False, "title": "Song", "paused": False}
+            mock_post.return_value = {"ok": True}
+            await bot.handle_callback(update, _make_context())
+        mock_get.assert_awaited_once_with("/api/status")
+        text = update.callback_query.edit_message_text.call_args[0][0]
+        assert text.startswith("PAUSED: Song")
+        assert bot._status_cache[1]["paused"] is True
+
+    @pytest.mark.asyncio
+    async def test_volume_renders_without_refetch(self, bot):
+        update = self._make_callback_update("vol_up")
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get, \
+             patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            mock_get.return_value = {"idle": False, "title": "Song", "volume": 50}
+            mock_post.return_value = {"ok": True}
+            await bot.handle_callback(update, _make_context())
+        mock_get.assert_awaited_once()
+        assert "Vol: 60%" in update.callback_query.edit_message_text.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_rejected_change_refetches_status(self, bot):
+        update = self._make_callback_update("vol_up")
+
+        def rejected_post(path, data=None):
+            bot._invalidate_status()
+            return {"ok": False}
+
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get, \
+             patch.object(bot, "_api_post", side_effect=rejected_post):
+            mock_get.return_value = {"idle": False, "title": "Song", "volume": 50}
+            await bot.handle_callback(update, _make_context())
+        assert mock_get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_text_edits_keyboard_only(self, bot):
+        from picast.server.telegram_bot import _KB_PAUSED, _KB_PLAYING
+
+        update = self._make_callback_update("refresh_status")
+        query = update.callback_query
+        query.message = MagicMock(text="same", reply_markup=_KB_PLAYING)
+        with patch.object(bot, "_format_status", new_callable=AsyncMock) as mock_status:
+            mock_status.return_value = ("same", _KB_PAUSED)
+            await bot.handle_callback(update, _make_context())
+        query.edit_message_text.assert_not_called()
+        query.edit_message_reply_markup.assert_awaited_once_with(reply_markup=_KB_PAUSED)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_message_not_edited(self, bot):
+        from picast.server.telegram_bot import _KB_PLAYING
+
+        update = self._make_callback_update("refresh_status")
+        query = update.callback_query
+        query.message = MagicMock(text="same", reply_markup=_KB_PLAYING)
+        with patch.object(bot, "_format_status", new_callable=AsyncMock) as mock_status:
+            mock_status.return_value = ("same", _KB_PLAYING)
+            await bot.handle_callback(update, _make_context())
+        query.edit_message_text.assert_not_called()
+        query.edit_message_reply_markup.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_not_modified_error_ignored(self, bot):
+        from telegram.error import BadRequest
+
+        update = self._make_callback_update("refresh_status")
+        query = update.callback_query
+        query.edit_message_text.side_effect = BadRequest("Message is not modified")
+        with patch.object(bot, "_format_status", new_callable=AsyncMock) as mock_status:
+            mock_status.return_value = ("status", MagicMock())
+            await bot.handle_callback(update, _make_context())
+        query.edit_message_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_skip_callback_overlaps_wait_with_post(self, bot):
+        import asyncio
+
+        update = self._make_callback_update("skip")
+        events = []
+        real_sleep = asyncio.sleep
+
+        async def slow_post(path, data=None):
+            events.append("post-start")
+            await real_sleep(0.01)
+            events.append("post-end")
+            return {"ok": True}
+
+        async def fake_sleep(delay):
+            events.append(f"sleep-{delay}")
+
+        with patch.object(bot, "_api_post", side_effect=slow_post), \
+             patch.object(bot, "_format_status", new_callable=AsyncMock) as mock_status, \
+             patch("picast.server.telegram_bot.asyncio.sleep", side_effect=fake_sleep):
+            mock_status.return_value = ("Next video", MagicMock())
+            await bot.handle_callback(update, _make_context())
+        assert events.index("sleep-0.5") < events.index("post-end")
+        mock_status.assert_awaited_once()
+
+    @pytest.mark.parametrize("current, expected", [
+        (1.0, 1.25), (1.5, 1.75), (2.0, 1.0), (1.2499, 1.5), (0.5, 1.0),
+    ])
+    @pytest.mark.asyncio
+    async def test_speed_cycle_callback(self, bot, current, expected):
+        update = self._make_callback_update("speed_cycle")
+        with patch.object(bot, "_api_get", new_callable=AsyncMock) as mock_get, \
+             patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post, \
+             patch.object(bot, "_format_status", new_callable=AsyncMock) as mock_status:
+            mock_get.return_value = {"speed": current}
+            mock_post.return_value = {"ok": True}
+            mock_status.return_value = ("status", MagicMock())
+            await bot.handle_callback(update, _make_context())
+        mock_post.assert_called_once_with("/api/speed", {"speed": expected})
+
+    @pytest.mark.asyncio
+    async def test_playlist_prefix_callback(self, bot):
+        update = self._make_callback_update("pl_queue_7")
+        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            mock_post.return_value = {"queued": 3}
+            await bot.handle_callback(update, _make_context())
+        mock_post.assert_called_once_with("/api/playlists/7/queue")
+        update.callback_query.edit_message_text.assert_called_once_with(
+            "Queued 3 items from playlist."
+        )
+
+    @pytest.mark.asyncio
+    async def test_unknown_callback_ignored(self, bot):
+        update = self._make_callback_update("nope")
+        with patch.object(bot, "_api_post", new_callable=AsyncMock) as mock_post:
+            await bot.handle_callback(update, _make_context())
+        mock_post.assert_not_called()
+        update.callback_query.edit_message_text.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_unauthorized_callback(self, bot):
         update = self._make_callback_update("pause", user_id=999)
@@ -393,3 +738,70 @@ class TestBuildApplication:
         app = bot.build_application()
         # Should have registered handlers
         assert len(app.handlers[0]) > 0  # Group 0 handlers
+        assert app.error_handlers
+
+    def test_unauthorized_users_filtered_at_dispatch(self):
+        from datetime import datetime
+
+        from telegram import Chat, Message, MessageEntity, User
+        from telegram import Update as TgUpdate
+
+        bot = PiCastBot("fake-token:for-testing", allowed_users=[123])
+        app = bot.build_application()
+        status_handler = next(
+            h for h in app.handlers[0] if "status" in getattr(h, "commands", ())
+        )
+
+        def command_update(user_id):
+            message = Message(
+                message_id=1, date=datetime.now(), chat=Chat(1, "private"),
+                from_user=User(user_id, "u", False), text="/status",
+                entities=[MessageEntity(MessageEntity.BOT_COMMAND, 0, 7)],
+            )
+            return TgUpdate(1, message=message)
+
+        assert status_handler.filters.check_update(command_update(123))
+        assert not status_handler.filters.check_update(command_update(999))
+
+    def test_command_aliases_share_handlers(self):
+        bot = PiCastBot("fake-token:for-testing")
+        app = bot.build_application()
+        commands = {}
+        for handler in app.handlers[0]:
+            for name in getattr(handler, "commands", ()):
+                commands[name] = handler
+        assert commands["q"] is commands["queue"]
+        assert commands["vol"] is commands["volume"]
+        assert commands["help"] is commands["start"]
+
+    def test_processes_updates_concurrently(self):
+        from picast.server.telegram_bot import CONCURRENT_UPDATES
+
+        bot = PiCastBot("fake-token:for-testing")
+        app = bot.build_application()
+        assert app.concurrent_updates == CONCURRENT_UPDATES
+
+
+class TestBackgroundThread:
+    def test_stop_background_shuts_down_app(self):
+        import time
+
+        bot = PiCastBot("fake-token:for-testing")
+        app = MagicMock()
+        app.initialize = AsyncMock()
+        app.start = AsyncMock()
+        app.stop = AsyncMock()
+        app.shutdown = AsyncMock()
+        app.updater.start_polling = AsyncMock()
+        app.updater.stop = AsyncMock()
+        with patch.object(bot, "build_application", return_value=app):
+            bot.start_background()
+            deadline = time.monotonic() + 5
+            while bot._stop_event is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            thread = bot._thread
+            bot.stop_background()
+        assert not thread.is_alive()
+        app.updater.start_polling.assert_awaited_once_with(drop_pending_updates=True)
+        app.updater.stop.assert_awaited_once()
+        app.shutdown.assert_awaited_once()
@@ -4,6 +4,7 @@ Tests import correctness, widget construction, and PiCastClient logic
 with mocked HTTP responses. Does NOT test full Textual app rendering.
 """
 
+import json
 from unittest.mock import MagicMock, patch
 
 import httpx
@@ -28,6 +29,18 @@ class TestTUIImports:
         from picast.tui.app import PiCastApp
         assert PiCastApp is not None
 
+    def test_import_screens(self):
+        from picast.tui.screens import (
+            CreatePlaylistScreen,
+            LibraryScreen,
+            NotesScreen,
+            PlaylistScreen,
+        )
+        assert LibraryScreen is not None
+        assert NotesScreen is not None
+        assert PlaylistScreen is not None
+        assert CreatePlaylistScreen is not None
+
     def test_import_now_playing(self):
         from picast.tui.widgets.now_playing import NowPlaying, _format_time
         assert NowPlaying is not None
@@ -56,6 +69,15 @@ class TestTUIImports:
 
 # --- PiCastClient Unit Tests (mocked HTTP) ---
 
+def _response(payload, status_code=200, headers=None):
+    """Build a mocked httpx response carrying a JSON body."""
+    return MagicMock(
+        status_code=status_code,
+        headers=headers or {},
+        content=json.dumps(payload).encode(),
+    )
+
+
 class TestPiCastClientMocked:
     """Test PiCastClient methods with mocked httpx responses."""
 
@@ -70,56 +92,85 @@ class TestPiCastClientMocked:
         global PiCastClient, PiCastAPIError
         from picast.tui.api_client import PiCastAPIError, PiCastClient
 
+    @pytest.fixture(autouse=True)
+    def _no_backoff(self, monkeypatch):
+        """Record the client's backoff sleeps instead of sleeping.
+
+        time.sleep is process-wide, so other threads keep sleeping for real
+        and stay out of the recorded delays.
+        """
+        import threading
+        import time
+
+        sleeps = []
+        real_sleep = time.sleep
+        test_thread = threading.get_ident()
+
+        def fake_sleep(delay):
+            if threading.get_ident() == test_thread:
+                sleeps.append(delay)
+            else:
+                real_sleep(delay)
+
+        monkeypatch.setattr("picast.tui.api_client.time.sleep", fake_sleep)
+        return sleeps
+
     def test_base_url_construction(self):
         c = PiCastClient("mypi.local", 8080)
         assert c.base_url == "http://mypi.local:8080"
         c.close()
 
+    def test_context_manager_closes_client(self):
+        with PiCastClient("testhost", 5050) as c:
+            assert not c._client.is_closed
+        assert c._client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_client(self):
+        from picast.tui.api_client import AsyncPiCastClient
+
+        async with AsyncPiCastClient("testhost", 5050) as api:
+            assert not api._client.is_closed
+        assert api._client.is_closed
+
+    def test_connection_pool_kept_alive(self, client):
+        pool = client._client._transport._pool
+        assert pool._keepalive_expiry == 75.0
+        assert pool._retries == 1
+
     def test_get_status_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"idle": True, "volume": 100}
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response({"idle": True, "volume": 100})
         with patch.object(client._client, "get", return_value=mock_resp):
             result = client.get_status()
         assert result == {"idle": True, "volume": 100}
 
     def test_get_queue_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = [{"id": 1, "url": "http://yt/a"}]
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response([{"id": 1, "url": "http://yt/a"}])
         with patch.object(client._client, "get", return_value=mock_resp):
             result = client.get_queue()
         assert len(result) == 1
         assert result[0]["id"] == 1
 
     def test_add_to_queue_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"id": 5, "url": "http://yt/b"}
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response({"id": 5, "url": "http://yt/b"})
         with patch.object(client._client, "post", return_value=mock_resp):
             result = client.add_to_queue("http://yt/b")
         assert result["id"] == 5
 
     def test_pause_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"ok": True}
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response({"ok": True})
         with patch.object(client._client, "post", return_value=mock_resp):
             result = client.pause()
         assert result["ok"] is True
 
     def test_set_volume_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"volume": 75}
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response({"volume": 75})
         with patch.object(client._client, "post", return_value=mock_resp):
             result = client.set_volume(75)
         assert result["volume"] == 75
 
     def test_remove_from_queue_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"ok": True}
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response({"ok": True})
         with patch.object(client._client, "delete", return_value=mock_resp):
             result = client.remove_from_queue(3)
         assert result["ok"] is True
@@ -153,19 +204,41 @@ class TestPiCastClientMocked:
             assert exc_info.value.status_code == 500
 
     def test_get_library_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = [
+        mock_resp = _response([
             {"id": 1, "title": "Test", "url": "http://yt/a"},
-        ]
-        mock_resp.raise_for_status = MagicMock()
+        ])
         with patch.object(client._client, "get", return_value=mock_resp):
             result = client.get_library(sort="title", limit=10)
         assert len(result) == 1
 
+    def test_search_library_encodes_query(self, client):
+        with patch.object(client._client, "get", return_value=_response([])) as mock_get:
+            client.search_library("rock & roll #1?")
+        mock_get.assert_called_once_with("/api/library/search?q=rock+%26+roll+%231%3F")
+
+    def test_listing_cached_until_mutation(self, client):
+        list_resp = _response([{"id": 1, "name": "Mix"}])
+        ok_resp = _response({"ok": True})
+        with patch.object(client._client, "get", return_value=list_resp) as mock_get:
+            client.get_playlists()
+            client.get_playlists()
+            assert mock_get.call_count == 1
+            with patch.object(client._client, "post", return_value=ok_resp):
+                client.create_playlist("New")
+            client.get_playlists()
+            assert mock_get.call_count == 2
+
+    def test_conditional_get_reuses_body_on_304(self, client):
+        fresh = _response([{"id": 1}], headers={"ETag": '"v1"'})
+        not_modified = MagicMock(status_code=304, headers={"ETag": '"v1"'})
+        with patch.object(client._client, "get", side_effect=[fresh, not_modified]) as mock_get:
+            assert client.get_queue() == [{"id": 1}]
+            assert client.get_queue() == [{"id": 1}]
+        assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+        not_modified.raise_for_status.assert_not_called()
+
     def test_create_playlist_success(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"id": 1, "name": "My List"}
-        mock_resp.raise_for_status = MagicMock()
+        mock_resp = _response({"id": 1, "name": "My List"})
         with patch.object(client._client, "post", return_value=mock_resp):
             result = client.create_playlist("My List")
         assert result["name"] == "My List"
@@ -178,6 +251,123 @@ class TestPiCastClientMocked:
             with pytest.raises(PiCastAPIError, match="Cannot connect"):
                 client.pause()
 
+    def test_get_retried_after_dropped_read(self, client, _no_backoff):
+        mock_resp = _response({"idle": True})
+        with patch.object(
+            client._client, "get",
+            side_effect=[httpx.ReadError("reset"), mock_resp],
+        ) as mock_get:
+            assert client.get_status() == {"idle": True}
+        assert mock_get.call_count == 2
+        assert len(_no_backoff) == 1
+
+    def test_retries_give_up_after_max_attempts(self, client, _no_backoff):
+        with patch.object(
+            client._client, "get", side_effect=httpx.ConnectError("refused"),
+        ) as mock_get:
+            with pytest.raises(PiCastAPIError, match="Cannot connect"):
+                client.get_status()
+        assert mock_get.call_count == 3
+        assert _no_backoff[0] < _no_backoff[1]
+
+    def test_non_idempotent_post_not_retried_after_read(self, client):
+        with patch.object(
+            client._client, "post", side_effect=httpx.ReadError("reset"),
+        ) as mock_post:
+            with pytest.raises(httpx.ReadError):
+                client.add_to_queue("http://yt/b")
+        assert mock_post.call_count == 1
+
+    def test_post_retried_after_connect_error(self, client):
+        mock_resp = _response({"id": 5})
+        with patch.object(
+            client._client, "post",
+            side_effect=[httpx.ConnectError("refused"), mock_resp],
+        ) as mock_post:
+            assert client.add_to_queue("http://yt/b") == {"id": 5}
+        assert mock_post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_get_retried_after_dropped_read(self, monkeypatch):
+        from picast.tui.api_client import AsyncPiCastClient
+
+        async def no_sleep(delay):
+            pass
+
+        monkeypatch.setattr("picast.tui.api_client.asyncio.sleep", no_sleep)
+        mock_resp = _response([{"id": 1}])
+        api = AsyncPiCastClient("testhost", 5050)
+        with patch.object(
+            api._client, "get",
+            side_effect=[httpx.ReadError("reset"), mock_resp],
+        ) as mock_get:
+            assert await api.get_queue() == [{"id": 1}]
+        assert mock_get.call_count == 2
+        await api.close()
+
+    @pytest.mark.asyncio
+    async def test_async_concurrent_gets_share_one_request(self):
+        import asyncio
+
+        from picast.tui.api_client import AsyncPiCastClient
+
+        async def slow_get(path, **kwargs):
+            await asyncio.sleep(0.01)
+            return _response({"idle": True})
+
+        api = AsyncPiCastClient("testhost", 5050)
+        with patch.object(api._client, "get", side_effect=slow_get) as mock_get:
+            first, second = await asyncio.gather(api.get_status(), api.get_status())
+            assert first == second == {"idle": True}
+            assert mock_get.call_count == 1
+            await api.get_status()
+            assert mock_get.call_count == 2
+        await api.close()
+
+    @pytest.mark.asyncio
+    async def test_fetch_dashboard_keeps_failed_sections(self):
+        from picast.tui.api_client import AsyncPiCastClient
+
+        bundle = _response({"status": {"idle": True}, "queue": [], "health": {"ok": True}})
+        not_found = MagicMock(status_code=404)
+        error = httpx.HTTPStatusError("Not Found", request=MagicMock(), response=not_found)
+
+        async def fake_get(path, **kwargs):
+            if path.startswith("/api/poll"):
+                return bundle
+            raise error
+
+        api = AsyncPiCastClient("testhost", 5050)
+        with patch.object(api._client, "get", side_effect=fake_get):
+            result = await api.fetch_dashboard()
+        assert result["status"] == {"idle": True}
+        assert result["health"] == {"ok": True}
+        assert isinstance(result["playlists"], PiCastAPIError)
+        await api.close()
+
+    def test_poll_bundle_single_request(self, client):
+        mock_resp = _response({"status": {"idle": True}, "queue": []})
+        with patch.object(client._client, "get", return_value=mock_resp) as mock_get:
+            result = client.get_poll_bundle(("status", "queue"))
+        assert result == {"status": {"idle": True}, "queue": []}
+        mock_get.assert_called_once_with("/api/poll?include=status,queue")
+
+    def test_poll_bundle_falls_back_on_older_server(self, client):
+        not_found = MagicMock()
+        not_found.status_code = 404
+        error = httpx.HTTPStatusError("Not Found", request=MagicMock(), response=not_found)
+        status_resp = _response({"idle": True})
+        queue_resp = _response([])
+        with patch.object(
+            client._client, "get", side_effect=[error, status_resp, queue_resp],
+        ):
+            result = client.get_poll_bundle(("status", "queue"))
+        assert result == {"status": {"idle": True}, "queue": []}
+        # Remembered: later polls skip the bundle endpoint
+        with patch.object(client._client, "get", return_value=queue_resp) as mock_get:
+            client.get_poll_bundle(("queue",))
+        mock_get.assert_called_once_with("/api/queue")
+
     def test_delete_connect_error_raises(self, client):
         from picast.tui.api_client import PiCastAPIError
         with patch.object(
@@ -225,3 +415,81 @@ class TestPiCastAPIError:
         err = PiCastAPIError("not found", status_code=404)
         assert err.status_code == 404
         assert "not found" in str(err)
+
+
+# --- Poll Loop Tests ---
+
+class TestPollLoop:
+    """PiCastApp polling against a mocked async client."""
+
+    @pytest.fixture()
+    def api(self, monkeypatch):
+        from unittest.mock import AsyncMock
+
+        api = MagicMock()
+        api.get_poll_bundle = AsyncMock(return_value={"status": {"idle": True}, "queue": []})
+        api.close = AsyncMock()
+        monkeypatch.setattr("picast.tui.app.AsyncPiCastClient", lambda host, port: api)
+        return api
+
+    @pytest.mark.asyncio
+    async def test_kick_polls_immediately(self, api, monkeypatch):
+        from picast.tui.app import PiCastApp
+
+        monkeypatch.setattr("picast.tui.app.POLL_INTERVAL", 60.0)
+        app = PiCastApp("testhost", 5050)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            assert api.get_poll_bundle.await_count == 1
+            await pilot.press("r")
+            await pilot.pause()
+            assert api.get_poll_bundle.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_kick_during_inflight_poll_is_kept(self, api, monkeypatch):
+        import asyncio
+
+        from picast.tui.app import PiCastApp
+
+        monkeypatch.setattr("picast.tui.app.POLL_INTERVAL", 60.0)
+        release = asyncio.Event()
+        bundle = {"status": {"idle": True}, "queue": []}
+
+        async def slow_first_poll(sections):
+            if api.get_poll_bundle.await_count == 1:
+                await release.wait()
+            return bundle
+
+        api.get_poll_bundle.side_effect = slow_first_poll
+        app = PiCastApp("testhost", 5050)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            assert api.get_poll_bundle.await_count == 1
+            # A command finishes while the first poll is still waiting
+            app._kick_poll()
+            release.set()
+            await pilot.pause()
+            assert api.get_poll_bundle.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_backs_off_while_disconnected(self, api, monkeypatch):
+        import asyncio
+
+        from picast.tui.api_client import PiCastAPIError
+        from picast.tui.app import PiCastApp
+
+        timeouts = []
+        real_wait_for = asyncio.wait_for
+
+        async def record_wait_for(aw, timeout):
+            timeouts.append(timeout)
+            return await real_wait_for(aw, timeout=0.001)
+
+        monkeypatch.setattr("picast.tui.app.asyncio.wait_for", record_wait_for)
+        api.get_poll_bundle.side_effect = PiCastAPIError("Cannot connect")
+        app = PiCastApp("testhost", 5050)
+        async with app.run_test() as pilot:
+            while len(timeouts) < 4:
+                await pilot.pause(0.01)
+            app._poll_active = False
+        assert timeouts[:4] == [2.0, 4.0, 5.0, 5.0]
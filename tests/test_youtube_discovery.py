@@ -2,6 +2,7 @@
 
 import json
 import subprocess
+import threading
 import time
 from unittest.mock import MagicMock, patch
 
@@ -32,27 +33,17 @@ def _make_ytdlp_output(*entries):
     """Build mock yt-dlp stdout from (id, title, duration) tuples."""
     lines = []
     for vid_id, title, dur in entries:
-        lines.append(f"{vid_id}\t{title}\t{dur}")
+        lines.append(f"{vid_id}\x1f{title}\x1f{dur}")
     return "\n".join(lines)
 
 
-def _mock_run_ok(stdout="", returncode=0):
-    """Create a mock subprocess.run result."""
-    result = MagicMock()
-    result.stdout = stdout
-    result.stderr = ""
-    result.returncode = returncode
-    return result
-
-
 # --- TestSearchYouTube ---
 
 class TestSearchYouTube:
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_basic_search(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_basic_search(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(
                 ("abc123def45", "Chill Vibes", "3600"),
                 ("xyz789ghi01", "Focus Music", "1800"),
@@ -67,16 +58,16 @@ class TestSearchYouTube:
         assert results[1].video_id == "xyz789ghi01"
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_search_failure(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(returncode=1)
-        mock_run.return_value.stderr = "ERROR: something went wrong"
+    def test_search_failure(self, mock_which, agent, caplog, fake_popen):
+        fake_popen(returncode=1, stderr="ERROR: something went wrong")
         results = agent.search_youtube("bad query")
         assert results == []
+        assert "ERROR: something went wrong" in caplog.text
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run", side_effect=subprocess.TimeoutExpired("yt-dlp", 60))
-    def test_timeout(self, mock_run, mock_which, agent):
+    def test_timeout(self, mock_which, agent, fake_popen):
+        # The watchdog kills yt-dlp; whatever it printed is discarded
+        fake_popen(_make_ytdlp_output(("partial12345", "Partial", "120")), timeout=True)
         results = agent.search_youtube("slow query")
         assert results == []
 
@@ -86,9 +77,8 @@ class TestSearchYouTube:
         assert results == []
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_na_duration(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_na_duration(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("vid123456789", "Live Stream", "NA"))
         )
         results = agent.search_youtube("live")
@@ -96,9 +86,8 @@ class TestSearchYouTube:
         assert results[0].duration == 0  # NA -> 0
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_none_duration(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_none_duration(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("vid123456789", "Unknown", "None"))
         )
         results = agent.search_youtube("test")
@@ -106,43 +95,101 @@ class TestSearchYouTube:
         assert results[0].duration == 0
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_url_construction(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_url_construction(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("dQw4w9WgXcQ", "Never Gonna", "213"))
         )
         results = agent.search_youtube("rickroll")
         assert results[0].url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_search_term_format(self, mock_run, mock_which, agent):
+    def test_search_term_format(self, mock_which, agent, fake_popen):
         """Verify yt-dlp is called with ytsearchN:query format."""
-        mock_run.return_value = _mock_run_ok("")
+        commands = fake_popen()
         agent.search_youtube("focus music", max_results=10)
-        cmd = mock_run.call_args[0][0]
+        cmd = commands[-1]
         assert cmd[1] == "ytsearch10:focus music"
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_auth_args_passed(self, mock_run, mock_which, pool):
+    def test_auth_args_passed(self, mock_which, pool, fake_popen):
         """Auth args from server config are passed to yt-dlp."""
         config = ServerConfig(ytdl_cookies_from_browser="chromium")
         agent = DiscoveryAgent(pool=pool, server_config=config, delay=0)
-        mock_run.return_value = _mock_run_ok("")
+        commands = fake_popen()
         agent.search_youtube("test")
-        cmd = mock_run.call_args[0][0]
+        cmd = commands[-1]
         assert "--cookies-from-browser=chromium" in cmd
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_malformed_lines_skipped(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok("badline\n\nvid123456789\tTitle\t120")
+    def test_title_with_tab(self, mock_which, agent, fake_popen):
+        fake_popen(
+            _make_ytdlp_output(("tabbed123456", "Left\tRight", "95.5"))
+        )
+        results = agent.search_youtube("test")
+        assert results[0].title == "Left\tRight"
+        assert results[0].duration == 95
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    def test_malformed_lines_skipped(self, mock_which, agent, fake_popen):
+        fake_popen("badline\n\nvid123456789\x1fTitle\x1f120")
         results = agent.search_youtube("test")
         assert len(results) == 1
         assert results[0].video_id == "vid123456789"
 
 
+class TestSearchInProcess:
+
+    def _install(self, monkeypatch, info):
+        import types
+
+        from picast.server.sources import ytdl
+
+        calls = []
+
+        class FakeYoutubeDL:
+            def __init__(self, opts):
+                self.opts = opts
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def extract_info(self, url, download=True):
+                calls.append((url, self.opts))
+                return info
+
+        monkeypatch.setattr(ytdl, "_yt_dlp", types.SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+        monkeypatch.setattr(
+            subprocess, "Popen",
+            MagicMock(side_effect=AssertionError("subprocess should not be used")),
+        )
+        return calls
+
+    def test_search_uses_python_api(self, monkeypatch, pool):
+        calls = self._install(monkeypatch, {"entries": [
+            {"id": "inproc_vid1", "title": "In Process", "duration": 245.0},
+            {"id": "inproc_vid2", "title": "Live", "duration": None},
+            None,
+        ]})
+        config = ServerConfig(ytdl_cookies_from_browser="chromium")
+        agent = DiscoveryAgent(pool=pool, server_config=config, delay=0)
+        results = agent.search_youtube("focus music", max_results=3)
+        assert [(r.video_id, r.duration) for r in results] == [
+            ("inproc_vid1", 245), ("inproc_vid2", 0),
+        ]
+        assert results[0].url == "https://www.youtube.com/watch?v=inproc_vid1"
+        url, opts = calls[0]
+        assert url == "ytsearch3:focus music"
+        assert opts["extract_flat"] is True
+        assert opts["cookiesfrombrowser"] == ("chromium",)
+
+    def test_extraction_failure_returns_empty(self, monkeypatch, agent):
+        self._install(monkeypatch, None)
+        assert agent.search_youtube("anything") == []
+
+
 # --- TestFilterByDuration ---
 
 class TestFilterByDuration:
@@ -152,7 +199,7 @@ class TestFilterByDuration:
             DiscoveryResult("a", "A", 100, "url_a"),
             DiscoveryResult("b", "B", 200, "url_b"),
         ]
-        filtered = agent.filter_by_duration(results)
+        filtered = list(agent.filter_by_duration(results))
         assert len(filtered) == 2
 
     def test_min_duration(self, agent):
@@ -160,7 +207,7 @@ class TestFilterByDuration:
             DiscoveryResult("a", "A", 100, "url_a"),
             DiscoveryResult("b", "B", 200, "url_b"),
         ]
-        filtered = agent.filter_by_duration(results, min_duration=150)
+        filtered = list(agent.filter_by_duration(results, min_duration=150))
         assert len(filtered) == 1
         assert filtered[0].video_id == "b"
 
@@ -169,7 +216,7 @@ class TestFilterByDuration:
             DiscoveryResult("a", "A", 100, "url_a"),
             DiscoveryResult("b", "B", 200, "url_b"),
         ]
-        filtered = agent.filter_by_duration(results, max_duration=150)
+        filtered = list(agent.filter_by_duration(results, max_duration=150))
         assert len(filtered) == 1
         assert filtered[0].video_id == "a"
 
@@ -179,18 +226,18 @@ class TestFilterByDuration:
             DiscoveryResult("b", "B", 150, "url_b"),
             DiscoveryResult("c", "C", 300, "url_c"),
         ]
-        filtered = agent.filter_by_duration(results, min_duration=100, max_duration=200)
+        filtered = list(agent.filter_by_duration(results, min_duration=100, max_duration=200))
         assert len(filtered) == 1
         assert filtered[0].video_id == "b"
 
     def test_unknown_duration_kept_no_max(self, agent):
         results = [DiscoveryResult("a", "A", 0, "url_a")]
-        filtered = agent.filter_by_duration(results, min_duration=100)
+        filtered = list(agent.filter_by_duration(results, min_duration=100))
         assert len(filtered) == 1
 
     def test_unknown_duration_skipped_with_max(self, agent):
         results = [DiscoveryResult("a", "A", 0, "url_a")]
-        filtered = agent.filter_by_duration(results, max_duration=300)
+        filtered = list(agent.filter_by_duration(results, max_duration=300))
         assert len(filtered) == 0
 
 
@@ -199,9 +246,8 @@ class TestFilterByDuration:
 class TestDiscoverForBlock:
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_adds_videos(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_adds_videos(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("vid_a1234567", "Video A", "120"))
         )
         theme = ThemeConfig(queries=["test query"], max_results=5)
@@ -211,11 +257,10 @@ class TestDiscoverForBlock:
         assert stats["queries_run"] == 1
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_skips_duplicates(self, mock_run, mock_which, agent, pool):
+    def test_skips_duplicates(self, mock_which, agent, pool, fake_popen):
         # Pre-add the video
         pool.add_video("focus", "https://www.youtube.com/watch?v=vid_a1234567", "Video A")
-        mock_run.return_value = _mock_run_ok(
+        fake_popen(
             _make_ytdlp_output(("vid_a1234567", "Video A", "120"))
         )
         theme = ThemeConfig(queries=["test"], max_results=5)
@@ -224,9 +269,8 @@ class TestDiscoverForBlock:
         assert stats["skipped"] == 1
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_filters_duration(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_filters_duration(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(
                 ("short1234567", "Short", "30"),
                 ("long12345678", "Long Enough", "300"),
@@ -244,21 +288,40 @@ class TestDiscoverForBlock:
         assert stats["found"] == 0
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_multiple_queries(self, mock_run, mock_which, agent):
-        mock_run.side_effect = [
-            _mock_run_ok(_make_ytdlp_output(("vid_q1_12345", "Q1 Result", "120"))),
-            _mock_run_ok(_make_ytdlp_output(("vid_q2_12345", "Q2 Result", "180"))),
-        ]
+    def test_multiple_queries(self, mock_which, agent, fake_popen):
+        # One yt-dlp process; each line is prefixed with its search's query
+        commands = fake_popen(
+            "query one\x1fvid_q1_12345\x1fQ1 Result\x1f120\n"
+            "query two\x1fvid_q2_12345\x1fQ2 Result\x1f180\n"
+            "query two\x1fvid_q2_67890\x1fQ2 Other\x1f240"
+        )
         theme = ThemeConfig(queries=["query one", "query two"], max_results=5)
         stats = agent.discover_for_block("focus", theme)
+        assert len(commands) == 1
+        cmd = commands[-1]
+        assert cmd[1:3] == ["ytsearch5:query one", "ytsearch5:query two"]
         assert stats["queries_run"] == 2
-        assert stats["added"] == 2
+        assert stats["found"] == 3
+        assert stats["added"] == 3
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_source_is_discovery(self, mock_run, mock_which, agent, pool):
-        mock_run.return_value = _mock_run_ok(
+    def test_failed_query_keeps_batch_results(self, mock_which, agent, caplog, fake_popen):
+        # yt-dlp exits non-zero when any one search fails
+        fake_popen(
+            "query one\x1fvid_q1_12345\x1fQ1 Result\x1f120\n"
+            "query three\x1fvid_q3_12345\x1fQ3 Result\x1f180",
+            returncode=1,
+            stderr="ERROR: [youtube:search] query two: HTTP Error 500",
+        )
+        results = agent.search_youtube_batch(["query one", "query two", "query three"])
+        assert [r.video_id for r in results["query one"]] == ["vid_q1_12345"]
+        assert results["query two"] == []
+        assert [r.video_id for r in results["query three"]] == ["vid_q3_12345"]
+        assert "HTTP Error 500" in caplog.text
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    def test_source_is_discovery(self, mock_which, agent, pool, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("vidsrc12345", "Src Test", "120"))
         )
         theme = ThemeConfig(queries=["test"], max_results=5)
@@ -273,9 +336,8 @@ class TestDiscoverForBlock:
 class TestDiscoverAll:
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_all_blocks_processed(self, mock_run, mock_which, agent):
-        mock_run.return_value = _mock_run_ok(
+    def test_all_blocks_processed(self, mock_which, agent, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("vid_all12345", "All Block", "120"))
         )
         themes = {
@@ -287,19 +349,175 @@ class TestDiscoverAll:
         assert all_stats[0]["block"] == "focus"
         assert all_stats[1]["block"] == "clean"
 
+    def test_blocks_searched_concurrently(self, agent, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 4)
+        # Both searches must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_search(query, max_results):
+            barrier.wait()
+            return [DiscoveryResult(f"id_{query}", query, 120, f"https://youtu.be/id_{query}")]
+
+        themes = {
+            "focus": ThemeConfig(queries=["focus"], max_results=2),
+            "clean": ThemeConfig(queries=["clean"], max_results=2),
+        }
+        with patch.object(agent, "_run_search", side_effect=fake_search):
+            all_stats = agent.discover_all(themes)
+        assert [s["block"] for s in all_stats] == ["focus", "clean"]
+        assert [s["added"] for s in all_stats] == [1, 1]
+
+    def test_sequential_when_parallelism_disabled(self, pool):
+        agent = DiscoveryAgent(pool=pool, delay=0, max_parallel_blocks=1)
+        threads = set()
+
+        def fake_search(query, max_results):
+            threads.add(threading.get_ident())
+            return []
+
+        themes = {
+            "focus": ThemeConfig(queries=["focus"]),
+            "clean": ThemeConfig(queries=["clean"]),
+        }
+        with patch.object(agent, "_run_search", side_effect=fake_search):
+            agent.discover_all(themes)
+        assert threads == {threading.get_ident()}
+
+    def test_shared_query_searched_once(self, agent):
+        calls = []
+
+        def fake_search(query, max_results):
+            calls.append(query)
+            return [
+                DiscoveryResult("short_vid_01", "Short", 120, "https://youtu.be/short_vid_01"),
+                DiscoveryResult("long_vid_001", "Long", 4000, "https://youtu.be/long_vid_001"),
+            ]
+
+        themes = {
+            "focus": ThemeConfig(queries=["lofi focus"], max_results=2),
+            "study": ThemeConfig(queries=["lofi focus"], max_results=2, max_duration=600),
+        }
+        with patch.object(agent, "_run_search", side_effect=fake_search):
+            all_stats = agent.discover_all(themes)
+        assert calls == ["lofi focus"]
+        # Each block still applies its own duration bounds
+        assert [s["added"] for s in all_stats] == [2, 1]
+        assert [s["queries_run"] for s in all_stats] == [1, 1]
+
+    def test_workers_capped_at_cpu_count(self, agent, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 1)
+        threads = set()
+
+        def fake_search(query, max_results):
+            threads.add(threading.get_ident())
+            return []
+
+        themes = {
+            "focus": ThemeConfig(queries=["focus"]),
+            "clean": ThemeConfig(queries=["clean"]),
+        }
+        with patch.object(agent, "_run_search", side_effect=fake_search):
+            agent.discover_all(themes)
+        assert threads == {threading.get_ident()}
+
+
+# --- TestSearchCache ---
+
+class TestSearchCache:
+
+    @pytest.fixture
+    def cached_agent(self, pool, tmp_path):
+        return DiscoveryAgent(pool=pool, delay=0, cache_path=str(tmp_path / "search.db"))
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    def test_repeat_search_served_from_cache(self, mock_which, cached_agent, fake_popen):
+        commands = fake_popen(
+            _make_ytdlp_output(("cache_vid_01", "Cached", "120"))
+        )
+        first = cached_agent.search_youtube("lofi", max_results=3)
+        second = cached_agent.search_youtube("lofi", max_results=3)
+        assert len(commands) == 1
+        assert second == first
+        cached_agent.search_youtube("lofi", max_results=5)
+        assert len(commands) == 2  # max_results is part of the key
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    def test_cache_persists_across_agents(self, mock_which, pool, tmp_path, fake_popen):
+        commands = fake_popen(
+            _make_ytdlp_output(("persist_vid1", "Persisted", "300"))
+        )
+        path = str(tmp_path / "search.db")
+        DiscoveryAgent(pool=pool, cache_path=path).search_youtube("ambient")
+        results = DiscoveryAgent(pool=pool, cache_path=path).search_youtube("ambient")
+        assert len(commands) == 1
+        assert results[0].video_id == "persist_vid1"
+        assert results[0].duration == 300
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    def test_failures_not_cached(self, mock_which, cached_agent, fake_popen):
+        commands = fake_popen(side_effect=[
+            {"returncode": 1},
+            {"stdout": _make_ytdlp_output(("flaky_vid_01", "Flaky", "120"))},
+        ])
+        assert cached_agent.search_youtube("flaky") == []
+        results = cached_agent.search_youtube("flaky")
+        assert [r.video_id for r in results] == ["flaky_vid_01"]
+        assert cached_agent.search_youtube("flaky") == results
+        assert len(commands) == 2
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    def test_expired_entry_refetched(self, mock_which, pool, tmp_path, fake_popen):
+        agent = DiscoveryAgent(pool=pool, cache_path=str(tmp_path / "s.db"), cache_ttl=60)
+        commands = fake_popen(
+            _make_ytdlp_output(("expire_vid01", "Old", "120"))
+        )
+        agent.search_youtube("news")
+        with patch("time.time", return_value=time.time() + 61):
+            agent.search_youtube("news")
+        assert len(commands) == 2
+
+    @patch("shutil.which", return_value="/usr/bin/yt-dlp")
+    @patch("time.sleep")
+    def test_cached_queries_skip_delay(self, mock_sleep, mock_which, pool, tmp_path, fake_popen):
+        agent = DiscoveryAgent(pool=pool, delay=5.0, cache_path=str(tmp_path / "s.db"))
+        commands = fake_popen(
+            _make_ytdlp_output(("delay_vid_01", "Video", "120"))
+        )
+        agent.search_youtube("q1")
+        agent.search_youtube("q2")
+        theme = ThemeConfig(queries=["q1", "q2", "q3"], max_results=5)
+        agent.discover_for_block("test", theme)
+        # q1/q2 cached; q3 is the first network search, so no pause needed
+        mock_sleep.assert_not_called()
+        assert len(commands) == 3
+
 
 # --- TestRateLimiting ---
 
 class TestRateLimiting:
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
     @patch("time.sleep")
-    def test_delay_between_queries(self, mock_sleep, mock_run, mock_which, pool):
+    def test_batch_paced_by_ytdlp(self, mock_sleep, mock_which, pool, fake_popen):
         agent = DiscoveryAgent(pool=pool, delay=0.1)
-        mock_run.return_value = _mock_run_ok("")
+        commands = fake_popen()
         theme = ThemeConfig(queries=["q1", "q2", "q3"], max_results=2)
         agent.discover_for_block("test", theme)
+        # The batched process sleeps between its own requests
+        cmd = commands[-1]
+        assert cmd[cmd.index("--sleep-requests") + 1] == "0.1"
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    def test_delay_between_inprocess_queries(self, mock_sleep, pool, monkeypatch):
+        from picast.server.sources import ytdl
+
+        monkeypatch.setattr(ytdl, "available", lambda: True)
+        agent = DiscoveryAgent(pool=pool, delay=0.1)
+        theme = ThemeConfig(queries=["q1", "q2", "q3"], max_results=2)
+        with patch.object(agent, "_run_search", return_value=[]) as mock_search:
+            agent.discover_for_block("test", theme)
+        assert mock_search.call_count == 3
         # Sleep called between queries (not before the first)
         assert mock_sleep.call_count == 2
         mock_sleep.assert_any_call(0.1)
@@ -338,9 +556,8 @@ class TestDiscoverEndpoints:
         return themed_app.test_client()
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_discover_single_block(self, mock_run, mock_which, themed_client):
-        mock_run.return_value = _mock_run_ok(
+    def test_discover_single_block(self, mock_which, themed_client, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("ep_vid123456", "Endpoint Test", "120"))
         )
         resp = themed_client.post("/api/autoplay/discover/focus")
@@ -350,9 +567,8 @@ class TestDiscoverEndpoints:
         assert data["added"] >= 0
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_discover_all_blocks(self, mock_run, mock_which, themed_client):
-        mock_run.return_value = _mock_run_ok(
+    def test_discover_all_blocks(self, mock_which, themed_client, fake_popen):
+        fake_popen(
             _make_ytdlp_output(("ep_all123456", "All Blocks", "120"))
         )
         resp = themed_client.post("/api/autoplay/discover")
@@ -367,9 +583,8 @@ class TestDiscoverEndpoints:
         assert resp.status_code == 404
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_discover_with_overrides(self, mock_run, mock_which, themed_client):
-        mock_run.return_value = _mock_run_ok(
+    def test_discover_with_overrides(self, mock_which, themed_client, fake_popen):
+        commands = fake_popen(
             _make_ytdlp_output(("ov_vid1234567", "Override", "120"))
         )
         resp = themed_client.post(
@@ -377,7 +592,7 @@ class TestDiscoverEndpoints:
             json={"queries": ["custom query"], "max_results": 2},
         )
         assert resp.status_code == 200
-        cmd = mock_run.call_args[0][0]
+        cmd = commands[-1]
         assert "ytsearch2:custom query" in cmd[1]
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
@@ -440,6 +655,7 @@ class TestThemeConfigParsing:
         assert clean.min_duration == 0  # default
         assert clean.max_results == 5  # default
         assert config.autoplay.discovery_delay == 10.0
+        assert config.autoplay.discovery_cache_hours == 6.0  # default
 
     def test_parse_no_themes(self):
         data = {"autoplay": {"enabled": True}}
@@ -531,25 +747,24 @@ class TestDiscoverFromProfile:
         return DiscoveryAgent(pool=pool, delay=0)
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_basic_profile_discovery(self, mock_run, mock_which, discovery_agent, taste_profile):
-        mock_run.return_value = _mock_run_ok(
-            _make_ytdlp_output(("disc_vid_001", "Ambient Track", "1200"))
+    def test_basic_profile_discovery(self, mock_which, discovery_agent, taste_profile, fake_popen):
+        fake_popen(
+            "chill ambient music\x1fdisc_vid_001\x1fAmbient Track\x1f1200"
         )
         results = discovery_agent.discover_from_profile(taste_profile, "chill")
         assert len(results) >= 1
         assert results[0].video_id == "disc_vid_001"
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_multiple_queries_called(self, mock_run, mock_which, discovery_agent, taste_profile):
-        mock_run.side_effect = [
-            _mock_run_ok(_make_ytdlp_output(("q1_vid_00001", "Q1", "600"))),
-            _mock_run_ok(_make_ytdlp_output(("q2_vid_00001", "Q2", "600"))),
-        ]
+    def test_multiple_queries_called(self, mock_which, discovery_agent, taste_profile, fake_popen):
+        # Both queries share one yt-dlp process
+        commands = fake_popen(
+            "chill ambient music\x1fq1_vid_00001\x1fQ1\x1f600\n"
+            "nature documentary\x1fq2_vid_00001\x1fQ2\x1f600"
+        )
         results = discovery_agent.discover_from_profile(taste_profile, "chill")
-        assert mock_run.call_count == 2
-        assert len(results) == 2
+        assert len(commands) == 1
+        assert [r.video_id for r in results] == ["q1_vid_00001", "q2_vid_00001"]
 
     def test_no_queries_returns_empty(self, profile_db):
         """Profile without discovery queries returns empty list."""
@@ -565,18 +780,16 @@ class TestDiscoverFromProfile:
         assert results == []
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_deduplicates_results(self, mock_run, mock_which, discovery_agent, taste_profile):
-        mock_run.side_effect = [
-            _mock_run_ok(_make_ytdlp_output(("same_vid_001", "Same Video", "600"))),
-            _mock_run_ok(_make_ytdlp_output(("same_vid_001", "Same Video", "600"))),
-        ]
+    def test_deduplicates_results(self, mock_which, discovery_agent, taste_profile, fake_popen):
+        fake_popen(
+            "chill ambient music\x1fsame_vid_001\x1fSame Video\x1f600\n"
+            "nature documentary\x1fsame_vid_001\x1fSame Video\x1f600"
+        )
         results = discovery_agent.discover_from_profile(taste_profile, "chill")
         assert len(results) == 1
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_max_queries_limit(self, mock_run, mock_which, profile_db):
+    def test_max_queries_limit(self, mock_which, profile_db, fake_popen):
         pool = AutoPlayPool(profile_db)
         agent = DiscoveryAgent(pool=pool, delay=0)
         profile_dict = _make_profile_with_queries(
@@ -585,43 +798,42 @@ class TestDiscoverFromProfile:
         _save_profile_for_discovery(profile_db, profile_dict)
         prof = TasteProfile()
         prof.load(profile_db)
-        mock_run.return_value = _mock_run_ok("")
+        commands = fake_popen()
         agent.discover_from_profile(prof, "morning", max_queries=2)
-        assert mock_run.call_count == 2
+        cmd = commands[-1]
+        assert [c for c in cmd if c.startswith("ytsearch")] == ["ytsearch3:q1", "ytsearch3:q2"]
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
-    def test_duration_filter_from_strategy(self, mock_run, mock_which, profile_db):
+    def test_duration_filter_from_strategy(self, mock_which, profile_db, fake_popen):
         pool = AutoPlayPool(profile_db)
         agent = DiscoveryAgent(pool=pool, delay=0)
         profile_dict = _make_profile_with_queries(max_duration=300)
         _save_profile_for_discovery(profile_db, profile_dict)
         prof = TasteProfile()
         prof.load(profile_db)
-        mock_run.return_value = _mock_run_ok(
-            _make_ytdlp_output(
-                ("short_vid_01", "Short", "120"),
-                ("long_vid_001", "Long", "600"),
-            )
+        fake_popen(
+            "chill ambient music\x1fshort_vid_01\x1fShort\x1f120\n"
+            "chill ambient music\x1flong_vid_001\x1fLong\x1f600"
         )
         results = agent.discover_from_profile(prof, "chill")
         assert len(results) == 1
         assert results[0].video_id == "short_vid_01"
 
     @patch("shutil.which", return_value="/usr/bin/yt-dlp")
-    @patch("subprocess.run")
     @patch("time.sleep")
-    def test_delay_between_queries(self, mock_sleep, mock_run, mock_which, profile_db):
+    def test_delay_between_queries(self, mock_sleep, mock_which, profile_db, fake_popen):
         pool = AutoPlayPool(profile_db)
         agent = DiscoveryAgent(pool=pool, delay=2.0)
         profile_dict = _make_profile_with_queries(queries=["q1", "q2"])
         _save_profile_for_discovery(profile_db, profile_dict)
         prof = TasteProfile()
         prof.load(profile_db)
-        mock_run.return_value = _mock_run_ok("")
+        commands = fake_popen()
         agent.discover_from_profile(prof, "morning")
-        assert mock_sleep.call_count == 1
-        mock_sleep.assert_called_with(2.0)
+        # yt-dlp paces the batched searches itself
+        cmd = commands[-1]
+        assert cmd[cmd.index("--sleep-requests") + 1] == "2.0"
+        mock_sleep.assert_not_called()
 
     def test_no_profile_loaded(self, discovery_agent):
         empty_profile = TasteProfile()